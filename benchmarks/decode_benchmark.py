@@ -0,0 +1,106 @@
+"""
+Microbenchmark of the page decoding path of MovieFetcher.fetch_and_scan: JSON decoding
+of the raw page bodies and title matching, with every installed parser, with and
+without the byte-level prefilter.
+
+    python -m benchmarks.decode_benchmark
+    python -m benchmarks.decode_benchmark --pages 20000 --match-rate 0.01
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict, List
+
+from benchmarks.stand_in_server import StandInConfig, title
+from client_app_cli.fetcher.page_decoder import PARSERS, BytePrefilter, PageDecoder
+from client_app_cli.search.matcher import Matcher
+
+YEAR = 1990
+
+
+def make_pages(pages: int, match_rate: float) -> List[bytes]:
+    """
+    Build the raw bodies of pages of 10 stand-in titles, as the server sends them
+    """
+    config = StandInConfig({YEAR: pages * 10}, match_rate=match_rate)
+    return [
+        json.dumps([title(config, YEAR, 10 * page + i) for i in range(10)]).encode()
+        for page in range(pages)
+    ]
+
+
+def scan_pages(
+    bodies: List[bytes],
+    decode: Callable[[bytes], Any],
+    scan: Callable[[List[str]], Any],
+    prefilter: BytePrefilter | None,
+) -> int:
+    """
+    Decode and scan every page like fetch_and_scan
+    :return: number of matching titles
+    """
+    matches = 0
+    for body in bodies:
+        if prefilter is not None and not prefilter.may_match(body):
+            matches += len(scan([])[0])
+            continue
+        matches += len(scan(decode(body))[0])
+    return matches
+
+
+def benchmark(
+    bodies: List[bytes], term: str, repeat: int
+) -> Dict[str, Dict[str, float]]:
+    """
+    Time every parser with and without the prefilter
+    :return: best titles per second and matches of every variant
+    """
+    matcher = Matcher([term])
+    results: Dict[str, Dict[str, float]] = {}
+    for parser in sorted(PARSERS):
+        decode = PageDecoder(parser).decode
+        for prefilter in (None, BytePrefilter([term])):
+            name = parser + (" + prefilter" if prefilter is not None else "")
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                matches = scan_pages(bodies, decode, matcher.filter, prefilter)
+                best = min(best, time.perf_counter() - start)
+            results[name] = {
+                "titles_per_second": 10 * len(bodies) / best,
+                "matches": matches,
+            }
+    return results
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the page decoding path")
+    parser.add_argument(
+        "--pages", type=int, default=5000, help="Pages of 10 titles (default: 5000)"
+    )
+    parser.add_argument(
+        "--match-rate",
+        type=float,
+        default=0.005,
+        help="Fraction of the titles matching the term (default: 0.005)",
+    )
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=5, help="Timed runs (default: 5)"
+    )
+    options = parser.parse_args(argv)
+
+    bodies = make_pages(options.pages, options.match_rate)
+    results = benchmark(bodies, "star", options.repeat)
+    baseline = results["json"]["titles_per_second"]
+    print(f"{'decoder':<22}{'titles/s':>12}{'speed-up':>10}{'matches':>9}")
+    for name, result in results.items():
+        print(
+            f"{name:<22}{result['titles_per_second']:>12,.0f}"
+            f"{result['titles_per_second'] / baseline:>9.1f}x{result['matches']:>9.0f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
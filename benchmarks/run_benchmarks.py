@@ -0,0 +1,293 @@
+"""
+Benchmarks of MovieFetcher.fetch_movies against the local stand-in movie-server.
+
+    python -m benchmarks.run_benchmarks                       # run every scenario
+    python -m benchmarks.run_benchmarks -s latency flaky      # run some scenarios
+    python -m benchmarks.run_benchmarks --save-baseline       # record the baseline
+    python -m benchmarks.run_benchmarks --baseline            # compare with the baseline
+
+Exits with status 1 if a scenario regressed against the baseline.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+from benchmarks.stand_in_server import StandInConfig, StandInServer
+from client_app_cli.arguments.arguments import Arguments
+from client_app_cli.auth.authenticator import Authenticator
+from client_app_cli.constants import constant
+from client_app_cli.fetcher.concurrency import AdaptiveConcurrencyController
+from client_app_cli.fetcher.hedging import HedgePolicy
+from client_app_cli.fetcher.movie_fetcher import MovieFetcher
+from client_app_cli.fetcher.retry import RetryPolicy
+from client_app_cli.metrics.metrics import Metrics
+from client_app_cli.transport.http_transport import HttpTransport
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "baseline.json")
+# absolute changes below these are measurement noise, whatever the tolerance
+NOISE_FLOOR = {"wall_time": 0.05, "peak_memory": 1024 * 1024}
+
+
+class Scenario:
+    """
+    One benchmark case: a stand-in server configuration and the fetcher options
+    """
+
+    def __init__(
+        self,
+        name: str,
+        config: StandInConfig,
+        search_term: str = "star",
+        count_only: bool = False,
+        discovery: str = constant.DISCOVERY_BINARY,
+        max_concurrency: int = constant.MAX_CONCURRENCY,
+        hedge: bool = False,
+    ) -> None:
+        self.name = name
+        self.config = config
+        self.search_term = search_term
+        self.count_only = count_only
+        self.discovery = discovery
+        self.max_concurrency = max_concurrency
+        self.hedge = hedge
+
+
+# 2% of the page requests stall for half a second, enough requests for the hedge budget
+STALL_CONFIG = StandInConfig(
+    {year: 2000 for year in range(1940, 1945)},
+    latency=0.005,
+    stall_rate=0.02,
+    stall=0.5,
+)
+SCENARIOS = [
+    Scenario("few-years", StandInConfig({1940: 1000, 1950: 1000, 1960: 1000})),
+    Scenario("many-years", StandInConfig({year: 150 for year in range(1940, 1980)})),
+    Scenario("deep-year", StandInConfig({1990: 15000}), count_only=True),
+    Scenario(
+        "latency",
+        StandInConfig({1940: 1000, 1950: 1000}, latency=0.02, latency_jitter=0.01),
+    ),
+    Scenario(
+        "latency-kary",
+        StandInConfig({1940: 1000, 1950: 1000}, latency=0.02, latency_jitter=0.01),
+        discovery=constant.DISCOVERY_KARY,
+    ),
+    Scenario(
+        "flaky",
+        StandInConfig({1940: 1000, 1950: 1000}, latency=0.005, error_rate=0.05),
+    ),
+    Scenario(
+        "stalls",
+        STALL_CONFIG,
+    ),
+    Scenario(
+        "stalls-hedged",
+        STALL_CONFIG,
+        hedge=True,
+    ),
+]
+
+
+def run_scenario(
+    scenario: Scenario, base_url: str, trace_memory: bool
+) -> Dict[str, Any]:
+    """
+    Run fetch_movies once with a fresh client, wired like main.py without the page cache
+    :param trace_memory: whether to measure the peak memory, which slows the run down
+    """
+    pool_size = scenario.max_concurrency
+    if scenario.discovery == constant.DISCOVERY_KARY:
+        pool_size *= constant.PROBES_PER_ROUND
+    if scenario.hedge:
+        pool_size *= 2
+    transport = HttpTransport(pool_size=pool_size)
+    metrics = Metrics()
+    auth = Authenticator(
+        constant.DEFAULT_USERNAME,
+        constant.DEFAULT_PASSWORD,
+        base_url,
+        transport,
+        metrics=metrics,
+    )
+    fetcher = MovieFetcher(
+        auth,
+        transport,
+        scenario.max_concurrency,
+        scenario.discovery,
+        controller=AdaptiveConcurrencyController(
+            initial=min(constant.MAX_WORKERS, scenario.max_concurrency),
+            max_limit=scenario.max_concurrency,
+        ),
+        retry_policy=RetryPolicy(base_delay=0.01),
+        metrics=metrics,
+        hedge_policy=HedgePolicy() if scenario.hedge else None,
+    )
+    args = Arguments(
+        list(scenario.config.movies_per_year),
+        scenario.search_term,
+        scenario.count_only,
+    )
+
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    results = fetcher.fetch_movies(args)
+    wall_time = time.perf_counter() - start
+    peak_memory = 0
+    if trace_memory:
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    fetcher.close()
+    transport.close()
+
+    failed = [year for year, result in results.items() if result.failed]
+    if failed:
+        raise RuntimeError(f"scenario {scenario.name} failed for years {failed}")
+    phases = metrics.snapshot()["phases"]
+    requests = sum(sum(phase["requests"].values()) for phase in phases.values())
+    return {
+        "wall_time": wall_time,
+        "requests": requests,
+        "requests_per_second": requests / wall_time,
+        "probe_requests": sum(
+            phases.get(constant.PHASE_PROBE, {}).get("requests", {}).values()
+        ),
+        "peak_memory": peak_memory,
+    }
+
+
+def benchmark(scenario: Scenario, repeat: int) -> Dict[str, Any]:
+    """
+    Run a scenario repeat times for the timings and once more for the peak memory
+    :return: median wall time and requests per second, request counts and peak memory
+    """
+    with StandInServer(scenario.config) as server:
+        runs = [run_scenario(scenario, server.base_url, False) for _ in range(repeat)]
+        memory_run = run_scenario(scenario, server.base_url, True)
+    wall_time = statistics.median(run["wall_time"] for run in runs)
+    return {
+        "wall_time": round(wall_time, 4),
+        "requests_per_second": round(
+            statistics.median(run["requests_per_second"] for run in runs), 1
+        ),
+        "requests": runs[0]["requests"],
+        "probe_requests": runs[0]["probe_requests"],
+        "peak_memory": memory_run["peak_memory"],
+    }
+
+
+def regressions(
+    result: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float,
+    exact_requests: bool = True,
+) -> List[str]:
+    """
+    Compare a scenario result with its baseline
+    :param tolerance: allowed relative increase of the wall time and the peak memory
+    :param exact_requests: whether the request counts are deterministic, otherwise they
+    get the tolerance too
+    :return: description of every regressed measure
+    """
+    found = []
+    for key, noise in NOISE_FLOOR.items():
+        if key not in baseline:
+            continue
+        limit = max(baseline[key] * (1 + tolerance), baseline[key] + noise)
+        if result[key] > limit:
+            found.append(f"{key} {result[key]} > {baseline[key]} (+{tolerance:.0%})")
+    # without hedging the request counts are deterministic, any increase is a
+    # regression; hedges are sent on timing, so their count varies between runs
+    for key in ("requests", "probe_requests"):
+        if key not in baseline:
+            continue
+        if exact_requests and result[key] > baseline[key]:
+            found.append(f"{key} {result[key]} > {baseline[key]}")
+        elif not exact_requests and result[key] > baseline[key] * (1 + tolerance):
+            found.append(f"{key} {result[key]} > {baseline[key]} (+{tolerance:.0%})")
+    return found
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the movie fetcher")
+    parser.add_argument(
+        "-s",
+        "--scenario",
+        nargs="+",
+        choices=[scenario.name for scenario in SCENARIOS],
+        help="Scenarios to run (default: all)",
+    )
+    parser.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=3,
+        help="Timed runs per scenario (default: 3)",
+    )
+    parser.add_argument(
+        "--baseline",
+        nargs="?",
+        const=BASELINE_FILE,
+        help="Compare with a saved baseline (default: benchmarks/baseline.json)",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        nargs="?",
+        const=BASELINE_FILE,
+        help="Save the results as the baseline (default: benchmarks/baseline.json)",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed relative slowdown and memory growth (default: 0.2)",
+    )
+    options = parser.parse_args(argv)
+
+    baseline: Dict[str, Any] = {}
+    if options.baseline:
+        with open(options.baseline) as f:
+            baseline = json.load(f)
+
+    selected = [
+        scenario
+        for scenario in SCENARIOS
+        if not options.scenario or scenario.name in options.scenario
+    ]
+    results: Dict[str, Any] = {}
+    regressed = False
+    print(
+        f"{'scenario':<14}{'wall s':>9}{'req/s':>10}{'requests':>10}{'probes':>8}{'peak MiB':>10}"
+    )
+    for scenario in selected:
+        result = benchmark(scenario, options.repeat)
+        results[scenario.name] = result
+        print(
+            f"{scenario.name:<14}{result['wall_time']:>9.3f}"
+            f"{result['requests_per_second']:>10.0f}{result['requests']:>10}"
+            f"{result['probe_requests']:>8}{result['peak_memory'] / 2**20:>10.2f}"
+        )
+        for regression in regressions(
+            result,
+            baseline.get(scenario.name, {}),
+            options.tolerance,
+            exact_requests=not scenario.hedge,
+        ):
+            regressed = True
+            print(f"  REGRESSION {regression}")
+
+    if options.save_baseline:
+        with open(options.save_baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline saved to {options.save_baseline}")
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
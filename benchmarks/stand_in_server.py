@@ -0,0 +1,224 @@
+import json
+import multiprocessing
+import random
+import threading
+import time
+import uuid
+import zlib
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+from client_app_cli.constants import constant
+
+WORDS = (
+    "the night day love star man woman city war house girl boy story life dark "
+    "return king queen river road last first lost secret blood gold heart game "
+    "shadow wind fire ice summer winter dream time world island ghost"
+).split()
+
+
+class StandInConfig:
+    """
+    Configuration of the stand-in movie-server
+    """
+
+    def __init__(
+        self,
+        movies_per_year: Dict[int, int],
+        words_per_title: tuple[int, int] = (1, 5),
+        match_rate: float = 0.05,
+        match_word: str = "star",
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        error_rate: float = 0.0,
+        stall_rate: float = 0.0,
+        stall: float = 0.0,
+        token_timeout: float = 60.0,
+        seed: int = 0,
+    ) -> None:
+        """
+        :param movies_per_year: number of movies of every year, 10 per page like the real server
+        :param words_per_title: inclusive range of the number of words of a title
+        :param match_rate: fraction of the titles containing match_word
+        :param match_word: word planted in the matching titles
+        :param latency: seconds every answer is delayed by
+        :param latency_jitter: upper bound of a random extra delay in seconds
+        :param error_rate: fraction of the movie requests answered with 503
+        :param stall_rate: fraction of the movie requests delayed by stall on top of the latency
+        :param stall: seconds a stalled request is delayed by
+        :param token_timeout: seconds a bearer token stays valid
+        :param seed: seed of the titles and of the injected errors
+        """
+        if not 0 <= error_rate < 1:
+            raise ValueError("error_rate must be in [0, 1)")
+        if not 0 <= stall_rate < 1:
+            raise ValueError("stall_rate must be in [0, 1)")
+        self.movies_per_year = movies_per_year
+        self.words_per_title = words_per_title
+        self.match_rate = match_rate
+        self.match_word = match_word
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.stall_rate = stall_rate
+        self.stall = stall
+        self.token_timeout = token_timeout
+        self.seed = seed
+
+
+class StandInServer:
+    """
+    Local stand-in for the Go movie-server answering api/auth and api/movies/{year}/{page}
+    in a separate process, so that it does not compete with the client for the GIL.
+    Titles and injected errors are deterministic for a given seed
+    """
+
+    def __init__(self, config: StandInConfig) -> None:
+        self.config = config
+        self._process: multiprocessing.Process | None = None
+        self._stop = multiprocessing.Event()
+        self.base_url = ""
+
+    def __enter__(self) -> "StandInServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """
+        Start the server process and wait until it listens
+        """
+        ready: multiprocessing.Queue = multiprocessing.Queue()
+        self._process = multiprocessing.Process(
+            target=serve, args=(self.config, ready, self._stop), daemon=True
+        )
+        self._process.start()
+        self.base_url = f"http://127.0.0.1:{ready.get(timeout=10)}/"
+
+    def stop(self) -> None:
+        """
+        Stop the server process
+        """
+        if self._process is None:
+            return
+        self._stop.set()
+        self._process.join(timeout=5)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._process = None
+
+
+def serve(config: StandInConfig, ready, stop) -> None:
+    """
+    Serve until the stop event is set, reporting the listening port through the ready queue
+    """
+    tokens: Dict[str, float] = {}
+    attempts: Dict[str, int] = {}
+    stall_attempts: Dict[str, int] = {}
+    lock = threading.Lock()
+
+    @lru_cache(maxsize=None)
+    def page_body(year: int, page: int) -> bytes | None:
+        movies = config.movies_per_year.get(year, 0)
+        first = (page - 1) * 10
+        if page < 1 or first >= movies:
+            return None
+        return json.dumps(
+            [title(config, year, first + i) for i in range(min(10, movies - first))]
+        ).encode()
+
+    def should_fail(path: str) -> bool:
+        if not config.error_rate:
+            return False
+        with lock:
+            attempts[path] = attempts.get(path, 0) + 1
+            attempt = attempts[path]
+        # deterministic per path and attempt so that reruns send the same requests
+        key = f"{config.seed}:{path}:{attempt}".encode()
+        return zlib.crc32(key) / 2**32 < config.error_rate
+
+    def should_stall(path: str) -> bool:
+        if not config.stall_rate:
+            return False
+        with lock:
+            stall_attempts[path] = stall_attempts.get(path, 0) + 1
+            attempt = stall_attempts[path]
+        # seeded from a hash of the whole key, stalls must not cluster on neighbour pages
+        key = f"stall:{config.seed}:{path}:{attempt}"
+        return random.Random(key).random() < config.stall_rate
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def respond(self, status: int, body: bytes) -> None:
+            if config.latency or config.latency_jitter:
+                time.sleep(config.latency + random.uniform(0, config.latency_jitter))
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def error(self, status: int, message: str) -> None:
+            self.respond(status, json.dumps({"error": message}).encode())
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            if self.path.rstrip("/") != "/" + constant.AUTH_API.rstrip("/"):
+                return self.error(404, "not found")
+            token = uuid.uuid4().hex
+            with lock:
+                tokens[token] = time.monotonic() + config.token_timeout
+            self.respond(
+                200,
+                json.dumps({"bearer": token, "timeout": config.token_timeout}).encode(),
+            )
+
+        def do_GET(self):
+            token = self.headers.get("Authorization", "").removeprefix("Bearer ")
+            with lock:
+                expiry = tokens.get(token, 0.0)
+            if expiry < time.monotonic():
+                return self.error(401, "invalid token")
+            parts = self.path.strip("/").split("/")
+            if len(parts) != 4 or parts[:2] != ["api", "movies"]:
+                return self.error(404, "not found")
+            try:
+                year, page = int(parts[2]), int(parts[3])
+            except ValueError:
+                return self.error(400, "invalid year or page")
+            if should_fail(self.path):
+                return self.error(503, "unavailable")
+            if should_stall(self.path):
+                time.sleep(config.stall)
+            body = page_body(year, page)
+            if body is None:
+                return self.error(404, f"page {page} not found for year {year}")
+            self.respond(200, body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+    ready.put(server.server_address[1])
+    stop.wait()
+    server.shutdown()
+    server.server_close()
+
+
+def title(config: StandInConfig, year: int, index: int) -> str:
+    """
+    Deterministic title of the index-th movie of a year
+    """
+    rng = random.Random(f"{config.seed}:{year}:{index}")
+    words: List[str] = rng.choices(WORDS, k=rng.randint(*config.words_per_title))
+    words = [word for word in words if word != config.match_word] or ["untitled"]
+    if rng.random() < config.match_rate:
+        words.insert(rng.randrange(len(words) + 1), config.match_word)
+    return " ".join(words).title()
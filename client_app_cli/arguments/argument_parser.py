@@ -1,4 +1,40 @@
 import argparse
+import os
+
+from client_app_cli.constants.constant import (
+    APPROX_CONFIDENCE,
+    APPROX_ERROR,
+    BALANCE_P2C,
+    BALANCE_POLICIES,
+    BASE_URL,
+    CACHE_MAX_BYTES,
+    CACHE_TTL_SECONDS,
+    COMMAND_BATCH,
+    COMMAND_FETCH,
+    COMMAND_QUERY,
+    COMMAND_SERVE,
+    COMMANDS,
+    CONNECT_TIMEOUT,
+    DISCOVERY_BINARY,
+    DISCOVERY_MODES,
+    HEDGE_MAX_RATIO,
+    HEDGE_PERCENTILE,
+    JSON_PARSER_AUTO,
+    JSON_PARSER_ORJSON,
+    JSON_PARSERS,
+    MAX_CONCURRENCY,
+    MAX_RETRIES,
+    METRICS_FORMATS,
+    METRICS_JSON,
+    MAX_IN_FLIGHT,
+    OUTPUT_FORMATS,
+    OUTPUT_TEXT,
+    PROBES_PER_ROUND,
+    READ_TIMEOUT,
+    SOCKET_FILE,
+    TRACE_CHROME,
+    TRACE_FORMATS,
+)
 
 
 class ArgumentParser:
@@ -22,10 +58,19 @@ class ArgumentParser:
         Defines the command-line arguments for the parser.
         Adds 'years' arguments to the parser.
         """
+        self.parser.add_argument(
+            "command",
+            nargs="?",
+            choices=COMMANDS,
+            default=COMMAND_FETCH,
+            help="fetch (default) searches the movies of the years, "
+            "snapshot downloads the titles of the years into the local snapshot, "
+            "serve answers queries over a Unix socket, query asks a serving daemon, "
+            "batch answers the queries of --batch-file sharing their page fetches",
+        )
         self.parser.add_argument(
             "-y",
             "--years",
-            required=True,
             nargs="+",
             type=int,
             help="The years to fetch movies for (e.g., -y 1940 1950)",
@@ -33,9 +78,20 @@ class ArgumentParser:
         self.parser.add_argument(
             "-s",
             "--search",
-            required=True,
+            nargs="+",
             type=str,
-            help="The search term to filter movies for (e.g., -s star)",
+            default=[],
+            help="One or more search terms to filter movies for (e.g., -s star moon)",
+        )
+        self.parser.add_argument(
+            "--search-file",
+            type=str,
+            help="File with one search term per line, blank lines are ignored",
+        )
+        self.parser.add_argument(
+            "--regex",
+            action="store_true",
+            help="Treat the search terms as case-insensitive regular expressions",
         )
         self.parser.add_argument(
             "-c",
@@ -43,9 +99,395 @@ class ArgumentParser:
             action="store_true",
             help="Display only the movie count for each year",
         )
+        self.parser.add_argument(
+            "--max-concurrency",
+            type=int,
+            default=MAX_CONCURRENCY,
+            help="Upper bound of the adaptive number of concurrent page requests "
+            f"(default: {MAX_CONCURRENCY})",
+        )
+        self.parser.add_argument(
+            "--retries",
+            type=int,
+            default=MAX_RETRIES,
+            help="Retries of a page request failing with 429/5xx or a connection error "
+            f"(default: {MAX_RETRIES})",
+        )
+        self.parser.add_argument(
+            "--connect-timeout",
+            type=float,
+            default=CONNECT_TIMEOUT,
+            help=f"Seconds to wait for a connection to the server (default: {CONNECT_TIMEOUT})",
+        )
+        self.parser.add_argument(
+            "--read-timeout",
+            type=float,
+            default=READ_TIMEOUT,
+            help=f"Seconds to wait for the server while reading an answer (default: {READ_TIMEOUT})",
+        )
+        self.parser.add_argument(
+            "--hedge",
+            action="store_true",
+            help="Send a duplicate of a page request slower than the --hedge-percentile "
+            "of the recent latencies, the first answer wins",
+        )
+        self.parser.add_argument(
+            "--hedge-percentile",
+            type=float,
+            default=HEDGE_PERCENTILE,
+            help=f"Latency percentile after which a request is duplicated (default: {HEDGE_PERCENTILE})",
+        )
+        self.parser.add_argument(
+            "--hedge-max-ratio",
+            type=float,
+            default=HEDGE_MAX_RATIO,
+            help=f"Highest number of duplicates per request sent (default: {HEDGE_MAX_RATIO})",
+        )
+        self.parser.add_argument(
+            "--base-url",
+            nargs="+",
+            default=None,
+            help="Base URLs of the movie-server replicas the page requests are spread over "
+            "(default: the comma separated MOVIE_API_BASE_URL, or http://localhost:8080/)",
+        )
+        self.parser.add_argument(
+            "--balance",
+            choices=BALANCE_POLICIES,
+            default=BALANCE_P2C,
+            help="How a replica is chosen: the least busy of two picked at random (p2c) "
+            "or of all of them (least) (default: p2c)",
+        )
+        self.parser.add_argument(
+            "--async",
+            dest="use_async",
+            action="store_true",
+            help="Fetch all years on one asyncio event loop instead of worker threads",
+        )
+        self.parser.add_argument(
+            "--max-in-flight",
+            type=int,
+            default=MAX_IN_FLIGHT,
+            help=f"Maximum concurrent requests for --async (default: {MAX_IN_FLIGHT})",
+        )
+        self.parser.add_argument(
+            "--discovery",
+            choices=DISCOVERY_MODES,
+            default=DISCOVERY_BINARY,
+            help="How to find the number of pages of a year: one probe at a time (binary) "
+            "or several concurrent probes per round (kary)",
+        )
+        self.parser.add_argument(
+            "--probes-per-round",
+            type=int,
+            default=PROBES_PER_ROUND,
+            help=f"Concurrent probes per round for --discovery kary (default: {PROBES_PER_ROUND})",
+        )
+        self.parser.add_argument(
+            "--json-parser",
+            choices=JSON_PARSERS,
+            default=JSON_PARSER_AUTO,
+            help="JSON parser of the pages: orjson, the standard library json, "
+            "or auto for orjson when it is installed (default: auto)",
+        )
+        self.parser.add_argument(
+            "--no-cache",
+            action="store_true",
+            help="Bypass the on-disk page cache and fetch every page from the server",
+        )
+        self.parser.add_argument(
+            "--clear-cache",
+            action="store_true",
+            help="Remove every cached page before fetching",
+        )
+        self.parser.add_argument(
+            "--cache-ttl",
+            type=float,
+            default=CACHE_TTL_SECONDS,
+            help=f"Seconds a cached page stays valid (default: {CACHE_TTL_SECONDS})",
+        )
+        self.parser.add_argument(
+            "--cache-max-bytes",
+            type=int,
+            default=CACHE_MAX_BYTES,
+            help=f"Byte budget of the page cache (default: {CACHE_MAX_BYTES})",
+        )
+        self.parser.add_argument(
+            "--no-hints",
+            action="store_true",
+            help="Search the page count of every year from scratch instead of checking "
+            "the one found by the previous runs",
+        )
+        self.parser.add_argument(
+            "--approx",
+            action="store_true",
+            help="Estimate the number of matching movies from a random sample of the pages "
+            "of every year, with a confidence interval, instead of reading every page",
+        )
+        self.parser.add_argument(
+            "--approx-error",
+            type=float,
+            default=APPROX_ERROR,
+            help="Relative error of the --approx estimates at which a year stops "
+            f"being sampled (default: {APPROX_ERROR})",
+        )
+        self.parser.add_argument(
+            "--approx-fraction",
+            type=float,
+            default=None,
+            help="Read this fraction of the pages of every year instead of stopping "
+            "at --approx-error",
+        )
+        self.parser.add_argument(
+            "--approx-confidence",
+            type=float,
+            default=APPROX_CONFIDENCE,
+            help=f"Confidence level of the --approx intervals (default: {APPROX_CONFIDENCE})",
+        )
+        self.parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Continue an interrupted search from its checkpoint, fetching only "
+            "the years and pages it did not complete",
+        )
+        self.parser.add_argument(
+            "--checkpoint",
+            metavar="FILE",
+            help="Checkpoint file of the search (default: one per search in "
+            "~/.cache/movie-client/checkpoints)",
+        )
+        self.parser.add_argument(
+            "--no-checkpoint",
+            action="store_true",
+            help="Do not record the completed years and pages of the search",
+        )
+        self.parser.add_argument(
+            "--token-cache",
+            action="store_true",
+            help="Reuse the bearer token across runs through an owner-only file "
+            "in ~/.cache/movie-client",
+        )
+        self.parser.add_argument(
+            "--stats",
+            action="store_true",
+            help="Print request counts, latency percentiles, bytes, retries and cache hits "
+            "after the results",
+        )
+        self.parser.add_argument(
+            "--metrics-file",
+            help="Write the metrics to this file at the end of the run",
+        )
+        self.parser.add_argument(
+            "--metrics-format",
+            choices=METRICS_FORMATS,
+            default=METRICS_JSON,
+            help="Format of --metrics-file, json or a Prometheus textfile (default: json)",
+        )
+        self.parser.add_argument(
+            "--trace",
+            metavar="FILE",
+            help="Write a timeline of the years, discovery, page and token requests, "
+            "decoding, scanning and printing to this file",
+        )
+        self.parser.add_argument(
+            "--trace-format",
+            choices=TRACE_FORMATS,
+            default=TRACE_CHROME,
+            help="Format of --trace, Chrome trace events (chrome://tracing, Perfetto) "
+            "or a speedscope profile (default: chrome)",
+        )
+        self.parser.add_argument(
+            "--profile",
+            metavar="FILE",
+            help="Profile the search with cProfile, worker threads included on Python 3.12 "
+            "or later, and write the statistics to this pstats file",
+        )
+        self.parser.add_argument(
+            "-o",
+            "--output",
+            choices=OUTPUT_FORMATS,
+            default=OUTPUT_TEXT,
+            help="Output format, ndjson and csv are written incrementally as pages complete",
+        )
+        self.parser.add_argument(
+            "--stream",
+            action="store_true",
+            help="Write the text output incrementally as pages complete",
+        )
+        self.parser.add_argument(
+            "--offline",
+            action="store_true",
+            help="Answer the search from the local snapshot without any request to the server",
+        )
+        self.parser.add_argument(
+            "--batch-file",
+            type=str,
+            help="JSONL file of the batch command, one query per line: "
+            '{"id": ..., "years": [1940], "search": ["star"], "count_only": false, "regex": false}',
+        )
+        self.parser.add_argument(
+            "--socket",
+            default=SOCKET_FILE,
+            help="Unix socket of the serve and query commands "
+            "(default: ~/.cache/movie-client/daemon.sock)",
+        )
+        self.parser.add_argument(
+            "--snapshot-file",
+            type=str,
+            default=None,
+            help="Path of the local snapshot (default: ~/.cache/movie-client/snapshot.sqlite3)",
+        )
 
-    def parse(self) -> argparse.Namespace:
+    def parse(self, argv: list[str] | None = None) -> argparse.Namespace:
         """
         Parse and return the CLI arguments.
+        :param argv: arguments to parse, sys.argv[1:] if not given
+        """
+        args = self.parser.parse_args(argv)
+        if args.search_file:
+            try:
+                with open(args.search_file, encoding="utf-8") as search_file:
+                    args.search += [
+                        line.rstrip("\n") for line in search_file if line.strip()
+                    ]
+            except OSError as e:
+                self.parser.error(f"cannot read --search-file: {e}")
+        if args.regex:
+            from client_app_cli.search.matcher import Matcher
+
+            try:
+                Matcher.compile_patterns(args.search)
+            except ValueError as e:
+                self.parser.error(str(e))
+        args.queries, args.query_ids = [], []
+        if args.command == COMMAND_BATCH:
+            self.__read_batch_file(args)
+        elif args.batch_file:
+            self.parser.error("--batch-file is only used by the batch command")
+        if args.command not in (COMMAND_SERVE, COMMAND_BATCH) and not args.years:
+            self.parser.error("the following arguments are required: -y/--years")
+        if args.command in (COMMAND_FETCH, COMMAND_QUERY) and not args.search:
+            self.parser.error(
+                "one of the arguments -s/--search --search-file is required"
+            )
+
+        args.stream = args.stream or args.output != OUTPUT_TEXT
+        if args.stream and args.use_async:
+            self.parser.error("--async does not support streaming output")
+        if args.use_async and (args.regex or len(set(args.search)) > 1):
+            self.parser.error("--async supports a single plain search term only")
+        if args.max_concurrency < 1:
+            self.parser.error("--max-concurrency must be a positive integer")
+        if args.retries < 0:
+            self.parser.error("--retries must not be negative")
+        if args.connect_timeout <= 0 or args.read_timeout <= 0:
+            self.parser.error("--connect-timeout and --read-timeout must be positive")
+        if not 0 < args.hedge_percentile < 1:
+            self.parser.error("--hedge-percentile must be between 0 and 1")
+        if args.hedge_max_ratio < 0:
+            self.parser.error("--hedge-max-ratio must not be negative")
+        if args.hedge and args.use_async:
+            self.parser.error("--async does not support --hedge")
+        if args.use_async and (
+            args.retries != MAX_RETRIES
+            or args.connect_timeout != CONNECT_TIMEOUT
+            or args.read_timeout != READ_TIMEOUT
+        ):
+            self.parser.error(
+                "--async does not support --retries, --connect-timeout or --read-timeout"
+            )
+        if not args.base_url:
+            args.base_url = os.environ.get("MOVIE_API_BASE_URL", BASE_URL).split(",")
+        args.base_url = [url.strip() for url in args.base_url if url.strip()]
+        if not args.base_url:
+            self.parser.error("at least one base URL is required")
+        if args.trace and (args.use_async or args.command == COMMAND_SERVE):
+            self.parser.error(
+                "--trace is not supported by --async and the serve command"
+            )
+        if (args.trace or args.profile) and (
+            args.offline or args.command == COMMAND_QUERY
+        ):
+            self.parser.error("--trace and --profile need requests to the server")
+        if args.approx_error <= 0:
+            self.parser.error("--approx-error must be positive")
+        if args.approx_fraction is not None and not 0 < args.approx_fraction <= 1:
+            self.parser.error("--approx-fraction must be between 0 and 1")
+        if not 0 < args.approx_confidence < 1:
+            self.parser.error("--approx-confidence must be between 0 and 1")
+        if args.approx and (
+            args.command != COMMAND_FETCH
+            or args.use_async
+            or args.stream
+            or args.offline
+            or args.resume
+            or args.checkpoint
+        ):
+            self.parser.error(
+                "--approx is only supported by the fetch command, without --async, "
+                "--offline, --resume, --checkpoint or streaming output"
+            )
+        # an estimate has no titles
+        args.count_only = args.count_only or args.approx
+        if (args.resume or args.checkpoint) and (
+            args.command != COMMAND_FETCH
+            or args.use_async
+            or args.stream
+            or args.offline
+            or args.no_checkpoint
+        ):
+            self.parser.error(
+                "--resume and --checkpoint are only supported by the fetch command, "
+                "without --async, --offline, --no-checkpoint or streaming output"
+            )
+        if args.use_async and len(args.base_url) > 1:
+            self.parser.error("--async supports a single base URL only")
+        if args.json_parser == JSON_PARSER_ORJSON:
+            import importlib.util
+
+            if importlib.util.find_spec("orjson") is None:
+                self.parser.error("--json-parser orjson requires the orjson package")
+        if args.use_async and args.command != COMMAND_FETCH:
+            self.parser.error(f"--async does not support the {args.command} command")
+        if args.offline and args.stream:
+            self.parser.error("--offline does not support streaming output")
+        if args.command in (COMMAND_SERVE, COMMAND_QUERY) and (
+            args.offline or args.stream
+        ):
+            self.parser.error(
+                f"the {args.command} command does not support --offline or streaming output"
+            )
+        if args.command == COMMAND_BATCH and (
+            args.offline or args.output != OUTPUT_TEXT
+        ):
+            self.parser.error(
+                "the batch command writes JSON lines and does not support --offline or --output"
+            )
+        return args
+
+    def __read_batch_file(self, args: argparse.Namespace) -> None:
         """
-        return self.parser.parse_args()
+        Read the queries of the batch command into args.queries and their ids into args.query_ids.
+        A query without an id is identified by its line number
+        """
+        # json and the query protocol are only loaded by the batch command
+        import json
+
+        from client_app_cli.daemon import protocol
+
+        if not args.batch_file:
+            self.parser.error("the batch command requires --batch-file")
+        try:
+            with open(args.batch_file, encoding="utf-8") as batch_file:
+                for number, line in enumerate(batch_file, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        query = json.loads(line)
+                        args.queries.append(protocol.query_from_dict(query))
+                    except ValueError as e:
+                        self.parser.error(f"invalid query on line {number}: {e}")
+                    args.query_ids.append(query.get("id", number))
+        except OSError as e:
+            self.parser.error(f"cannot read --batch-file: {e}")
+        if not args.queries:
+            self.parser.error("--batch-file holds no query")
@@ -1,5 +1,8 @@
 class Arguments:
-    def __init__(self, years, search, count_only):
+    def __init__(self, years, search, count_only, regex=False):
         self.years = years
-        self.search_term = search
+        # search is a single term or a list of terms, the first one is the primary term
+        self.search_terms = [search] if isinstance(search, str) else list(search)
+        self.search_term = self.search_terms[0] if self.search_terms else ""
         self.count_only = count_only
+        self.regex = regex
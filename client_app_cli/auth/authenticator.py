@@ -1,8 +1,16 @@
+import sys
+import threading
+import time
 from datetime import datetime, timedelta
 
 import requests
+
+from client_app_cli.cache.token_cache import TokenCache
 from client_app_cli.constants import constant
 from client_app_cli.exceptions.exceptions import AuthenticationException
+from client_app_cli.metrics.metrics import Metrics
+from client_app_cli.tracing.tracer import Tracer, traced
+from client_app_cli.transport.http_transport import HttpTransport
 from urllib.parse import urlparse
 
 
@@ -11,18 +19,39 @@ class Authenticator:
     Authenticator class that handles authentication
     """
 
-    def __init__(self, username: str, password: str, base_url: str):
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        base_url: str,
+        transport: HttpTransport | None = None,
+        token_cache: TokenCache | None = None,
+        metrics: Metrics | None = None,
+        tracer: Tracer | None = None,
+    ):
         """
         Initializes the Authenticator with user credentials
 
         :param username: Username for authentication
         :param password: Password for authentication
+        :param transport: Shared HTTP transport, a new pooled one is created if not given
+        :param token_cache: On-disk token cache shared with other CLI invocations, if any
+        :param metrics: Metrics the auth requests are recorded in
+        :param tracer: if given, records the span of every token request
         """
         self.username = username
         self.password = password
         self.base_url = base_url
-        self.token = None
+        self.transport = transport if transport is not None else HttpTransport()
+        self.token_cache = token_cache
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.tracer = tracer
+        self.token: str | None = None
         self.token_expiry = datetime.min
+        self.refresh_at = datetime.min
+        self._lock = threading.Lock()
+        self._stop_refresh = threading.Event()
+        self._refresher: threading.Thread | None = None
         self.__validate()
 
     def __validate(self):
@@ -46,27 +75,146 @@ class Authenticator:
         parsed = urlparse(url)
         return all([parsed.scheme, parsed.netloc])
 
+    def has_valid_token(self) -> bool:
+        """
+        Checks if a bearer token has been obtained and has not expired yet.
+        :return: True if the cached token can be used, False otherwise.
+        """
+        return bool(self.token) and self.token_expiry > datetime.now()
+
     def authenticate(self) -> str | None:
         """
         Authenticates the user using the username and password provided at instantiation.
+        Concurrent callers finding no valid token wait for a single in-progress request.
         :return: bearer token
         """
         # check if the token is still valid
-        if self.token and self.token_expiry > datetime.now():
+        if self.has_valid_token():
             return self.token
 
-        # Get the token only if invalid
+        with self._lock:
+            # another thread may have obtained the token while this one waited
+            if not self.has_valid_token() and not self.__load_cached_token():
+                self.__request_token()
+        return self.token
+
+    def invalidate(self, token: str | None) -> None:
+        """
+        Discards a token rejected by the server, unless it was already replaced
+        :param token: the rejected bearer token
+        """
+        with self._lock:
+            if token is None or token != self.token:
+                return
+            self.token = None
+            self.token_expiry = datetime.min
+            self.refresh_at = datetime.min
+            if self.token_cache is not None:
+                self.token_cache.delete(self.base_url, self.username, token)
+
+    def start_background_refresh(self) -> None:
+        """
+        Starts a daemon thread that obtains a token right away and renews it
+        before it expires, so that callers of authenticate never wait for it
+        """
+        if self._refresher is not None:
+            return
+        self._stop_refresh.clear()
+        self._refresher = threading.Thread(
+            target=self.__refresh_loop, name="token-refresh", daemon=True
+        )
+        self._refresher.start()
+
+    def stop_background_refresh(self) -> None:
+        """
+        Stops the background refresh thread if it is running
+        """
+        if self._refresher is None:
+            return
+        self._stop_refresh.set()
+        self._refresher.join()
+        self._refresher = None
+
+    def __refresh_loop(self):
+        """
+        Renews the token whenever its refresh time is reached until stopped.
+        Failures are reported and retried, authenticate still requests a token itself
+        if the cached one expires in the meantime
+        """
+        while True:
+            delay = (self.refresh_at - datetime.now()).total_seconds()
+            if self._stop_refresh.wait(max(delay, 0)):
+                return
+            with self._lock:
+                # skip if authenticate or another process already renewed the token
+                if datetime.now() < self.refresh_at or (
+                    self.__load_cached_token() and datetime.now() < self.refresh_at
+                ):
+                    continue
+                try:
+                    self.__request_token()
+                except (AuthenticationException, requests.RequestException) as e:
+                    print(f"Token refresh failed: {e}", file=sys.stderr)
+                    self.refresh_at = datetime.now() + timedelta(
+                        seconds=constant.TOKEN_REFRESH_RETRY_DELAY
+                    )
+
+    def __load_cached_token(self) -> bool:
+        """
+        Adopts the token cached on disk, must be called holding the lock
+        :return: True if a valid token was found in the cache
+        """
+        if self.token_cache is None:
+            return False
+        cached = self.token_cache.get(self.base_url, self.username)
+        if cached is None:
+            return False
+        self.token, expires_at, refresh_at = cached
+        self.token_expiry = datetime.fromtimestamp(expires_at)
+        self.refresh_at = datetime.fromtimestamp(refresh_at)
+        return self.has_valid_token()
+
+    def __request_token(self):
+        """
+        Requests a new bearer token from the server, must be called holding the lock
+        """
         url = self.base_url + constant.AUTH_API
         payload = {"username": self.username, "password": self.password}
-        response = requests.post(
-            url, json=payload, headers={"Content-Type": "application/json"}
+        start = time.monotonic()
+        with traced(self.tracer, constant.PHASE_AUTH, "request", url=url) as span:
+            try:
+                response = self.transport.post(
+                    url, json=payload, headers={"Content-Type": "application/json"}
+                )
+            except requests.RequestException as e:
+                span["error"] = str(e)
+                self.metrics.record_request(
+                    constant.PHASE_AUTH, None, time.monotonic() - start
+                )
+                raise
+            span["status"] = response.status_code
+        self.metrics.record_request(
+            constant.PHASE_AUTH,
+            response.status_code,
+            time.monotonic() - start,
+            len(response.content),
         )
 
-        if response.status_code == 200:
-            self.token = response.json()["bearer"]
-            self.token_expiry = datetime.now() + timedelta(
-                seconds=response.json()["timeout"]
-            )
-        else:
+        if response.status_code != 200:
             raise AuthenticationException(response.json()["error"])
-        return self.token
+        body = response.json()
+        now = datetime.now()
+        self.token = body["bearer"]
+        self.token_expiry = now + timedelta(seconds=body["timeout"])
+        # renew once most of the lifetime has passed
+        self.refresh_at = now + timedelta(
+            seconds=body["timeout"] * constant.TOKEN_REFRESH_RATIO
+        )
+        if self.token_cache is not None:
+            self.token_cache.put(
+                self.base_url,
+                self.username,
+                self.token,
+                self.token_expiry.timestamp(),
+                self.refresh_at.timestamp(),
+            )
@@ -0,0 +1,154 @@
+import os
+import sqlite3
+import threading
+import time
+
+from client_app_cli.constants import constant
+
+
+class PageCache:
+    """
+    Persistent on-disk cache of raw movie page bodies keyed by (base_url, year, page).
+    Entries expire after a TTL and the least recently used ones are evicted once the
+    cache grows beyond its byte budget. Safe to share between the fetch worker threads
+    and between concurrent CLI processes
+    """
+
+    def __init__(
+        self,
+        path: str = os.path.join(constant.CACHE_DIR, constant.CACHE_FILE),
+        ttl: float = constant.CACHE_TTL_SECONDS,
+        max_bytes: int = constant.CACHE_MAX_BYTES,
+    ) -> None:
+        """
+        Open or create the cache database
+        :param path: path of the cache database file
+        :param ttl: seconds after which a cached page is considered stale
+        :param max_bytes: byte budget of the cached page bodies
+        """
+        if ttl < 0:
+            raise ValueError("ttl must not be negative")
+        if max_bytes < 0:
+            raise ValueError("max_bytes must not be negative")
+
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # one connection shared by the worker threads, serialized by the lock
+        self._connection = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                "base_url TEXT NOT NULL, year INTEGER NOT NULL, page INTEGER NOT NULL, "
+                "body BLOB NOT NULL, size INTEGER NOT NULL, "
+                "stored_at REAL NOT NULL, accessed_at REAL NOT NULL, "
+                "PRIMARY KEY (base_url, year, page))"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at)"
+            )
+            self._total_bytes = self.__stored_bytes()
+
+    def get(self, base_url: str, year: int, page: int) -> bytes | None:
+        """
+        Get the cached body of a page
+        :return: raw page body, or None if it is not cached or has expired
+        """
+        now = time.time()
+        key = (base_url, year, page)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT body, size, stored_at FROM pages "
+                "WHERE base_url = ? AND year = ? AND page = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                return None
+            body, size, stored_at = row
+            if now - stored_at > self.ttl:
+                self._connection.execute(
+                    "DELETE FROM pages WHERE base_url = ? AND year = ? AND page = ?",
+                    key,
+                )
+                self._total_bytes -= size
+                return None
+            self._connection.execute(
+                "UPDATE pages SET accessed_at = ? "
+                "WHERE base_url = ? AND year = ? AND page = ?",
+                (now, *key),
+            )
+            return bytes(body)
+
+    def put(self, base_url: str, year: int, page: int, body: bytes) -> None:
+        """
+        Store the body of a page, evicting the least recently used pages if over budget
+        """
+        size = len(body)
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO pages "
+                "(base_url, year, page, body, size, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (base_url, year, page, body, size, now, now),
+            )
+            self._total_bytes += size
+            if self._total_bytes > self.max_bytes:
+                self.__evict()
+
+    def clear(self) -> None:
+        """
+        Remove every cached page
+        """
+        with self._lock:
+            self._connection.execute("DELETE FROM pages")
+            self._total_bytes = 0
+
+    def close(self) -> None:
+        """
+        Close the cache database
+        """
+        with self._lock:
+            self._connection.close()
+
+    def __stored_bytes(self) -> int:
+        """
+        Sum the sizes of the cached pages, including the ones written by other processes
+        """
+        (total,) = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM pages"
+        ).fetchone()
+        return total
+
+    def __evict(self) -> None:
+        """
+        Delete the least recently used pages until the cache fits its byte budget.
+        Expects the lock to be held
+        """
+        self._total_bytes = self.__stored_bytes()
+        excess = self._total_bytes - self.max_bytes
+        if excess <= 0:
+            return
+        victims = []
+        for base_url, year, page, size in self._connection.execute(
+            "SELECT base_url, year, page, size FROM pages ORDER BY accessed_at"
+        ):
+            victims.append((base_url, year, page))
+            excess -= size
+            self._total_bytes -= size
+            if excess <= 0:
+                break
+        self._connection.executemany(
+            "DELETE FROM pages WHERE base_url = ? AND year = ? AND page = ?", victims
+        )
@@ -0,0 +1,76 @@
+import os
+import sqlite3
+import threading
+import time
+
+from client_app_cli.constants import constant
+
+
+class PageHints:
+    """
+    On-disk record of the lowest failing page of every year, keyed by (base_url, year).
+    A year's page count barely changes between runs, so the boundary discovery checks
+    the recorded page first instead of searching from scratch
+    """
+
+    def __init__(
+        self, path: str = os.path.join(constant.CACHE_DIR, constant.HINTS_FILE)
+    ) -> None:
+        """
+        Open or create the hints database
+        :param path: path of the hints database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # one connection shared by the discovery threads, serialized by the lock
+        self._connection = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        with self._lock:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS hints ("
+                "base_url TEXT NOT NULL, year INTEGER NOT NULL, "
+                "lowest_failing_page INTEGER NOT NULL, updated_at REAL NOT NULL, "
+                "PRIMARY KEY (base_url, year))"
+            )
+
+    def get(self, base_url: str, year: int) -> int | None:
+        """
+        Get the lowest failing page last discovered for a year
+        :return: lowest failing page, or None if the year was never discovered
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT lowest_failing_page FROM hints WHERE base_url = ? AND year = ?",
+                (base_url, year),
+            ).fetchone()
+        return None if row is None else row[0]
+
+    def put(self, base_url: str, year: int, lowest_failing_page: int) -> None:
+        """
+        Record the lowest failing page discovered for a year
+        """
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO hints "
+                "(base_url, year, lowest_failing_page, updated_at) VALUES (?, ?, ?, ?)",
+                (base_url, year, lowest_failing_page, time.time()),
+            )
+
+    def clear(self) -> None:
+        """
+        Remove every hint
+        """
+        with self._lock:
+            self._connection.execute("DELETE FROM hints")
+
+    def close(self) -> None:
+        """
+        Close the hints database
+        """
+        with self._lock:
+            self._connection.close()
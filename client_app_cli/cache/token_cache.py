@@ -0,0 +1,98 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from client_app_cli.constants import constant
+
+
+class TokenCache:
+    """
+    On-disk cache of bearer tokens keyed by (base_url, username), shared between
+    CLI invocations. The database is readable by its owner only, and every write
+    is a single transaction so concurrent processes never see a partial entry
+    """
+
+    def __init__(
+        self, path: str = os.path.join(constant.CACHE_DIR, constant.TOKEN_CACHE_FILE)
+    ) -> None:
+        """
+        Open or create the token cache database
+        :param path: path of the token cache database file
+        """
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        # create the file owner-only before sqlite opens it, its journal inherits the mode
+        os.close(os.open(path, os.O_CREAT | os.O_RDWR, 0o600))
+        os.chmod(path, 0o600)
+        self._connection = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        with self._lock:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS tokens ("
+                "base_url TEXT NOT NULL, username TEXT NOT NULL, token TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, refresh_at REAL NOT NULL, "
+                "PRIMARY KEY (base_url, username))"
+            )
+
+    def get(self, base_url: str, username: str) -> tuple[str, float, float] | None:
+        """
+        Get the cached token of a user
+        :return: (token, expires_at, refresh_at) as epoch seconds, or None if no
+        unexpired token is cached
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT token, expires_at, refresh_at FROM tokens "
+                "WHERE base_url = ? AND username = ? AND expires_at > ?",
+                (base_url, username, time.time()),
+            ).fetchone()
+        if row is None:
+            return None
+        token, expires_at, refresh_at = row
+        return json.loads(token), expires_at, refresh_at
+
+    def put(
+        self,
+        base_url: str,
+        username: str,
+        token: str,
+        expires_at: float,
+        refresh_at: float,
+    ) -> None:
+        """
+        Store the token of a user, replacing the previous one
+        :param expires_at: epoch seconds at which the token expires
+        :param refresh_at: epoch seconds after which the token should be renewed
+        """
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO tokens "
+                "(base_url, username, token, expires_at, refresh_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (base_url, username, json.dumps(token), expires_at, refresh_at),
+            )
+
+    def delete(self, base_url: str, username: str, token: str) -> None:
+        """
+        Remove the cached token of a user if it is still the given one,
+        so that a token renewed meanwhile by another process is kept
+        """
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM tokens WHERE base_url = ? AND username = ? AND token = ?",
+                (base_url, username, json.dumps(token)),
+            )
+
+    def close(self) -> None:
+        """
+        Close the token cache database
+        """
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,239 @@
+import fcntl
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, List, TextIO, Tuple
+
+from client_app_cli.arguments.arguments import Arguments
+from client_app_cli.constants import constant
+from client_app_cli.exceptions.exceptions import CheckpointException
+
+
+class Checkpoint:
+    """
+    Append-only JSON lines file of the work units a search has completed: the outcome of
+    the discovery of every year and the scan result of every page. Units are appended in
+    batches, so that a crashed run loses at most one batch, and a resumed run only
+    fetches the units missing from the file.
+    The first line identifies the search, a file written by another search is refused.
+    The file is locked while open, so that two runs of the same search never write it
+    at the same time.
+    A write failure, such as a full disk, disables the checkpoint with a warning instead of
+    failing the search
+    """
+
+    def __init__(
+        self,
+        path: str,
+        key: str,
+        resume: bool = False,
+        batch_size: int = constant.CHECKPOINT_BATCH_SIZE,
+        flush_seconds: float = constant.CHECKPOINT_FLUSH_SECONDS,
+    ) -> None:
+        """
+        Open and lock the checkpoint file, reading its units when resuming, truncating it
+        otherwise
+        :param path: path of the checkpoint file
+        :param key: identity of the search, see key_for
+        :param resume: whether to keep the units of the previous run
+        :param batch_size: units buffered before they are appended
+        :param flush_seconds: longest time a unit stays buffered
+        :raises CheckpointException: if resuming a file written by another search, or if
+        another run holds the file
+        :raises OSError: if the file cannot be opened
+        """
+        self.path = path
+        self.key = key
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        # the write failure that disabled the checkpoint, if any
+        self.error: OSError | None = None
+        self.years: Dict[int, Any] = {}
+        self.pages: Dict[Tuple[int, int], Any] = {}
+        self._pending: List[Dict[str, Any]] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = self.__open_locked()
+        try:
+            if resume and self._file.seek(0, os.SEEK_END):
+                torn = self.__load()
+                if torn:
+                    # the next batch must not be glued to the torn line
+                    self._file.write("\n")
+            else:
+                # truncated only once locked, a running search keeps its file
+                self._file.truncate(0)
+                self.__append([{"key": key}])
+        except BaseException:
+            self._file.close()
+            raise
+
+    @staticmethod
+    def key_for(args: Arguments, base_url: str) -> str:
+        """
+        Identity of a search: its server, years, terms and options
+        """
+        search = {
+            "base_url": base_url,
+            "years": sorted(set(args.years)),
+            "search": args.search_terms,
+            "count_only": args.count_only,
+            "regex": args.regex,
+        }
+        return hashlib.sha256(json.dumps(search).encode()).hexdigest()[:32]
+
+    @staticmethod
+    def default_path(key: str) -> str:
+        """
+        Checkpoint file of a search in the cache directory, one per search
+        """
+        return os.path.join(constant.CHECKPOINT_DIR, f"{key}.jsonl")
+
+    def __len__(self) -> int:
+        """
+        :return: number of completed units
+        """
+        return len(self.years) + len(self.pages)
+
+    def record_year(self, year: int, outcome: Any) -> None:
+        """
+        Record the outcome of the discovery of a year, a JSON value
+        """
+        with self._lock:
+            self.years[year] = outcome
+            self._pending.append({"year": year, "outcome": outcome})
+            self.__flush_if_due()
+
+    def record_page(self, year: int, page: int, result: Any) -> None:
+        """
+        Record the scan result of a page, a JSON value
+        """
+        with self._lock:
+            self.pages[(year, page)] = result
+            self._pending.append({"year": year, "page": page, "result": result})
+            self.__flush_if_due()
+
+    def flush(self) -> None:
+        """
+        Append the buffered units to the file
+        """
+        with self._lock:
+            self.__flush()
+
+    def close(self) -> None:
+        """
+        Append the buffered units and close the file
+        """
+        with self._lock:
+            if self._file.closed:
+                return
+            self.__flush()
+            try:
+                self._file.close()
+            except OSError as e:
+                # flushing again the line of a failed write, only reported once
+                if self.error is None:
+                    self.error = e
+                    print(f"Checkpoint {self.path} disabled: {e}", file=sys.stderr)
+
+    def remove(self) -> None:
+        """
+        Close and delete the file once the search is complete
+        """
+        # unlinked before the lock is released, so that no other run writes it in between
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Cannot remove the checkpoint {self.path}: {e}", file=sys.stderr)
+        self.close()
+
+    def __open_locked(self) -> TextIO:
+        """
+        Open the file without truncating it and take its exclusive lock
+        :raises CheckpointException: if another run holds the lock
+        """
+        while True:
+            file = open(self.path, "a+", encoding="utf-8")
+            try:
+                fcntl.flock(file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                file.close()
+                raise CheckpointException(
+                    f"{self.path} is in use by another run of this search"
+                ) from None
+            except BaseException:
+                file.close()
+                raise
+            # the run holding the lock may have removed the file before releasing it
+            try:
+                if os.path.samestat(os.fstat(file.fileno()), os.stat(self.path)):
+                    return file
+            except FileNotFoundError:
+                pass
+            file.close()
+
+    def __flush_if_due(self) -> None:
+        if (
+            len(self._pending) >= self.batch_size
+            or time.monotonic() - self._last_flush >= self.flush_seconds
+        ):
+            self.__flush()
+
+    def __flush(self) -> None:
+        """
+        Append the buffered units as one batch line, must be called holding the lock
+        """
+        if self._pending and self.error is None:
+            self.__append(self._pending)
+            self._pending = []
+        self._last_flush = time.monotonic()
+
+    def __append(self, units: List[Dict[str, Any]]) -> None:
+        """
+        Append one line and wait until it is on disk
+        """
+        try:
+            self._file.write(json.dumps(units, separators=(",", ":")) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except OSError as e:
+            self.error = e
+            print(f"Checkpoint {self.path} disabled: {e}", file=sys.stderr)
+
+    def __load(self) -> bool:
+        """
+        Read the units of the previous run, ignoring a last line torn by a crash
+        :return: whether the file ends with a torn line
+        :raises CheckpointException: if the file was written by another search
+        """
+        self._file.seek(0)
+        content = self._file.read()
+        lines = content.splitlines()
+        try:
+            header = json.loads(lines[0])[0] if lines else {}
+        except (ValueError, IndexError, KeyError):
+            header = {}
+        if header.get("key") != self.key:
+            raise CheckpointException(
+                f"{self.path} was not written by this search, remove it or run without --resume"
+            )
+        for line in lines[1:]:
+            try:
+                units = json.loads(line)
+            except ValueError:
+                continue
+            for unit in units:
+                if "page" in unit:
+                    self.pages[(unit["year"], unit["page"])] = unit["result"]
+                else:
+                    self.years[unit["year"]] = unit["outcome"]
+        return bool(content) and not content.endswith("\n")
@@ -1,5 +1,82 @@
+import os
+
 BASE_URL = "http://localhost:8080/"
 AUTH_API = "api/auth"
 MOVIES_API = "api/movies/{year}/{page}"
 DEFAULT_USERNAME = "username"
 DEFAULT_PASSWORD = "password"
+MAX_WORKERS = 5
+MAX_HOSTS = 10
+MAX_IN_FLIGHT = 100
+WINDOW_PER_WORKER = 4
+FIRST_PROBE_PAGE = 100
+PROBES_PER_ROUND = 4
+DISCOVERY_BINARY = "binary"
+DISCOVERY_KARY = "kary"
+DISCOVERY_MODES = (DISCOVERY_BINARY, DISCOVERY_KARY)
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "movie-client")
+CACHE_FILE = "pages.sqlite3"
+CACHE_TTL_SECONDS = 3600
+CACHE_MAX_BYTES = 256 * 1024 * 1024
+TOKEN_CACHE_FILE = "tokens.sqlite3"
+HINTS_FILE = "hints.sqlite3"
+MEMORY_CACHE = ":memory:"
+OUTPUT_TEXT = "text"
+OUTPUT_NDJSON = "ndjson"
+OUTPUT_CSV = "csv"
+OUTPUT_FORMATS = (OUTPUT_TEXT, OUTPUT_NDJSON, OUTPUT_CSV)
+SNAPSHOT_FILE = "snapshot.sqlite3"
+SOCKET_FILE = os.path.join(CACHE_DIR, "daemon.sock")
+NGRAM_SIZE = 3
+COMMAND_FETCH = "fetch"
+COMMAND_SNAPSHOT = "snapshot"
+COMMAND_SERVE = "serve"
+COMMAND_QUERY = "query"
+COMMAND_BATCH = "batch"
+COMMANDS = (
+    COMMAND_FETCH,
+    COMMAND_SNAPSHOT,
+    COMMAND_SERVE,
+    COMMAND_QUERY,
+    COMMAND_BATCH,
+)
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = 32
+LATENCY_TOLERANCE = 2.0
+MAX_RETRIES = 3
+RETRY_BASE_DELAY = 0.2
+RETRY_MAX_DELAY = 5.0
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+TOKEN_REFRESH_RATIO = 0.8
+PHASE_AUTH = "auth"
+PHASE_PROBE = "probe"
+PHASE_FETCH = "fetch"
+METRICS_JSON = "json"
+METRICS_PROMETHEUS = "prometheus"
+METRICS_FORMATS = (METRICS_JSON, METRICS_PROMETHEUS)
+TOKEN_REFRESH_RETRY_DELAY = 1.0
+JSON_PARSER_AUTO = "auto"
+JSON_PARSER_STDLIB = "json"
+JSON_PARSER_ORJSON = "orjson"
+JSON_PARSERS = (JSON_PARSER_AUTO, JSON_PARSER_STDLIB, JSON_PARSER_ORJSON)
+CONNECT_TIMEOUT = 5.0
+READ_TIMEOUT = 30.0
+HEDGE_PERCENTILE = 0.95
+HEDGE_MAX_RATIO = 0.05
+HEDGE_WINDOW = 256
+HEDGE_MIN_SAMPLES = 20
+HEDGE_MIN_DELAY = 0.005
+BALANCE_P2C = "p2c"
+BALANCE_LEAST = "least"
+BALANCE_POLICIES = (BALANCE_P2C, BALANCE_LEAST)
+EJECT_AFTER = 3
+EJECT_SECONDS = 10.0
+TRACE_CHROME = "chrome"
+TRACE_SPEEDSCOPE = "speedscope"
+TRACE_FORMATS = (TRACE_CHROME, TRACE_SPEEDSCOPE)
+CHECKPOINT_DIR = os.path.join(CACHE_DIR, "checkpoints")
+CHECKPOINT_BATCH_SIZE = 50
+CHECKPOINT_FLUSH_SECONDS = 1.0
+APPROX_ERROR = 0.1
+APPROX_CONFIDENCE = 0.95
+APPROX_MIN_PAGES = 30
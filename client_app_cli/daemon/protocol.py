@@ -0,0 +1,106 @@
+"""
+Line based JSON protocol between the query client and the daemon.
+A query is one line {"years": [...], "search": [...], "count_only": bool, "regex": bool},
+the answer is one line {"results": {term: {year: YearResult.to_dict()}}} or {"error": message}
+"""
+
+import json
+from typing import Any, Dict
+
+from client_app_cli.arguments.arguments import Arguments
+from client_app_cli.results.year_result import YearResult
+from client_app_cli.search.matcher import Matcher
+
+
+def encode_query(args: Arguments) -> bytes:
+    """
+    Encode the arguments of a query as one line
+    """
+    query = {
+        "years": list(args.years),
+        "search": args.search_terms,
+        "count_only": args.count_only,
+        "regex": args.regex,
+    }
+    return json.dumps(query).encode() + b"\n"
+
+
+def decode_query(line: bytes) -> Arguments:
+    """
+    Decode and validate a query line
+    :raises ValueError: if the query is malformed
+    """
+    return query_from_dict(json.loads(line))
+
+
+def query_from_dict(query: Any) -> Arguments:
+    """
+    Validate a decoded query and build its arguments
+    :raises ValueError: if the query is malformed
+    """
+    if not isinstance(query, dict):
+        raise ValueError("a query must be a JSON object")
+    years = query.get("years")
+    search = query.get("search")
+    if (
+        not isinstance(years, list)
+        or not years
+        or not all(
+            isinstance(year, int) and not isinstance(year, bool) for year in years
+        )
+    ):
+        raise ValueError("years must be a non-empty list of integers")
+    if isinstance(search, str):
+        search = [search]
+    if (
+        not isinstance(search, list)
+        or not search
+        or not all(isinstance(term, str) for term in search)
+    ):
+        raise ValueError("search must be a string or a non-empty list of strings")
+    for flag in ("count_only", "regex"):
+        if not isinstance(query.get(flag, False), bool):
+            raise ValueError(f"{flag} must be true or false")
+    if query.get("regex", False):
+        Matcher.compile_patterns(search)
+    return Arguments(
+        years,
+        search,
+        query.get("count_only", False),
+        query.get("regex", False),
+    )
+
+
+def encode_results(results: Dict[str, Dict[int, YearResult]]) -> bytes:
+    """
+    Encode the results of MovieFetcher.search_movies as one line
+    """
+    encoded = {
+        term: {year: result.to_dict() for year, result in term_results.items()}
+        for term, term_results in results.items()
+    }
+    return json.dumps({"results": encoded}).encode() + b"\n"
+
+
+def encode_error(message: str) -> bytes:
+    """
+    Encode a failed query as one line
+    """
+    return json.dumps({"error": message}).encode() + b"\n"
+
+
+def decode_answer(line: bytes) -> Dict[str, Dict[int, YearResult]]:
+    """
+    Decode an answer line into the shape of MovieFetcher.search_movies, with integer years
+    :raises ValueError: if the daemon answered with an error
+    """
+    answer = json.loads(line)
+    if "error" in answer:
+        raise ValueError(answer["error"])
+    return {
+        term: {
+            int(year): YearResult.from_dict(result)
+            for year, result in term_results.items()
+        }
+        for term, term_results in answer["results"].items()
+    }
@@ -0,0 +1,44 @@
+import socket
+from typing import Dict
+
+from client_app_cli.arguments.arguments import Arguments
+from client_app_cli.constants import constant
+from client_app_cli.daemon import protocol
+from client_app_cli.exceptions.exceptions import DaemonException
+from client_app_cli.results.year_result import YearResult
+
+
+class QueryClient:
+    """
+    Thin client sending queries to a running daemon.
+    Only needs the standard library, so it starts without loading the network stack
+    """
+
+    def __init__(self, socket_path: str = constant.SOCKET_FILE) -> None:
+        """
+        :param socket_path: path of the daemon's Unix socket
+        """
+        self.socket_path = socket_path
+
+    def query(self, args: Arguments) -> Dict[str, Dict[int, YearResult]]:
+        """
+        Ask the daemon for the movies matching the arguments
+        :return: results in the same shape as MovieFetcher.search_movies
+        :raises DaemonException: if the daemon is not running or rejects the query
+        """
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+                connection.connect(self.socket_path)
+                connection.sendall(protocol.encode_query(args))
+                with connection.makefile("rb") as answer:
+                    line = answer.readline()
+        except OSError as e:
+            raise DaemonException(
+                f"cannot reach the daemon on {self.socket_path}: {e}"
+            ) from e
+        if not line:
+            raise DaemonException("the daemon closed the connection without answering")
+        try:
+            return protocol.decode_answer(line)
+        except ValueError as e:
+            raise DaemonException(str(e)) from e
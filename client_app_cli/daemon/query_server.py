@@ -0,0 +1,116 @@
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+from typing import TYPE_CHECKING
+
+from client_app_cli.constants import constant
+from client_app_cli.daemon import protocol
+from client_app_cli.exceptions.exceptions import DaemonException
+
+if TYPE_CHECKING:
+    from client_app_cli.fetcher.movie_fetcher import MovieFetcher
+
+
+class QueryServer:
+    """
+    Daemon answering search queries over a Unix socket with one long-lived MovieFetcher,
+    so that its token, its warm connection pool and its page cache are shared by every query.
+    Queries are answered one at a time, connections may send several queries in a row
+    """
+
+    def __init__(
+        self, fetcher: "MovieFetcher", socket_path: str = constant.SOCKET_FILE
+    ) -> None:
+        """
+        Bind the daemon socket, readable and writable by its owner only
+        :param fetcher: fetcher answering the queries
+        :param socket_path: path of the Unix socket
+        :raises DaemonException: if another daemon already listens on the socket or the
+        socket cannot be bound
+        """
+        self.fetcher = fetcher
+        self.socket_path = socket_path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(socket_path)
+        try:
+            if directory:
+                os.makedirs(directory, mode=0o700, exist_ok=True)
+            self.__remove_stale_socket()
+        except OSError as e:
+            raise DaemonException(f"cannot bind {socket_path}: {e}") from e
+
+        query_server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    if line.strip():
+                        self.wfile.write(query_server.answer(line))
+
+        # the socket is created owner-only, any local user could otherwise use the token
+        umask = os.umask(0o177)
+        try:
+            self._server = socketserver.ThreadingUnixStreamServer(socket_path, Handler)
+        except OSError as e:
+            raise DaemonException(f"cannot bind {socket_path}: {e}") from e
+        finally:
+            os.umask(umask)
+        self._server.daemon_threads = True
+
+    def answer(self, line: bytes) -> bytes:
+        """
+        Answer one query line
+        :return: answer line with the search results or an error
+        """
+        try:
+            args = protocol.decode_query(line)
+            # the fetcher runs one search at a time, its worker pools are per search
+            with self._lock:
+                results = self.fetcher.search_movies(args)
+        except (ValueError, json.JSONDecodeError) as e:
+            return protocol.encode_error(str(e))
+        except Exception as e:
+            print(f"Unexpected error while answering a query: {e}", file=sys.stderr)
+            return protocol.encode_error(f"unexpected error: {e}")
+        return protocol.encode_results(results)
+
+    def serve_forever(self) -> None:
+        """
+        Answer queries until shutdown is called from another thread
+        """
+        self._server.serve_forever(poll_interval=0.1)
+
+    def shutdown(self) -> None:
+        """
+        Stop serve_forever, must be called from another thread
+        """
+        self._server.shutdown()
+
+    def close(self) -> None:
+        """
+        Close the socket and remove its file
+        """
+        self._server.server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def __remove_stale_socket(self) -> None:
+        """
+        Remove the socket file left by a daemon that did not exit cleanly
+        :raises DaemonException: if a daemon still listens on it
+        """
+        if not os.path.exists(self.socket_path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except OSError:
+            os.unlink(self.socket_path)
+        else:
+            raise DaemonException(f"a daemon is already serving on {self.socket_path}")
+        finally:
+            probe.close()
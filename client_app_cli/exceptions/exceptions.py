@@ -4,3 +4,11 @@ class AuthenticationException(Exception):
 
 class MovieFetcherException(Exception):
     pass
+
+
+class DaemonException(Exception):
+    pass
+
+
+class CheckpointException(Exception):
+    pass
@@ -0,0 +1,284 @@
+import asyncio
+import sys
+import time
+from typing import Any, List, Tuple
+
+import aiohttp
+
+from client_app_cli.arguments.arguments import Arguments
+from client_app_cli.auth.authenticator import Authenticator
+from client_app_cli.constants import constant
+from client_app_cli.exceptions.exceptions import (
+    AuthenticationException,
+    MovieFetcherException,
+)
+from client_app_cli.fetcher.page_decoder import PageDecoder
+from client_app_cli.results.year_result import TitleList, YearResult
+
+
+class AsyncMovieFetcher:
+    """
+    asyncio based alternative to the MovieFetcher.
+    Runs the page probing and the page downloads of every requested year on one event loop,
+    bounded by a configurable number of in-flight requests instead of a pool of threads
+    """
+
+    def __init__(
+        self,
+        authenticator: Authenticator,
+        max_in_flight: int = constant.MAX_IN_FLIGHT,
+        decoder: PageDecoder | None = None,
+    ) -> None:
+        """
+        Initialize the async movie fetcher with Authenticator object.
+        :param authenticator: Instance to obtain bearer token for API requests
+        :param max_in_flight: maximum number of concurrent requests
+        :param decoder: JSON decoder of the page bodies, the fastest one installed if not given
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be a positive integer")
+        self.authenticator = authenticator
+        self.max_in_flight = max_in_flight
+        self.decoder = decoder if decoder is not None else PageDecoder()
+
+    def fetch_movies(self, args: Arguments) -> dict[int, YearResult]:
+        """
+        Fetch movie data for the specified years on a new event loop.
+        Returns the same shape as MovieFetcher.fetch_movies
+        :return: A dictionary mapping each year to its YearResult
+        """
+        return asyncio.run(self.fetch_movies_async(args))
+
+    async def fetch_movies_async(self, args: Arguments) -> dict[int, YearResult]:
+        """
+        Fetch movie data for all the specified years concurrently
+        :return: A dictionary mapping each year to its YearResult
+        """
+        years = sorted(set(args.years))
+        # authentication goes through the blocking authenticator, serialize it on the loop
+        self._auth_lock = asyncio.Lock()
+        self._in_flight = asyncio.Semaphore(self.max_in_flight)
+        connector = aiohttp.TCPConnector(
+            limit=self.max_in_flight, limit_per_host=self.max_in_flight
+        )
+        async with aiohttp.ClientSession(connector=connector) as session:
+            results = await asyncio.gather(
+                *(
+                    self.__fetch_year(session, year, args.search_term, args.count_only)
+                    for year in years
+                )
+            )
+        return dict(zip(years, results))
+
+    async def __fetch_year(
+        self,
+        session: aiohttp.ClientSession,
+        year: int,
+        search_term: str,
+        count_only: bool,
+    ) -> YearResult:
+        """
+        Fetch the movie count and the filtered movies for one year
+        :param count_only: whether to only count the matches instead of keeping them
+        :return: result of the year, with its error if it failed
+        """
+        try:
+            page = await self.find_lowest_failing_page_for_year(session, year)
+
+            if not search_term:
+                movies = await self.fetch_movies_page(
+                    session, page - 1, year, constant.PHASE_PROBE
+                )
+                return YearResult(10 * (page - 2) + len(movies), pages_fetched=page - 1)
+
+            search_term_lower = search_term.lower()
+            if count_only:
+                counts = await asyncio.gather(
+                    *(
+                        self.fetch_and_count(session, p, year, search_term_lower)
+                        for p in range(1, page)
+                    ),
+                    return_exceptions=True,
+                )
+                result = YearResult()
+                for page_count in counts:
+                    if isinstance(page_count, BaseException):
+                        print(
+                            f"Error occurred while fetching: {page_count}",
+                            file=sys.stderr,
+                        )
+                        result.pages_failed += 1
+                    else:
+                        result.count += page_count
+                        result.pages_fetched += 1
+                return result
+
+            results = await asyncio.gather(
+                *(
+                    self.fetch_and_filter(session, p, year, search_term_lower)
+                    for p in range(1, page)
+                ),
+                return_exceptions=True,
+            )
+            filtered_movies = TitleList()
+            pages_failed = 0
+            for page_movies in results:
+                if isinstance(page_movies, BaseException):
+                    print(
+                        f"Error occurred while fetching: {page_movies}", file=sys.stderr
+                    )
+                    pages_failed += 1
+                else:
+                    filtered_movies.extend(page_movies)
+            return YearResult(
+                len(filtered_movies),
+                filtered_movies,
+                len(results) - pages_failed,
+                pages_failed,
+            )
+
+        except (AuthenticationException, MovieFetcherException) as e:
+            print(f"{e} for year {year}", file=sys.stderr)
+            return YearResult(error=str(e))
+
+        except Exception as e:
+            print(f"Unexpected error while fetching year {year}: {e}", file=sys.stderr)
+            return YearResult(error=f"unexpected error: {e}")
+
+    async def find_lowest_failing_page_for_year(
+        self, session: aiohttp.ClientSession, year: int
+    ) -> int:
+        """
+        Find the first page that does not exist for the given year with an
+        exponential search followed by a binary search
+        :return: lowest failing page
+        """
+        lower = 1
+        upper = 100
+        page = upper
+
+        while True:
+            # do the exponential growth to get the failing page
+            status, body = await self.fetch(session, page, year, constant.PHASE_PROBE)
+            if status == 200:
+                lower = page + 1
+                upper = 2 * page
+                page = upper
+            else:
+                break
+
+        # Do binary search to find the lowest failing page
+        while lower <= upper:
+            page = lower + (upper - lower) // 2
+            status, body = await self.fetch(session, page, year, constant.PHASE_PROBE)
+            if status == 200:
+                lower = page + 1
+            else:
+                upper = page - 1
+        if lower == 1:
+            raise MovieFetcherException(self.__error_message(status, body))
+
+        # every page below lower exists and lower itself failed
+        return lower
+
+    def __error_message(self, status: int, raw: bytes) -> str:
+        """
+        Read the error of a failed request from its body, which a proxy or an overloaded
+        server may answer with something else than the JSON error of the movie server
+        """
+        try:
+            return str(self.decoder.decode(raw)["error"])
+        except (ValueError, KeyError, TypeError):
+            return f"request failed with status {status}"
+
+    async def __bearer_token(self) -> str | None:
+        """
+        Get a bearer token without blocking the event loop on the authentication request
+        """
+        if self.authenticator.has_valid_token():
+            return self.authenticator.token
+        async with self._auth_lock:
+            return await asyncio.get_running_loop().run_in_executor(
+                None, self.authenticator.authenticate
+            )
+
+    async def fetch(
+        self,
+        session: aiohttp.ClientSession,
+        page: int,
+        year: int,
+        phase: str = constant.PHASE_FETCH,
+    ) -> Tuple[int, Any]:
+        """
+        Fetch movies for given year and page
+        :param session: aiohttp session to send the request with
+        :param page: number to fetch
+        :param year: year to fetch movies
+        :param phase: phase the request is recorded under in the authenticator's metrics
+        :return: status code, and the decoded JSON body of a 200 or the raw body otherwise
+        """
+        bearer_token = await self.__bearer_token()
+
+        url = self.authenticator.base_url + constant.MOVIES_API.format(
+            year=year, page=page
+        )
+        headers = {"Authorization": f"Bearer {bearer_token}"}
+        async with self._in_flight:
+            start = time.monotonic()
+            async with session.get(url, headers=headers) as response:
+                raw = await response.read()
+            self.authenticator.metrics.record_request(
+                phase, response.status, time.monotonic() - start, len(raw)
+            )
+            if response.status != 200:
+                # error bodies are not always JSON, only the status of a failure is used
+                return response.status, raw
+            return response.status, self.decoder.decode(raw)
+
+    async def fetch_movies_page(
+        self,
+        session: aiohttp.ClientSession,
+        page: int,
+        year: int,
+        phase: str = constant.PHASE_FETCH,
+    ) -> List[str]:
+        """
+        Fetch the movies of a page that must exist
+        :return: movie titles of the page
+        :raises MovieFetcherException: if the page was not fetched, so that an error body
+        is never read as a page of titles
+        """
+        status, movies = await self.fetch(session, page, year, phase)
+        if status != 200:
+            raise MovieFetcherException(
+                f"page {page} of year {year} failed with status {status}"
+            )
+        return movies
+
+    async def fetch_and_filter(
+        self, session: aiohttp.ClientSession, page: int, year: int, search_term: str
+    ) -> List[str]:
+        """
+        Fetch movies for given year and page and filter them based on the search term
+        :param session: aiohttp session to send the request with
+        :param page: page number to fetch
+        :param year: year to fetch movies
+        :param search_term: term to filter movies(case-insensitive)
+        :return: List of filtered movies
+        """
+        movies = await self.fetch_movies_page(session, page, year)
+        return [movie for movie in movies if search_term in movie.lower()]
+
+    async def fetch_and_count(
+        self, session: aiohttp.ClientSession, page: int, year: int, search_term: str
+    ) -> int:
+        """
+        Fetch movies for given year and page and count the ones matching the search term
+        :param session: aiohttp session to send the request with
+        :param page: page number to fetch
+        :param year: year to fetch movies
+        :param search_term: term to filter movies(case-insensitive)
+        :return: number of matching movies
+        """
+        movies = await self.fetch_movies_page(session, page, year)
+        return sum(1 for movie in movies if search_term in movie.lower())
@@ -0,0 +1,84 @@
+import threading
+import time
+
+from client_app_cli.constants import constant
+
+
+class AdaptiveConcurrencyController:
+    """
+    AIMD concurrency limit for the page requests.
+    The limit grows by one request per window of successful requests while latency is stable
+    and is halved when the server answers 429/5xx, fails to answer, or latency rises
+    """
+
+    def __init__(
+        self,
+        initial: int = constant.MAX_WORKERS,
+        min_limit: int = constant.MIN_CONCURRENCY,
+        max_limit: int = constant.MAX_CONCURRENCY,
+        latency_tolerance: float = constant.LATENCY_TOLERANCE,
+    ) -> None:
+        """
+        Initialize the controller
+        :param initial: starting concurrency limit
+        :param min_limit: lowest concurrency limit
+        :param max_limit: highest concurrency limit
+        :param latency_tolerance: ratio of the smoothed latency to the baseline latency above
+        which latency is considered rising
+        """
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError("limits must satisfy 1 <= min_limit <= max_limit")
+        if latency_tolerance <= 1:
+            raise ValueError("latency_tolerance must be greater than 1")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self._limit = float(min(max(initial, min_limit), max_limit))
+        self._smoothed: float | None = None
+        self._baseline: float | None = None
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        """
+        Current number of requests allowed in flight
+        """
+        return int(self._limit)
+
+    def record(self, latency: float, status_code: int | None) -> None:
+        """
+        Adjust the limit with the outcome of a request
+        :param latency: seconds the request took
+        :param status_code: HTTP status code, or None if the request failed without an answer
+        """
+        with self._lock:
+            if status_code is None or status_code in constant.RETRY_STATUSES:
+                self.__decrease()
+                return
+
+            if self._smoothed is None or self._baseline is None:
+                self._smoothed = self._baseline = latency
+            else:
+                self._smoothed = 0.8 * self._smoothed + 0.2 * latency
+                # the baseline follows the fastest latency and drifts up slowly
+                if self._smoothed < self._baseline:
+                    self._baseline = self._smoothed
+                else:
+                    self._baseline += (self._smoothed - self._baseline) * 0.01
+
+            if self._smoothed > self._baseline * self.latency_tolerance:
+                self.__decrease()
+            else:
+                self._limit = min(self._limit + 1 / self._limit, self.max_limit)
+
+    def __decrease(self) -> None:
+        """
+        Halve the limit, at most once per round trip so that the requests already
+        in flight during a congestion event do not shrink it repeatedly
+        """
+        now = time.monotonic()
+        if now - self._last_decrease < (self._smoothed or 0.0):
+            return
+        self._limit = max(self._limit / 2, self.min_limit)
+        self._last_decrease = now
@@ -0,0 +1,107 @@
+import collections
+import threading
+
+from client_app_cli.constants import constant
+
+
+class HedgePolicy:
+    """
+    Decides when a slow page request gets a duplicate: once it has not answered within
+    a percentile of the latencies of the recent requests. Duplicates are capped to a
+    fraction of the requests so that a slow server is not sent twice the load
+    """
+
+    def __init__(
+        self,
+        percentile: float = constant.HEDGE_PERCENTILE,
+        max_ratio: float = constant.HEDGE_MAX_RATIO,
+        window: int = constant.HEDGE_WINDOW,
+        min_samples: int = constant.HEDGE_MIN_SAMPLES,
+        min_delay: float = constant.HEDGE_MIN_DELAY,
+    ) -> None:
+        """
+        Initialize the hedge policy
+        :param percentile: latency percentile after which a request is duplicated, in (0, 1)
+        :param max_ratio: highest number of duplicates per request sent
+        :param window: number of recent latencies the percentile is computed over
+        :param min_samples: latencies needed before the first duplicate
+        :param min_delay: shortest wait in seconds before a duplicate
+        """
+        if not 0 < percentile < 1:
+            raise ValueError("percentile must be in (0, 1)")
+        if max_ratio < 0:
+            raise ValueError("max_ratio must not be negative")
+        self.percentile = percentile
+        self.max_ratio = max_ratio
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self._latencies: collections.deque[float] = collections.deque(maxlen=window)
+        self._delay: float | None = None
+        self._requests = 0
+        self._hedges = 0
+        self._lock = threading.Lock()
+
+    def record(self, latency: float) -> None:
+        """
+        Record the latency of an answered request
+        """
+        with self._lock:
+            self._latencies.append(latency)
+            self._delay = None
+
+    def start(self) -> float | None:
+        """
+        Count a new request
+        :return: seconds to wait for its answer before duplicating it, or None while
+        too few latencies are known
+        """
+        with self._lock:
+            self._requests += 1
+            if len(self._latencies) < self.min_samples:
+                return None
+            if self._delay is None:
+                ordered = sorted(self._latencies)
+                rank = min(int(self.percentile * len(ordered)), len(ordered) - 1)
+                self._delay = max(ordered[rank], self.min_delay)
+            return self._delay
+
+    def acquire(self) -> bool:
+        """
+        Take a duplicate from the budget
+        :return: whether the request may be duplicated
+        """
+        with self._lock:
+            if self._hedges + 1 > self.max_ratio * self._requests:
+                return False
+            self._hedges += 1
+            return True
+
+
+class HedgeStats:
+    """
+    Thread-safe counters of the duplicated page requests
+    """
+
+    def __init__(self) -> None:
+        self.hedges = 0
+        self.wins = 0
+        self.delayed = 0
+        self.denied = 0
+        self._lock = threading.Lock()
+
+    def record(self, hedged: bool, won: bool = False, delayed: bool = False) -> None:
+        """
+        Record the outcome of a request slower than the hedge delay, once per request
+        :param hedged: whether it was duplicated, or answered before the budget allowed it
+        :param won: whether the duplicate answered first
+        :param delayed: whether the duplicate had to wait for the budget
+        """
+        with self._lock:
+            if not hedged:
+                self.denied += 1
+                return
+            self.hedges += 1
+            if won:
+                self.wins += 1
+            if delayed:
+                self.delayed += 1
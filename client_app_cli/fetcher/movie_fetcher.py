@@ -1,15 +1,37 @@
 import concurrent.futures
-from typing import List, Any
+import math
+import sqlite3
+import sys
+import threading
+import time
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
 import requests
 from requests import Response
 
 from client_app_cli.arguments.arguments import Arguments
 from client_app_cli.auth.authenticator import Authenticator
+from client_app_cli.cache.page_cache import PageCache
+from client_app_cli.cache.page_hints import PageHints
+from client_app_cli.checkpoint.checkpoint import Checkpoint
 from client_app_cli.exceptions.exceptions import (
     AuthenticationException,
     MovieFetcherException,
 )
 from client_app_cli.constants import constant
+from client_app_cli.fetcher.concurrency import AdaptiveConcurrencyController
+from client_app_cli.fetcher.hedging import HedgePolicy, HedgeStats
+from client_app_cli.fetcher.page_decoder import BytePrefilter, PageDecoder
+from client_app_cli.fetcher.page_scheduler import PageScheduler
+from client_app_cli.fetcher.replica_pool import Replica, ReplicaPool
+from client_app_cli.fetcher.sampling import PageSampler
+from client_app_cli.fetcher.retry import RetryPolicy, RetryStats
+from client_app_cli.metrics.metrics import Metrics
+from client_app_cli.results.year_result import TitleList, YearResult
+from client_app_cli.search.matcher import Matcher
+from client_app_cli.tracing.tracer import Tracer, traced
+from client_app_cli.transport.http_transport import HttpTransport
 
 
 class MovieFetcher:
@@ -18,12 +40,68 @@ class MovieFetcher:
     It uses an authenticator to authenticate the user by getting a bearer token and handles pagination for each year
     """
 
-    def __init__(self, authenticator: Authenticator) -> None:
+    def __init__(
+        self,
+        authenticator: Authenticator,
+        transport: HttpTransport | None = None,
+        max_workers: int = constant.MAX_WORKERS,
+        discovery: str = constant.DISCOVERY_BINARY,
+        probes_per_round: int = constant.PROBES_PER_ROUND,
+        page_cache: PageCache | None = None,
+        controller: AdaptiveConcurrencyController | None = None,
+        retry_policy: RetryPolicy | None = None,
+        metrics: Metrics | None = None,
+        page_hints: PageHints | None = None,
+        decoder: PageDecoder | None = None,
+        hedge_policy: HedgePolicy | None = None,
+        replicas: ReplicaPool | None = None,
+        tracer: Tracer | None = None,
+    ) -> None:
         """
         Initialize the movie fetcher with Authenticator object.
         :param authenticator: Instance to obtain bearer token for API requests
+        :param transport: HTTP transport for page requests, shares the authenticator's one if not given
+        :param max_workers: number of worker threads reused for the whole run
+        :param discovery: page boundary discovery mode, binary or k-ary
+        :param probes_per_round: number of concurrent probes per round of the k-ary discovery
+        :param page_cache: optional persistent cache of page bodies
+        :param controller: optional adaptive limit of the requests in flight, up to max_workers
+        :param retry_policy: retries of the failed requests, 3 retries with backoff if not given
+        :param metrics: metrics the page requests are recorded in, shares the authenticator's ones if not given
+        :param page_hints: optional record of the page counts of the previous runs, checked before discovery
+        :param decoder: JSON decoder of the page bodies, the fastest one installed if not given
+        :param hedge_policy: if given, page requests slower than its latency percentile are duplicated
+        :param replicas: server replicas the page requests are spread over, only the authenticator's server if not given
+        :param tracer: if given, records the spans of the years, discovery, requests, decoding and scanning
         """
+        if discovery not in constant.DISCOVERY_MODES:
+            raise MovieFetcherException(f"unknown discovery mode {discovery}")
+        if probes_per_round < 1:
+            raise MovieFetcherException("probes_per_round must be a positive integer")
         self.authenticator = authenticator
+        self.max_workers = max_workers
+        self.discovery = discovery
+        self.probes_per_round = probes_per_round
+        self.page_cache = page_cache
+        self.controller = controller
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.retry_stats = RetryStats()
+        self._probe_executor: concurrent.futures.ThreadPoolExecutor | None = None
+        self._probe_lock = threading.Lock()
+        self.transport = transport if transport is not None else authenticator.transport
+        self.metrics = metrics if metrics is not None else authenticator.metrics
+        self.page_hints = page_hints
+        # guards dropping the page cache or the page hints after a failure
+        self._store_lock = threading.Lock()
+        self.decoder = decoder if decoder is not None else PageDecoder()
+        self.hedge_policy = hedge_policy
+        self.hedge_stats = HedgeStats()
+        self._hedge_executor: concurrent.futures.ThreadPoolExecutor | None = None
+        self._hedge_lock = threading.Lock()
+        self.replicas = (
+            replicas if replicas is not None else ReplicaPool([authenticator])
+        )
+        self.tracer = tracer
 
     @staticmethod
     def __process_years(years: List[int]):
@@ -32,15 +110,25 @@ class MovieFetcher:
         """
         return set(years)
 
-    def find_lowest_failing_page_for_year(self, year: int) -> int:
+    def find_lowest_failing_page_for_year(
+        self, year: int, probed: Dict[int, Any] | None = None
+    ) -> int:
+        """
+        Find the first page that does not exist for the given year with an
+        exponential search followed by a binary search, one request at a time
+        :param year: year to fetch movies
+        :param probed: if given, collects the movies of every successfully probed page
+        :return: lowest failing page
+        """
         lower = 1
-        upper = 100
+        upper = constant.FIRST_PROBE_PAGE
         page = upper
 
         while True:
             # do the exponential growth to get the failing page
-            response = self.fetch(page, year)
+            response = self.fetch(page, year, constant.PHASE_PROBE)
             if response.status_code == 200:
+                self.__keep_probe(probed, page, response)
                 lower = page + 1
                 upper = 2 * page
                 page = upper
@@ -51,80 +139,752 @@ class MovieFetcher:
         while lower <= upper:
             mid = lower + (upper - lower) // 2
             page = mid
-            response = self.fetch(page, year)
+            response = self.fetch(page, year, constant.PHASE_PROBE)
             # Check for HTTP error
             if response.status_code == 200:
+                self.__keep_probe(probed, page, response)
                 lower = page + 1
             else:
                 upper = page - 1
-        if page == 1 and lower == 1:
+        if lower == 1:
             raise MovieFetcherException(response.json()["error"])
 
-        return page
+        # every page below lower exists and lower itself failed
+        return lower
+
+    def find_lowest_failing_page_kary(
+        self, year: int, probed: Dict[int, Any] | None = None
+    ) -> int:
+        """
+        Find the first page that does not exist for the given year with a k-ary search.
+        Every round sends `probes_per_round` probes at once: first growing exponentially
+        until a page fails, then splitting the remaining interval into k + 1 parts
+        :param year: year to fetch movies
+        :param probed: if given, collects the movies of every successfully probed page
+        :return: lowest failing page
+        """
+        k = self.probes_per_round
+        lower = 0  # highest page known to exist
+        upper: int | None = None  # lowest page known to fail
+        failure: Response | None = None
+        start = constant.FIRST_PROBE_PAGE
+
+        while upper is None or upper - lower > 1:
+            if upper is None:
+                pages = [start * 2**i for i in range(k)]
+                start = pages[-1] * 2
+            else:
+                step = (upper - lower) / (k + 1)
+                candidates = {lower + max(1, round(step * i)) for i in range(1, k + 1)}
+                pages = sorted(p for p in candidates if p < upper)
+
+            for page, response in zip(pages, self.__probe(pages, year)):
+                if response.status_code == 200:
+                    self.__keep_probe(probed, page, response)
+                    lower = max(lower, page)
+                elif upper is None or page < upper:
+                    upper = page
+                    failure = response
 
-    def fetch_movies(self, args: Arguments) -> dict[Any, Any]:
+        if upper == 1 and failure is not None:
+            raise MovieFetcherException(failure.json()["error"])
+        return upper
+
+    def __probe(self, pages: List[int], year: int) -> List[Response]:
         """
-        Fetch movie data from the API for the specified years, handling authentication and pagination
-        :return: A dictionary mapping each year to the count of movies fetched.
+        Fetch the given pages of a year concurrently
+        :return: responses in the same order as the pages
         """
-        movies_counts: dict[Any, Any] = {}
-        years = self.__process_years(args.years)
-        search_term = args.search_term
+        if len(pages) == 1:
+            return [self.fetch(pages[0], year, constant.PHASE_PROBE)]
+        probe = partial(self.fetch, year=year, phase=constant.PHASE_PROBE)
+        return list(self.__probe_pool().map(probe, pages))
 
-        for year in sorted(years):
-            filtered_movies: Any = []
+    def __probe_pool(self) -> concurrent.futures.ThreadPoolExecutor:
+        """
+        Get the threads sending the concurrent probes, created on first use and kept
+        for every later year and search
+        """
+        with self._probe_lock:
+            if self._probe_executor is None:
+                # a round of k-ary probes, or the two probes of a hint check, per worker
+                self._probe_executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_workers * max(self.probes_per_round, 2),
+                    thread_name_prefix="probe",
+                )
+            return self._probe_executor
+
+    def __keep_probe(
+        self, probed: Dict[int, Any] | None, page: int, response: Response
+    ) -> None:
+        """
+        Keep the movies of a successfully probed page for the filter phase
+        """
+        if probed is not None:
+            with traced(self.tracer, "decode", "decode", page=page):
+                probed[page] = self.decoder.decode(response.content)
+
+    def discover_pages(self, year: int) -> Tuple[int, Dict[int, Any]]:
+        """
+        Find the lowest failing page of a year, from its hint when it still holds,
+        otherwise with the configured discovery mode
+        :param year: year to fetch movies
+        :return: lowest failing page and the movies of the pages probed along the way
+        """
+        probed: Dict[int, Any] = {}
+        hint = self.__check_hint(year, probed)
+        if hint is not None:
+            return hint, probed
+        if self.discovery == constant.DISCOVERY_KARY:
+            page = self.find_lowest_failing_page_kary(year, probed)
+        else:
+            page = self.find_lowest_failing_page_for_year(year, probed)
+        if self.page_hints is not None:
             try:
-                page = self.find_lowest_failing_page_for_year(year)
+                self.page_hints.put(self.replicas.base_url, year, page)
+            except (OSError, sqlite3.Error) as e:
+                self.__disable_page_hints(e)
+        return page, probed
+
+    def __check_hint(self, year: int, probed: Dict[int, Any]) -> int | None:
+        """
+        Check the lowest failing page recorded for a year with two concurrent probes:
+        the page below it must still exist and the page itself must still fail
+        :param probed: collects the movies of the probed pages that exist
+        :return: the recorded page if it still holds, None if the year must be searched
+        """
+        if self.page_hints is None:
+            return None
+        try:
+            hint = self.page_hints.get(self.replicas.base_url, year)
+        except (OSError, sqlite3.Error) as e:
+            self.__disable_page_hints(e)
+            return None
+        if hint is None or hint < 2:
+            return None
+        below, at = self.__probe([hint - 1, hint], year)
+        for page, response in ((hint - 1, below), (hint, at)):
+            if response.status_code == 200:
+                self.__keep_probe(probed, page, response)
+        if below.status_code == 200 and at.status_code != 200:
+            return hint
+        return None
+
+    def fetch_movies(
+        self, args: Arguments, checkpoint: Checkpoint | None = None
+    ) -> dict[int, YearResult]:
+        """
+        Fetch movie data from the API for the specified years, handling authentication and pagination.
+        All years share one scheduler: page boundaries are discovered concurrently and the page tasks
+        of every year are fed to the same workers, years with the most pages first.
+        Only the primary search term is reported, see search_movies for many terms
+        :param checkpoint: if given, resumes from the years and pages it holds and records the new ones
+        :return: A dictionary mapping each year to its YearResult
+        """
+        return self.search_movies(args, checkpoint)[args.search_term]
+
+    def search_movies(
+        self, args: Arguments, checkpoint: Checkpoint | None = None
+    ) -> dict[str, dict[int, YearResult]]:
+        """
+        Fetch movie data for the specified years and match every page against all the search
+        terms in a single pass, so that each page is fetched once whatever the number of terms
+        :param checkpoint: if given, resumes from the years and pages it holds and records the new ones
+        :return: A dictionary mapping each search term to the result of fetch_movies for that term
+        """
+        movies_counts: dict[int, YearResult] = {}
+        if not args.regex and args.search_terms == [""]:
+            # nothing to filter, the movie counts come from the page discovery
+            for _ in self.__iter_pages(
+                args.years, movies_counts, None, checkpoint=checkpoint
+            ):
+                pass
+            return {"": movies_counts}
+
+        matcher = Matcher(args.search_terms, args.regex)
+        # count only keeps the number of matches of each term, never the titles
+        scan = matcher.count if args.count_only else matcher.filter
+        prefilter = BytePrefilter(matcher.terms, args.regex)
+        counts: List[dict[int, int]] = [{} for _ in matcher.terms]
+        titles: List[dict[int, TitleList]] = [{} for _ in matcher.terms]
+
+        for year, _, per_term in self.__iter_pages(
+            args.years, movies_counts, scan, prefilter, checkpoint
+        ):
+            for i, result in enumerate(per_term):
+                if args.count_only:
+                    counts[i][year] = counts[i].get(year, 0) + result
+                else:
+                    titles[i].setdefault(year, TitleList()).extend(result)
 
-                if not search_term:
-                    response = self.fetch(page - 1, year)
-                    movies = response.json()
-                    movies_counts[year] = [10 * (page - 2) + len(movies), None]
+        results: dict[str, dict[int, YearResult]] = {}
+        for i, term in enumerate(matcher.terms):
+            results[term] = {}
+            for year, status in movies_counts.items():
+                if args.count_only:
+                    year_titles = None
+                    count = counts[i].get(year, 0)
                 else:
-                    search_term_lower = search_term.lower()
-                    with concurrent.futures.ThreadPoolExecutor(
-                        max_workers=5
-                    ) as executor:
-                        futures = {
-                            executor.submit(
-                                self.fetch_and_filter, p, year, search_term_lower
-                            )
-                            for p in range(1, page)
-                        }
-                        for future in concurrent.futures.as_completed(futures):
-                            try:
-                                result = future.result()
-                                filtered_movies.extend(result)
-                            except Exception as e:
-                                print(f"Error occurred while fetching: {e}")
-
-                    movies_counts[year] = [len(filtered_movies), filtered_movies]
-
-            except (AuthenticationException, MovieFetcherException) as e:
-                print(f"{e} for year {year}")
-                movies_counts[year] = None
-
-            except Exception as e:
-                print(f"Unexpected error while fetching year {year}: {e}")
-                movies_counts[year] = None
-        return movies_counts
-
-    def fetch(self, page: int, year: int) -> Response:
+                    year_titles = titles[i].get(year, TitleList())
+                    count = len(year_titles)
+                results[term][year] = self.__year_result(status, count, year_titles)
+        return results
+
+    def estimate_movies(
+        self, args: Arguments, sampler: PageSampler
+    ) -> dict[str, dict[int, YearResult]]:
+        """
+        Estimate the number of movies matching every search term from a random sample of the
+        pages of each year, read until the sampler's target error or fraction is reached
+        :return: A dictionary mapping each search term to the estimated YearResult of every year,
+        with its confidence interval. Years read in full have an exact count
+        """
+        matcher = Matcher(args.search_terms, args.regex)
+        movies_counts: dict[int, YearResult] = {}
+        for year, page, counts in self.__iter_pages(
+            args.years,
+            movies_counts,
+            matcher.count,
+            BytePrefilter(matcher.terms, args.regex),
+            order=sampler.order,
+        ):
+            sampler.add(year, page, counts)
+
+        results: dict[str, dict[int, YearResult]] = {}
+        for i, term in enumerate(matcher.terms):
+            results[term] = {}
+            for year, status in movies_counts.items():
+                result = self.__year_result(status, 0, None)
+                if not result.failed:
+                    estimate, low, high = sampler.estimate(year, i)
+                    result.count = round(estimate)
+                    if low < high:
+                        result.interval = (math.floor(low), math.ceil(high))
+                results[term][year] = result
+        return results
+
+    def search_batch(
+        self,
+        queries: List[Arguments],
+        on_page: Callable[[int, int, int, dict[str, Any]], None] | None = None,
+    ) -> List[dict[str, dict[int, YearResult]]]:
+        """
+        Answer many queries with a single fetch of their pages. The page boundary of every
+        year of any query is discovered once, every page is fetched once and matched once
+        against the distinct terms of all the queries, then each query picks its own terms
+        :param queries: queries, each with its own years, terms, count only and regex options
+        :param on_page: if given, called with (query index, year, page, {term: titles or count})
+        for every query whose terms matched a page, as the pages complete
+        :return: results of every query in the shape of search_movies, in the queries order
+        """
+        matchers: dict[bool, Matcher] = {}
+        for regex in (False, True):
+            terms = [t for q in queries if q.regex == regex for t in q.search_terms]
+            if terms:
+                matchers[regex] = Matcher(terms, regex)
+        term_index = {
+            regex: {term: i for i, term in enumerate(matcher.terms)}
+            for regex, matcher in matchers.items()
+        }
+
+        def scan(movies: List[str]) -> dict[bool, List[List[str]]]:
+            return {
+                regex: matcher.filter(movies) for regex, matcher in matchers.items()
+            }
+
+        # regex patterns cannot be looked for in the raw bytes
+        prefilter = (
+            BytePrefilter(matchers[False].terms) if list(matchers) == [False] else None
+        )
+
+        query_terms = [list(dict.fromkeys(query.search_terms)) for query in queries]
+        query_years = [set(query.years) for query in queries]
+        found: List[dict[str, dict[int, Any]]] = [
+            {term: {} for term in terms} for terms in query_terms
+        ]
+        movies_counts: dict[int, YearResult] = {}
+        years = sorted(set().union(*query_years))
+
+        for year, page, per_term in self.__iter_pages(
+            years, movies_counts, scan, prefilter
+        ):
+            for i, query in enumerate(queries):
+                if year not in query_years[i]:
+                    continue
+                page_matches: dict[str, Any] = {}
+                for term in query_terms[i]:
+                    titles = per_term[query.regex][term_index[query.regex][term]]
+                    if query.count_only:
+                        found[i][term][year] = found[i][term].get(year, 0) + len(titles)
+                    else:
+                        found[i][term].setdefault(year, TitleList()).extend(titles)
+                    if titles:
+                        page_matches[term] = len(titles) if query.count_only else titles
+                if on_page is not None and page_matches:
+                    on_page(i, year, page, page_matches)
+
+        results: List[dict[str, dict[int, YearResult]]] = []
+        for i, query in enumerate(queries):
+            query_results: dict[str, dict[int, YearResult]] = {}
+            for term in query_terms[i]:
+                query_results[term] = {}
+                for year in sorted(query_years[i]):
+                    if query.count_only:
+                        year_titles = None
+                        count = found[i][term].get(year, 0)
+                    else:
+                        year_titles = found[i][term].get(year, TitleList())
+                        count = len(year_titles)
+                    query_results[term][year] = self.__year_result(
+                        movies_counts[year], count, year_titles
+                    )
+            results.append(query_results)
+        return results
+
+    def iter_matches(
+        self, args: Arguments, summary: dict[int, YearResult] | None = None
+    ) -> Iterator[Tuple[int, int, List[str]]]:
+        """
+        Stream the movies matching any of the search terms page by page, as the pages complete.
+        An empty search term matches every movie
+        :param summary: if given, filled with the YearResult of each year, without titles
+        :return: iterator of (year, page, matching titles) tuples in completion order
+        """
+        movies_counts = summary if summary is not None else {}
+        matcher = Matcher(args.search_terms, args.regex)
+        for year, page, titles in self.__iter_pages(
+            args.years,
+            movies_counts,
+            matcher.filter_any,
+            BytePrefilter(matcher.terms, args.regex),
+        ):
+            movies_counts[year].count += len(titles)
+            yield year, page, titles
+
+    @staticmethod
+    def __year_result(
+        status: YearResult, count: int, titles: TitleList | None
+    ) -> YearResult:
+        """
+        Build the result of one term for a year from the page statistics of the year
+        """
+        if status.failed:
+            return YearResult(error=status.error)
+        return YearResult(
+            count, titles, status.pages_fetched, status.pages_failed, status.error
+        )
+
+    def __iter_pages(
+        self,
+        years: List[int],
+        movies_counts: dict[int, YearResult],
+        scan: Callable[[List[str]], Any] | None,
+        prefilter: BytePrefilter | None = None,
+        checkpoint: Checkpoint | None = None,
+        order: (
+            Callable[
+                [dict[int, int], dict[int, Dict[int, Any]]], Iterable[Tuple[int, int]]
+            ]
+            | None
+        ) = None,
+    ) -> Iterator[Tuple[int, int, Any]]:
+        """
+        Discover the pages of every year, then scan every page on the shared scheduler
+        :param movies_counts: filled with the YearResult of each year, without titles: its pages
+        read and failed, and its number of movies when no pages are scanned or its error
+        :param scan: function applied to the movies of every page, or None to only count
+        the movies of each year
+        :param prefilter: if given, skips decoding the fetched pages matching none of the terms
+        :param checkpoint: if given, the years and pages it holds are not fetched again and
+        the ones completed by this run are recorded in it. Scan results must be JSON values
+        :param order: if given, gives the (year, page) tasks to scan from the page counts and
+        the probed pages of the years, pulled as the workers free up. All pages, years with
+        the most pages first, if not given
+        :return: iterator of (year, page, scan result) tuples in completion order
+        """
+        fetch_pages = scan is not None
+        unique_years = sorted(self.__process_years(years))
+        for year in unique_years:
+            movies_counts[year] = YearResult(error="not fetched")
+        # pages of every year still to be scanned, the year's span ends with its last page
+        remaining: dict[int, int] = {}
+        year_started: dict[int, float] = {}
+        done_years = checkpoint.years if checkpoint is not None else {}
+        done_pages = checkpoint.pages if checkpoint is not None else {}
+
+        with PageScheduler(self.max_workers, limiter=self.controller) as scheduler:
+            # discover the last page of every year concurrently
+            page_counts: dict[int, int] = {}
+            probed_pages: dict[int, Dict[int, Any]] = {}
+            for year in unique_years:
+                if year not in done_years:
+                    continue
+                if fetch_pages:
+                    page_counts[year], probed_pages[year] = done_years[year], {}
+                    movies_counts[year] = YearResult()
+                    remaining[year] = page_counts[year]
+                else:
+                    count, pages = done_years[year]
+                    movies_counts[year] = YearResult(count, pages_fetched=pages)
+            discoveries = scheduler.run(
+                (
+                    year,
+                    partial(self.__discover_year, year, fetch_pages, year_started),
+                )
+                for year in unique_years
+                if year not in done_years
+            )
+            with traced(self.tracer, "discover pages", "discovery"):
+                for year, future in discoveries:
+                    try:
+                        if fetch_pages:
+                            page_counts[year], probed_pages[year] = future.result()
+                            movies_counts[year] = YearResult()
+                            remaining[year] = page_counts[year]
+                            outcome: Any = page_counts[year]
+                        else:
+                            count, pages = future.result()
+                            movies_counts[year] = YearResult(count, pages_fetched=pages)
+                            outcome = [count, pages]
+                        if checkpoint is not None:
+                            checkpoint.record_year(year, outcome)
+                    except (AuthenticationException, MovieFetcherException) as e:
+                        print(f"{e} for year {year}", file=sys.stderr)
+                        movies_counts[year].error = str(e)
+                    except Exception as e:
+                        print(
+                            f"Unexpected error while fetching year {year}: {e}",
+                            file=sys.stderr,
+                        )
+                        movies_counts[year].error = f"unexpected error: {e}"
+                    if not remaining.get(year):
+                        self.__end_year_span(year, year_started)
+
+            if scan is None:
+                return
+            for year, page in PageScheduler.longest_first(page_counts):
+                if (year, page) in done_pages:
+                    remaining[year] -= 1
+                    movies_counts[year].pages_fetched += 1
+                    yield year, page, done_pages[(year, page)]
+            pages = (
+                order(page_counts, probed_pages)
+                if order is not None
+                else PageScheduler.longest_first(page_counts)
+            )
+            page_tasks = scheduler.run(
+                (
+                    (year, page),
+                    self.__scan_task(page, year, scan, probed_pages[year], prefilter),
+                )
+                for year, page in pages
+                if (year, page) not in done_pages
+            )
+            with traced(self.tracer, "scan pages", "scan"):
+                for (year, page), future in page_tasks:
+                    remaining[year] -= 1
+                    if not remaining[year]:
+                        self.__end_year_span(year, year_started)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"Error occurred while fetching: {e}", file=sys.stderr)
+                        movies_counts[year].pages_failed += 1
+                        continue
+                    movies_counts[year].pages_fetched += 1
+                    if checkpoint is not None:
+                        checkpoint.record_page(year, page, result)
+                    yield year, page, result
+
+    def __end_year_span(self, year: int, year_started: dict[int, float]) -> None:
+        """
+        Record the span of a year, from the start of its discovery to its last page
+        """
+        if self.tracer is not None and year in year_started:
+            self.tracer.add_async(
+                f"year {year}", "year", year_started[year], self.tracer.now(), year=year
+            )
+
+    def __discover_year(
+        self, year: int, fetch_pages: bool, year_started: dict[int, float]
+    ) -> Any:
+        """
+        Find the number of pages of a year, or the number of movies when the pages are not fetched
+        :param year: year to fetch movies
+        :param fetch_pages: whether the pages of the year are fetched afterwards
+        :param year_started: filled with the time the discovery of the year started when tracing
+        :return: number of pages and probed pages when fetching pages,
+        number of movies and number of pages otherwise
+        """
+        if self.tracer is not None:
+            year_started[year] = self.tracer.now()
+        with traced(self.tracer, f"discover {year}", "discovery", year=year):
+            page, probed = self.discover_pages(year)
+        if fetch_pages:
+            return page - 1, probed
+        if page - 1 in probed:
+            movies = probed[page - 1]
+        else:
+            movies = self.decoder.decode(
+                self.__page_content(page - 1, year, constant.PHASE_PROBE)
+            )
+        return 10 * (page - 2) + len(movies), page - 1
+
+    def __scan_task(
+        self,
+        page: int,
+        year: int,
+        scan: Callable[[List[str]], Any],
+        probed: Dict[int, Any],
+        prefilter: BytePrefilter | None = None,
+    ) -> Callable[[], Any]:
+        """
+        Build the scan task of a page, using the movies kept from discovery when the page was probed
+        """
+        if page in probed:
+            return partial(self.__scan, scan, probed.pop(page), page)
+        return partial(self.fetch_and_scan, page, year, scan, prefilter)
+
+    def __scan(self, scan: Callable[[List[str]], Any], movies: List[str], page: int):
+        """
+        Apply the scan function to the movies of a page
+        """
+        with traced(self.tracer, "scan", "scan", page=page):
+            return scan(movies)
+
+    def fetch(
+        self, page: int, year: int, phase: str = constant.PHASE_FETCH
+    ) -> Response:
         """
         Fetch movies for given year and page
         :param page: number to fetch
         :param year: year to fetch movies
+        :param phase: phase the request is recorded under in the metrics, probe or fetch
         :return: Response object for the fetched movies
         """
-        # Authenticate every time for each request
-        bearer_token = self.authenticator.authenticate()
+        base_url = self.replicas.base_url
+        path = constant.MOVIES_API.format(year=year, page=page)
+
+        if self.page_cache is not None:
+            try:
+                body = self.page_cache.get(base_url, year, page)
+            except (OSError, sqlite3.Error) as e:
+                self.__disable_page_cache(e)
+            else:
+                self.metrics.record_cache(body is not None)
+                if body is not None:
+                    return self.__cached_response(base_url + path, body)
 
-        # Build the request URL
-        url = self.authenticator.base_url + constant.MOVIES_API.format(
-            year=year, page=page
+        response = self.__get_with_retries(path, page, year, phase)
+        # only existing pages are cached, a failing page may appear later
+        if self.page_cache is not None and response.status_code == 200:
+            try:
+                self.page_cache.put(base_url, year, page, response.content)
+            except (OSError, sqlite3.Error) as e:
+                self.__disable_page_cache(e)
+        return response
+
+    def __disable_page_cache(self, error: Exception) -> None:
+        """
+        Go on without the page cache once it cannot be read or written, such as on a
+        full disk, the pages are then always fetched from the server
+        """
+        with self._store_lock:
+            if self.page_cache is not None:
+                print(f"Page cache disabled: {error}", file=sys.stderr)
+            self.page_cache = None
+
+    def __disable_page_hints(self, error: Exception) -> None:
+        """
+        Go on without the page hints once they cannot be read or written, every year is
+        then discovered from scratch
+        """
+        with self._store_lock:
+            if self.page_hints is not None:
+                print(f"Page hints disabled: {error}", file=sys.stderr)
+            self.page_hints = None
+
+    def __get_with_retries(
+        self, path: str, page: int, year: int, phase: str
+    ) -> Response:
+        """
+        Request a page, retrying 429/5xx answers and connection failures with backoff.
+        Every outcome is fed to the concurrency controller and recorded in the metrics
+        :raises MovieFetcherException: if the page still fails after the last retry
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = self.__hedged_get(path, phase)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                status_code = None
+                failure = str(e)
+            else:
+                status_code = response.status_code
+                failure = f"status {status_code}"
+
+            if status_code is not None and not self.retry_policy.is_retryable(
+                status_code
+            ):
+                self.retry_stats.record(attempt - 1, False)
+                return response
+            if attempt > self.retry_policy.max_retries:
+                self.retry_stats.record(attempt - 1, True)
+                raise MovieFetcherException(
+                    f"page {page} of year {year} failed after {attempt - 1} retries: {failure}"
+                )
+            self.metrics.record_retry(phase)
+            time.sleep(self.retry_policy.delay(attempt))
+
+    def __hedged_get(self, path: str, phase: str) -> Response:
+        """
+        Send a page request, duplicated if it has not answered within the hedge delay.
+        The first answer wins, the slower request is left to finish in the background
+        :raises requests.ConnectionError, requests.Timeout: if no request got an answer
+        """
+        delay = self.hedge_policy.start() if self.hedge_policy is not None else None
+        if self.hedge_policy is None or delay is None:
+            return self.__send(path, phase)
+
+        executor = self.__hedge_pool()
+        primary = executor.submit(self.__send, path, phase)
+        try:
+            return primary.result(timeout=delay)
+        except concurrent.futures.TimeoutError:
+            pass
+        delayed = not self.hedge_policy.acquire()
+        if delayed:
+            # the budget grows with every request sent, a stalled request gets its
+            # duplicate as soon as one is available
+            while not self.hedge_policy.acquire():
+                try:
+                    response = primary.result(timeout=delay)
+                except concurrent.futures.TimeoutError:
+                    continue
+                self.hedge_stats.record(hedged=False)
+                return response
+
+        # the duplicate goes through the balancer as well, usually to another replica
+        hedge = executor.submit(self.__send, path, phase)
+        pending = {primary, hedge}
+        errors: List[BaseException] = []
+        while pending:
+            done, pending = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    self.hedge_stats.record(
+                        hedged=True, won=future is hedge, delayed=delayed
+                    )
+                    return future.result()
+                errors.append(error)
+        self.hedge_stats.record(hedged=True, delayed=delayed)
+        raise errors[0]
+
+    def __send(self, path: str, phase: str) -> Response:
+        """
+        Send a page request to the replica chosen by the balancer, with its token.
+        Connection failures and retryable answers count towards ejecting the replica
+        """
+        replica = self.replicas.acquire()
+        failed = True
+        try:
+            response = self.__authorized_get(replica, path, phase)
+            failed = self.retry_policy.is_retryable(response.status_code)
+            return response
+        finally:
+            self.replicas.release(replica, failed)
+
+    def __authorized_get(self, replica: Replica, path: str, phase: str) -> Response:
+        """
+        Send a page request with the replica's token, renewed once if the replica rejects it
+        """
+        authenticator = replica.authenticator
+        url = authenticator.base_url + path
+        # Authenticate every time for each request
+        bearer_token = authenticator.authenticate()
+        response = self.__timed_get(
+            url, {"Authorization": f"Bearer {bearer_token}"}, phase
         )
-        headers = {"Authorization": f"Bearer {bearer_token}"}
-        response = requests.get(url, headers=headers)
+        if response.status_code == 401:
+            # the token may have been revoked before its expiry, e.g. a cached one
+            authenticator.invalidate(bearer_token)
+            bearer_token = authenticator.authenticate()
+            response = self.__timed_get(
+                url, {"Authorization": f"Bearer {bearer_token}"}, phase
+            )
+        return response
+
+    def __timed_get(self, url: str, headers: dict[str, str], phase: str) -> Response:
+        """
+        Send one page request and feed its outcome to the metrics, the concurrency
+        controller and the hedge policy
+        """
+        start = time.monotonic()
+        with traced(self.tracer, phase, "request", url=url) as span:
+            try:
+                response = self.transport.get(url, headers=headers)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                span["error"] = str(e)
+                self.__record(phase, None, time.monotonic() - start, 0)
+                raise
+            span["status"] = response.status_code
+        latency = time.monotonic() - start
+        self.__record(phase, response.status_code, latency, len(response.content))
+        if self.hedge_policy is not None:
+            self.hedge_policy.record(latency)
+        return response
+
+    def __record(
+        self, phase: str, status_code: int | None, latency: float, size: int
+    ) -> None:
+        """
+        Record the outcome of one request in the metrics and the concurrency controller
+        """
+        self.metrics.record_request(phase, status_code, latency, size)
+        if self.controller is not None:
+            self.controller.record(latency, status_code)
+
+    def __hedge_pool(self) -> concurrent.futures.ThreadPoolExecutor:
+        """
+        Get the threads sending the hedged requests, created on first use
+        """
+        with self._hedge_lock:
+            if self._hedge_executor is None:
+                # a primary and a duplicate for every request any worker or probe may send
+                self._hedge_executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=2 * self.max_workers * self.probes_per_round,
+                    thread_name_prefix="hedge",
+                )
+            return self._hedge_executor
+
+    def close(self) -> None:
+        """
+        Stop the probe threads, and the hedge threads without waiting for the requests
+        that lost their race
+        """
+        with self._probe_lock:
+            if self._probe_executor is not None:
+                self._probe_executor.shutdown()
+                self._probe_executor = None
+        with self._hedge_lock:
+            if self._hedge_executor is not None:
+                self._hedge_executor.shutdown(wait=False, cancel_futures=True)
+                self._hedge_executor = None
+
+    @staticmethod
+    def __cached_response(url: str, body: bytes) -> Response:
+        """
+        Build a successful Response object from a cached page body
+        """
+        response = Response()
+        response.status_code = 200
+        response.url = url
+        response.encoding = "utf-8"
+        response._content = body
         return response
 
     def fetch_and_filter(self, page: int, year: int, search_term: str) -> List[str]:
@@ -135,7 +895,57 @@ class MovieFetcher:
         :param search_term: term to filter movies(case-insensitive)
         :return: List of filtered movies
         """
-        response = self.fetch(page, year)
-        movies = response.json()
-        filtered_movies = [movie for movie in movies if search_term in movie.lower()]
-        return filtered_movies
+        body = self.__page_content(page, year)
+        return self.filter_movies(self.decoder.decode(body), search_term)
+
+    def fetch_and_scan(
+        self,
+        page: int,
+        year: int,
+        scan: Callable[[List[str]], Any],
+        prefilter: BytePrefilter | None = None,
+    ) -> Any:
+        """
+        Fetch movies for given year and page and apply the scan function to them.
+        The page is released as soon as it has been scanned
+        :param page: page number to fetch
+        :param year: year to fetch movies
+        :param scan: function applied to the movies of the page
+        :param prefilter: if given, a page whose raw body matches none of the terms is
+        scanned as an empty page without being decoded
+        :return: result of the scan
+        """
+        body = self.__page_content(page, year)
+        with traced(self.tracer, "decode", "decode", page=page) as span:
+            if prefilter is not None and not prefilter.may_match(body):
+                span["skipped"] = True
+                movies = []
+            else:
+                movies = self.decoder.decode(body)
+        return self.__scan(scan, movies, page)
+
+    def __page_content(
+        self, page: int, year: int, phase: str = constant.PHASE_FETCH
+    ) -> bytes:
+        """
+        Fetch a page and return its raw body
+        :raises MovieFetcherException: if the page was not fetched, such as a 403 or a 404
+        answer or a 401 still failing after authenticating again, so that the error body
+        is never read as a page of titles
+        """
+        response = self.fetch(page, year, phase)
+        if response.status_code != 200:
+            raise MovieFetcherException(
+                f"page {page} of year {year} failed with status {response.status_code}"
+            )
+        return response.content
+
+    @staticmethod
+    def filter_movies(movies: List[str], search_term: str) -> List[str]:
+        """
+        Filter movies based on the search term
+        :param movies: movie titles of a page
+        :param search_term: lower-cased term to filter movies(case-insensitive)
+        :return: List of filtered movies
+        """
+        return [movie for movie in movies if search_term in movie.lower()]
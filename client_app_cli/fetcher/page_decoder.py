@@ -0,0 +1,83 @@
+import json
+from typing import Any, Callable, Dict, List
+
+from client_app_cli.constants import constant
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speed-up
+    orjson = None  # type: ignore[assignment]
+
+PARSERS: Dict[str, Callable[[bytes], Any]] = {constant.JSON_PARSER_STDLIB: json.loads}
+if orjson is not None:
+    PARSERS[constant.JSON_PARSER_ORJSON] = orjson.loads
+
+# non-ASCII characters whose lower case contains an ASCII letter: İ -> "i̇" and K (Kelvin) -> "k"
+ASCII_LOWERING = (b"\xc4\xb0", b"\xe2\x84\xaa")
+# characters that JSON may escape, besides the control characters
+ESCAPABLE = frozenset('"\\/')
+
+
+class PageDecoder:
+    """
+    Decodes raw page bodies with the fastest JSON parser installed, orjson when available,
+    the standard library otherwise
+    """
+
+    def __init__(self, parser: str = constant.JSON_PARSER_AUTO) -> None:
+        """
+        :param parser: json, orjson, or auto for the fastest one installed
+        :raises ValueError: if the parser is unknown or not installed
+        """
+        if parser == constant.JSON_PARSER_AUTO:
+            parser = (
+                constant.JSON_PARSER_ORJSON
+                if constant.JSON_PARSER_ORJSON in PARSERS
+                else constant.JSON_PARSER_STDLIB
+            )
+        if parser not in PARSERS:
+            raise ValueError(f"JSON parser {parser} is not installed")
+        self.parser = parser
+        self.decode: Callable[[bytes], Any] = PARSERS[parser]
+
+
+class BytePrefilter:
+    """
+    Tells from the raw bytes of a page whether any of its titles may contain a search term,
+    so that pages without a match are never decoded. Only answers "no" when it is certain:
+    for plain ASCII terms, on bodies without \\u escapes nor characters lowering to ASCII.
+    Titles are matched case-insensitively, like str.lower, by lower-casing the ASCII bytes
+    """
+
+    def __init__(self, terms: List[str], regex: bool = False) -> None:
+        """
+        :param terms: search terms of the page scan
+        :param regex: whether the terms are regex patterns, which are never prefiltered
+        """
+        lowered = [term.lower() for term in terms]
+        # an empty term matches every title
+        self.enabled = (
+            not regex
+            and bool(lowered)
+            and all(
+                term
+                and term.isascii()
+                and term.isprintable()
+                and not ESCAPABLE.intersection(term)
+                for term in lowered
+            )
+        )
+        self.terms = [term.encode() for term in lowered] if self.enabled else []
+        self.folds_to_ascii = any("i" in term or "k" in term for term in lowered)
+
+    def may_match(self, body: bytes) -> bool:
+        """
+        Check whether a page body may hold a title matching one of the terms
+        :return: False only if no title of the page matches any term
+        """
+        if not self.enabled or b"\\u" in body:
+            return True
+        if self.folds_to_ascii and any(chars in body for chars in ASCII_LOWERING):
+            return True
+        lowered = body.lower()
+        return any(term in lowered for term in self.terms)
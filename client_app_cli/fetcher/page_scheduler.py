@@ -0,0 +1,91 @@
+import concurrent.futures
+from typing import Any, Callable, Dict, Iterable, Iterator, Tuple, TypeVar
+
+from client_app_cli.constants import constant
+
+K = TypeVar("K")
+
+
+class PageScheduler:
+    """
+    Global work scheduler for a fetch run.
+    Keeps one pool of worker threads for the whole run and feeds it tasks lazily
+    so that at most `window` tasks are in flight, no matter how many pages exist
+    """
+
+    def __init__(
+        self,
+        max_workers: int = constant.MAX_WORKERS,
+        window: int = 0,
+        limiter: Any = None,
+    ):
+        """
+        Initialize the scheduler and start its workers
+        :param max_workers: number of worker threads reused for the whole run
+        :param window: maximum number of submitted but unfinished tasks, defaults to a few per worker
+        :param limiter: optional object whose `limit` attribute caps the tasks in flight,
+        read again every time a task completes
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be a positive integer")
+        self.max_workers = max_workers
+        self.window = max(window or max_workers * constant.WINDOW_PER_WORKER, 1)
+        self.limiter = limiter
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+
+    def __enter__(self) -> "PageScheduler":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.shutdown()
+
+    def shutdown(self) -> None:
+        """
+        Stop the workers, cancelling the tasks that have not started
+        """
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    @staticmethod
+    def longest_first(page_counts: Dict[int, int]) -> Iterator[Tuple[int, int]]:
+        """
+        Order the (year, page) tasks of all years so that the years with the most pages go first
+        :param page_counts: estimated number of pages for each year
+        :return: iterator of (year, page) tuples
+        """
+        for year in sorted(page_counts, key=lambda y: (-page_counts[y], y)):
+            for page in range(1, page_counts[year] + 1):
+                yield year, page
+
+    def run(
+        self, tasks: Iterable[Tuple[K, Callable[[], Any]]]
+    ) -> Iterator[Tuple[K, concurrent.futures.Future]]:
+        """
+        Run the tasks on the workers, keeping at most `window` of them in flight.
+        Tasks are pulled from the iterable only when there is room in the window
+        :param tasks: iterable of (key, callable) pairs
+        :return: iterator of (key, future) pairs in completion order
+        """
+        task_iter = iter(tasks)
+        in_flight: Dict[concurrent.futures.Future, K] = {}
+        exhausted = False
+
+        while True:
+            window = self.window
+            if self.limiter is not None:
+                window = max(min(self.limiter.limit, window), 1)
+            while not exhausted and len(in_flight) < window:
+                try:
+                    key, task = next(task_iter)
+                except StopIteration:
+                    exhausted = True
+                    break
+                in_flight[self.executor.submit(task)] = key
+
+            if not in_flight:
+                return
+
+            done, _ = concurrent.futures.wait(
+                in_flight, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                yield in_flight.pop(future), future
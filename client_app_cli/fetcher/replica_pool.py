@@ -0,0 +1,105 @@
+import random
+import threading
+import time
+from typing import List
+
+from client_app_cli.auth.authenticator import Authenticator
+from client_app_cli.constants import constant
+from client_app_cli.exceptions.exceptions import MovieFetcherException
+
+
+class Replica:
+    """
+    One movie-server replica with its own authenticator, so that every replica
+    gets a token it issued itself
+    """
+
+    def __init__(self, authenticator: Authenticator) -> None:
+        self.authenticator = authenticator
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+
+    @property
+    def base_url(self) -> str:
+        return self.authenticator.base_url
+
+
+class ReplicaPool:
+    """
+    Spreads the page requests over the replicas of the movie-server, choosing the one with
+    the fewest requests in flight among two picked at random (p2c) or among all (least).
+    A replica failing several requests in a row is ejected for a while, unless every
+    replica is ejected
+    """
+
+    def __init__(
+        self,
+        authenticators: List[Authenticator],
+        policy: str = constant.BALANCE_P2C,
+        eject_after: int = constant.EJECT_AFTER,
+        eject_seconds: float = constant.EJECT_SECONDS,
+    ) -> None:
+        """
+        Initialize the pool of replicas
+        :param authenticators: one authenticator per replica, the first one's base URL keys the caches
+        :param policy: replica selection policy, p2c or least
+        :param eject_after: consecutive failed requests after which a replica is ejected
+        :param eject_seconds: seconds an ejected replica gets no request
+        """
+        if not authenticators:
+            raise MovieFetcherException("at least one replica is required")
+        if policy not in constant.BALANCE_POLICIES:
+            raise MovieFetcherException(f"unknown balance policy {policy}")
+        if eject_after < 1:
+            raise MovieFetcherException("eject_after must be a positive integer")
+        self.replicas = [Replica(authenticator) for authenticator in authenticators]
+        self.policy = policy
+        self.eject_after = eject_after
+        self.eject_seconds = eject_seconds
+        self._random = random.Random()
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        """
+        Base URL the pages are cached under, the replicas serve the same movies
+        """
+        return self.replicas[0].base_url
+
+    def acquire(self) -> Replica:
+        """
+        Choose the replica of a new request and count the request as in flight
+        """
+        with self._lock:
+            now = time.monotonic()
+            candidates = [
+                replica for replica in self.replicas if replica.ejected_until <= now
+            ] or self.replicas
+            if self.policy == constant.BALANCE_P2C and len(candidates) > 2:
+                candidates = self._random.sample(candidates, 2)
+            # fewer requests sent breaks the ties, so idle replicas take turns
+            replica = min(
+                candidates, key=lambda replica: (replica.outstanding, replica.requests)
+            )
+            replica.outstanding += 1
+            replica.requests += 1
+            return replica
+
+    def release(self, replica: Replica, failed: bool) -> None:
+        """
+        Count a request of the replica as answered
+        :param failed: whether it failed with a connection error or a retryable status
+        """
+        with self._lock:
+            replica.outstanding -= 1
+            if not failed:
+                replica.failures = 0
+                return
+            replica.failures += 1
+            if replica.failures >= self.eject_after and len(self.replicas) > 1:
+                replica.failures = 0
+                replica.ejections += 1
+                replica.ejected_until = time.monotonic() + self.eject_seconds
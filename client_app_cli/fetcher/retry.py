@@ -0,0 +1,71 @@
+import random
+import threading
+
+from client_app_cli.constants import constant
+
+
+class RetryPolicy:
+    """
+    Retries the page requests that failed with 429/5xx or without an answer,
+    waiting a jittered exponential backoff between the attempts
+    """
+
+    def __init__(
+        self,
+        max_retries: int = constant.MAX_RETRIES,
+        base_delay: float = constant.RETRY_BASE_DELAY,
+        max_delay: float = constant.RETRY_MAX_DELAY,
+    ) -> None:
+        """
+        Initialize the retry policy
+        :param max_retries: number of retries after the first attempt
+        :param base_delay: backoff ceiling of the first retry in seconds
+        :param max_delay: highest backoff ceiling in seconds
+        """
+        if max_retries < 0:
+            raise ValueError("max_retries must not be negative")
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    @staticmethod
+    def is_retryable(status_code: int | None) -> bool:
+        """
+        Check if a request outcome is worth retrying. A missing page (404) is not
+        :param status_code: HTTP status code, or None if the request failed without an answer
+        """
+        return status_code is None or status_code in constant.RETRY_STATUSES
+
+    def delay(self, attempt: int) -> float:
+        """
+        Full-jitter exponential backoff before the given retry
+        :param attempt: number of attempts already made, starting at 1
+        :return: seconds to wait
+        """
+        ceiling = min(self.base_delay * 2 ** (attempt - 1), self.max_delay)
+        return random.uniform(0, ceiling)
+
+
+class RetryStats:
+    """
+    Thread-safe counters of the retried and given up page requests
+    """
+
+    def __init__(self) -> None:
+        self.pages_retried = 0
+        self.retries = 0
+        self.pages_given_up = 0
+        self._lock = threading.Lock()
+
+    def record(self, retries: int, given_up: bool) -> None:
+        """
+        Record the outcome of one page request
+        :param retries: number of retries the request needed
+        :param given_up: whether the request still failed after the last retry
+        """
+        with self._lock:
+            if retries:
+                self.pages_retried += 1
+                self.retries += retries
+            if given_up:
+                self.pages_given_up += 1
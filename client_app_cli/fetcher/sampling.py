@@ -0,0 +1,170 @@
+import math
+import random
+import statistics
+from typing import Any, Dict, Iterator, List, Tuple
+
+from client_app_cli.constants import constant
+
+
+class YearSample:
+    """
+    Match counts of the pages of a year read so far, for every search term.
+    Pages read by the discovery are counted exactly, the other pages form the sampled
+    population, whose total is estimated from a uniform sample without replacement
+    """
+
+    def __init__(self, pages: int, known_pages: List[int]) -> None:
+        """
+        :param pages: number of pages of the year
+        :param known_pages: pages read by the discovery
+        """
+        self.pages = pages
+        self.known_pages = set(known_pages)
+        # pages left to the sample
+        self.population = pages - len(self.known_pages)
+        self.sampled = 0
+        self.known: List[int] = []
+        self.sums: List[int] = []
+        self.squares: List[int] = []
+
+    def add(self, page: int, counts: List[int]) -> None:
+        """
+        Add the match counts of a page, one per term
+        """
+        if not self.sums:
+            self.known = [0] * len(counts)
+            self.sums = [0] * len(counts)
+            self.squares = [0] * len(counts)
+        if page in self.known_pages:
+            for i, count in enumerate(counts):
+                self.known[i] += count
+            return
+        self.sampled += 1
+        for i, count in enumerate(counts):
+            self.sums[i] += count
+            self.squares[i] += count * count
+
+    def estimate(self, term: int, z: float) -> Tuple[float, float, float]:
+        """
+        Estimate the number of movies of the year matching a term
+        :param term: index of the term
+        :param z: standard normal quantile of the confidence level
+        :return: estimate and bounds of its confidence interval
+        """
+        if not self.sums:
+            return 0.0, 0.0, 0.0
+        read = self.known[term] + self.sums[term]
+        if self.sampled >= self.population:
+            return float(read), float(read), float(read)
+        if not self.sampled:
+            # nothing sampled yet, only the page size bounds the unread pages
+            return float(read), float(read), float(read + 10 * self.population)
+        n, size = self.sampled, self.population
+        mean = self.sums[term] / n
+        variance = (
+            max(self.squares[term] - n * mean * mean, 0.0) / (n - 1) if n > 1 else 0.0
+        )
+        # finite population correction, the sample is drawn without replacement
+        half = z * size * math.sqrt((1 - n / size) * variance / n)
+        estimate = self.known[term] + size * mean
+        # the pages read are a floor, pages of 10 movies a ceiling
+        return (
+            estimate,
+            max(estimate - half, float(read)),
+            min(estimate + half, float(read + 10 * (size - n))),
+        )
+
+
+class PageSampler:
+    """
+    Orders the pages of every year as a uniform random sample, stopping a year once the
+    estimates of all the terms are within the target relative error at the confidence
+    level, or once a fixed fraction of its pages is read
+    """
+
+    def __init__(
+        self,
+        max_error: float = constant.APPROX_ERROR,
+        fraction: float | None = None,
+        confidence: float = constant.APPROX_CONFIDENCE,
+        min_pages: int = constant.APPROX_MIN_PAGES,
+        seed: int | None = None,
+    ) -> None:
+        """
+        :param max_error: target half width of the confidence interval relative to the estimate
+        :param fraction: if given, read this fraction of the pages of every year instead
+        :param confidence: confidence level of the interval, in (0, 1)
+        :param min_pages: pages sampled before a year may stop, the normal interval needs them
+        :param seed: seed of the sample, random if not given
+        """
+        if max_error <= 0:
+            raise ValueError("max_error must be positive")
+        if fraction is not None and not 0 < fraction <= 1:
+            raise ValueError("fraction must be in (0, 1]")
+        if not 0 < confidence < 1:
+            raise ValueError("confidence must be in (0, 1)")
+        self.max_error = max_error
+        self.fraction = fraction
+        self.confidence = confidence
+        self.min_pages = min_pages
+        self.z = statistics.NormalDist().inv_cdf((1 + confidence) / 2)
+        self.samples: Dict[int, YearSample] = {}
+        self._random = random.Random(seed)
+
+    def order(
+        self, page_counts: Dict[int, int], probed_pages: Dict[int, Dict[int, Any]]
+    ) -> Iterator[Tuple[int, int]]:
+        """
+        Order the (year, page) tasks: the pages read by the discovery first, then random
+        pages of every year in turn until the year is done. Pulled lazily by the scheduler,
+        so a year stops as soon as the pages read so far are enough
+        :param page_counts: number of pages of every year
+        :param probed_pages: movies of the pages read by the discovery, by year and page
+        :return: iterator of (year, page) tuples
+        """
+        remaining: Dict[int, List[int]] = {}
+        issued: Dict[int, int] = {}
+        for year, pages in page_counts.items():
+            known = list(probed_pages.get(year, {}))
+            self.samples[year] = YearSample(pages, known)
+            for page in known:
+                yield year, page
+            unknown = [page for page in range(1, pages + 1) if page not in known]
+            self._random.shuffle(unknown)
+            remaining[year] = unknown
+            issued[year] = 0
+        while remaining:
+            for year in list(remaining):
+                if not remaining[year] or self.__done(year, issued[year]):
+                    del remaining[year]
+                    continue
+                issued[year] += 1
+                yield year, remaining[year].pop()
+
+    def add(self, year: int, page: int, counts: List[int]) -> None:
+        """
+        Add the match counts of a page read, one per term
+        """
+        self.samples[year].add(page, counts)
+
+    def estimate(self, year: int, term: int) -> Tuple[float, float, float]:
+        """
+        :return: estimate of the matches of a term in a year and its confidence interval
+        """
+        return self.samples[year].estimate(term, self.z)
+
+    def __done(self, year: int, issued: int) -> bool:
+        """
+        Whether a year has enough pages, counting the requested ones for a fixed fraction
+        and the read ones for a target error
+        """
+        sample = self.samples[year]
+        if self.fraction is not None:
+            return issued >= math.ceil(self.fraction * sample.population)
+        if sample.sampled < min(self.min_pages, sample.population) or not sample.sums:
+            return False
+        for term in range(len(sample.sums)):
+            estimate, low, high = sample.estimate(term, self.z)
+            if high - low > 2 * self.max_error * estimate:
+                return False
+        return True
@@ -0,0 +1,253 @@
+import bisect
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+from client_app_cli.constants import constant
+
+
+class LatencyHistogram:
+    """
+    Histogram of request latencies with logarithmic buckets, from 1 ms growing by 25%
+    per bucket up to about 70 s, so percentiles are estimated within 25% of the true value
+    """
+
+    BOUNDS: Tuple[float, ...] = tuple(0.001 * 1.25**i for i in range(51))
+
+    def __init__(self) -> None:
+        # the last bucket holds the latencies above the highest bound
+        self.buckets = [0] * (len(self.BOUNDS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, latency: float) -> None:
+        """
+        Add a latency in seconds
+        """
+        self.buckets[bisect.bisect_left(self.BOUNDS, latency)] += 1
+        self.count += 1
+        self.sum += latency
+        self.max = max(self.max, latency)
+
+    def percentile(self, q: float) -> float:
+        """
+        Estimate a percentile by interpolating within its bucket
+        :param q: percentile between 0 and 1
+        :return: latency in seconds, 0 if nothing was observed
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            if bucket and seen + bucket >= rank:
+                lower = self.BOUNDS[index - 1] if index else 0.0
+                upper = self.BOUNDS[index] if index < len(self.BOUNDS) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / bucket, self.max)
+            seen += bucket
+        return self.max
+
+
+class Metrics:
+    """
+    Thread-safe counters of the requests sent by phase (auth, probe, fetch) and status,
+    their latency histograms, downloaded bytes, retries, page cache hits and the
+    connections opened and reused
+    """
+
+    def __init__(self) -> None:
+        self.requests: Counter[Tuple[str, str]] = Counter()
+        self.bytes: Counter[str] = Counter()
+        self.retries: Counter[str] = Counter()
+        self.latencies: Dict[str, LatencyHistogram] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.connections_opened = 0
+        self.connections_reused = 0
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record_request(
+        self, phase: str, status_code: int | None, latency: float, size: int = 0
+    ) -> None:
+        """
+        Record one request sent to the server
+        :param phase: one of auth, probe or fetch
+        :param status_code: HTTP status code, or None if the request failed without an answer
+        :param latency: seconds the request took
+        :param size: bytes of the response body
+        """
+        status = "error" if status_code is None else str(status_code)
+        with self._lock:
+            self.requests[(phase, status)] += 1
+            self.bytes[phase] += size
+            if phase not in self.latencies:
+                self.latencies[phase] = LatencyHistogram()
+            self.latencies[phase].observe(latency)
+
+    def record_retry(self, phase: str) -> None:
+        """
+        Record a request about to be retried
+        """
+        with self._lock:
+            self.retries[phase] += 1
+
+    def record_cache(self, hit: bool) -> None:
+        """
+        Record a page cache lookup
+        """
+        with self._lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+
+    def record_connections(self, opened: int, reused: int) -> None:
+        """
+        Record the connections of the transport so far, read from its pools
+        :param opened: connections opened to the server
+        :param reused: requests sent over a kept-alive connection
+        """
+        with self._lock:
+            self.connections_opened = opened
+            self.connections_reused = reused
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Current values of the metrics as a JSON serializable dictionary
+        """
+        with self._lock:
+            phases = sorted(
+                {phase for phase, _ in self.requests} | set(self.retries.keys())
+            )
+            return {
+                "elapsed_seconds": round(time.monotonic() - self._started, 6),
+                "auth_calls": sum(
+                    count
+                    for (phase, _), count in self.requests.items()
+                    if phase == constant.PHASE_AUTH
+                ),
+                "cache": {"hits": self.cache_hits, "misses": self.cache_misses},
+                "connections": {
+                    "opened": self.connections_opened,
+                    "reused": self.connections_reused,
+                },
+                "phases": {
+                    phase: {
+                        "requests": {
+                            status: count
+                            for (p, status), count in sorted(self.requests.items())
+                            if p == phase
+                        },
+                        "bytes": self.bytes[phase],
+                        "retries": self.retries[phase],
+                        "latency_seconds": self.__latency_summary(phase),
+                    }
+                    for phase in phases
+                },
+            }
+
+    def to_json(self) -> str:
+        """
+        Metrics as a JSON document
+        """
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """
+        Metrics in the Prometheus text exposition format, for the node exporter textfile collector
+        """
+        prefix = "movie_client"
+        lines: List[str] = []
+        with self._lock:
+            lines += [
+                f"# HELP {prefix}_requests_total Requests sent to the server.",
+                f"# TYPE {prefix}_requests_total counter",
+            ]
+            for (phase, status), count in sorted(self.requests.items()):
+                lines.append(
+                    f'{prefix}_requests_total{{phase="{phase}",status="{status}"}} {count}'
+                )
+            lines += [
+                f"# HELP {prefix}_response_bytes_total Bytes of the response bodies.",
+                f"# TYPE {prefix}_response_bytes_total counter",
+            ]
+            for phase, size in sorted(self.bytes.items()):
+                lines.append(f'{prefix}_response_bytes_total{{phase="{phase}"}} {size}')
+            lines += [
+                f"# HELP {prefix}_retries_total Requests retried after a failure.",
+                f"# TYPE {prefix}_retries_total counter",
+            ]
+            for phase, count in sorted(self.retries.items()):
+                lines.append(f'{prefix}_retries_total{{phase="{phase}"}} {count}')
+            lines += [
+                f"# HELP {prefix}_cache_lookups_total Page cache lookups.",
+                f"# TYPE {prefix}_cache_lookups_total counter",
+                f'{prefix}_cache_lookups_total{{result="hit"}} {self.cache_hits}',
+                f'{prefix}_cache_lookups_total{{result="miss"}} {self.cache_misses}',
+                f"# HELP {prefix}_connections_total Connections opened and reused.",
+                f"# TYPE {prefix}_connections_total counter",
+                f'{prefix}_connections_total{{state="opened"}} {self.connections_opened}',
+                f'{prefix}_connections_total{{state="reused"}} {self.connections_reused}',
+                f"# HELP {prefix}_request_duration_seconds Latency of the requests.",
+                f"# TYPE {prefix}_request_duration_seconds histogram",
+            ]
+            for phase, histogram in sorted(self.latencies.items()):
+                labels = f'phase="{phase}"'
+                cumulative = 0
+                for bound, bucket in zip(histogram.BOUNDS, histogram.buckets):
+                    cumulative += bucket
+                    lines.append(
+                        f"{prefix}_request_duration_seconds_bucket"
+                        f'{{{labels},le="{bound:.6g}"}} {cumulative}'
+                    )
+                lines += [
+                    f"{prefix}_request_duration_seconds_bucket"
+                    f'{{{labels},le="+Inf"}} {histogram.count}',
+                    f"{prefix}_request_duration_seconds_sum{{{labels}}} {histogram.sum:.6f}",
+                    f"{prefix}_request_duration_seconds_count{{{labels}}} {histogram.count}",
+                ]
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str, fmt: str = constant.METRICS_JSON) -> None:
+        """
+        Write the metrics to a file atomically, so that a scraper never reads a partial dump
+        :param path: path of the file to write
+        :param fmt: one of json or prometheus
+        """
+        content = (
+            self.to_prometheus()
+            if fmt == constant.METRICS_PROMETHEUS
+            else self.to_json()
+        )
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".metrics-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(content)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def __latency_summary(self, phase: str) -> Dict[str, float]:
+        """
+        Percentiles of the latencies of a phase, expects the lock to be held
+        """
+        histogram = self.latencies.get(phase)
+        if histogram is None:
+            return {}
+        return {
+            "count": histogram.count,
+            "mean": round(histogram.sum / histogram.count, 6),
+            "p50": round(histogram.percentile(0.50), 6),
+            "p95": round(histogram.percentile(0.95), 6),
+            "p99": round(histogram.percentile(0.99), 6),
+            "max": round(histogram.max, 6),
+        }
@@ -1,11 +1,45 @@
-from typing import Any
+import csv
+import json
+import sys
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, List, TextIO
 
 from client_app_cli.arguments.arguments import Arguments
+from client_app_cli.constants import constant
+from client_app_cli.results.year_result import YearResult
+
+if TYPE_CHECKING:
+    from client_app_cli.fetcher.hedging import HedgeStats
+    from client_app_cli.fetcher.replica_pool import ReplicaPool
+    from client_app_cli.fetcher.retry import RetryStats
 
 
 class PrettyPrinter:
     @staticmethod
-    def pretty_print(data: dict[Any, Any], args: Arguments):
+    def year_line(year: int, result: YearResult, titles: bool = True) -> str:
+        """
+        Describe the result of one year, with the number of its pages given up if any
+        and the confidence interval of an estimated count
+        :param titles: whether to list the matching titles after the count
+        """
+        if result.failed:
+            return f"Failed to fetch movies for year {year}."
+        partial = ""
+        if result.partial:
+            pages = result.pages_fetched + result.pages_failed
+            partial = f" ({result.pages_failed} of {pages} pages failed)"
+        if result.interval is not None:
+            low, high = result.interval
+            return (
+                f"Year {year} has about {result.count} movies{partial} "
+                f"(between {low} and {high}, estimated from {result.pages_fetched} pages)."
+            )
+        if titles and result.titles is not None:
+            return f"Year {year} has {result.count} movies{partial}: {result.titles}"
+        return f"Year {year} has {result.count} movies{partial}."
+
+    @staticmethod
+    def pretty_print(data: dict[int, YearResult], args: Arguments):
         if not data:
             print("No data to display.")
             return
@@ -13,17 +47,251 @@ class PrettyPrinter:
         print("\n========================================\n")
         print("Results for fetched movies:\n")
         pretty_response = "\n".join(
-            [
-                (
-                    f"Failed to fetch movies for year {key}."
-                    if data[key] is None
-                    else (
-                        f"Year {key} has {data[key][0]} movies."
-                        if args.count_only or not args.search_term
-                        else f"Year {key} has {data[key][0]} movies: {data[key][1]}"
-                    )
-                )
-                for key in data
-            ]
+            PrettyPrinter.year_line(
+                key, data[key], not args.count_only and bool(args.search_term)
+            )
+            for key in data
         )
         print(pretty_response)
+
+    @staticmethod
+    def pretty_print_terms(data: dict[str, dict[int, YearResult]], args: Arguments):
+        """
+        Print the results of every search term one after the other
+        :param data: results of MovieFetcher.search_movies
+        """
+        if not data:
+            print("No data to display.")
+            return
+
+        for term, term_data in data.items():
+            print("\n========================================\n")
+            print(f'Results for fetched movies matching "{term}":\n')
+            print(
+                "\n".join(
+                    PrettyPrinter.year_line(key, term_data[key], not args.count_only)
+                    for key in term_data
+                )
+            )
+
+    @staticmethod
+    def print_retry_report(stats: "RetryStats", stream: TextIO = sys.stderr):
+        """
+        Print how many pages needed retries and how many were given up
+        """
+        print(
+            f"Retried {stats.pages_retried} pages ({stats.retries} retries), "
+            f"gave up on {stats.pages_given_up} pages.",
+            file=stream,
+        )
+
+    @staticmethod
+    def print_hedge_report(stats: "HedgeStats", stream: TextIO = sys.stdout):
+        """
+        Print how many slow requests were duplicated and how many duplicates answered first
+        """
+        print(
+            f"Hedged {stats.hedges} slow requests ({stats.delayed} after waiting for the "
+            f"budget), {stats.wins} answered first by the duplicate, "
+            f"{stats.denied} answered before the budget allowed a duplicate.",
+            file=stream,
+        )
+
+    @staticmethod
+    def print_replica_report(replicas: "ReplicaPool", stream: TextIO = sys.stdout):
+        """
+        Print how the page requests were spread over the replicas
+        """
+        for replica in replicas.replicas:
+            print(
+                f"Replica {replica.base_url}: {replica.requests} requests, "
+                f"ejected {replica.ejections} times.",
+                file=stream,
+            )
+
+    @staticmethod
+    def print_stats(stats: dict[str, Any], stream: TextIO = sys.stdout):
+        """
+        Print the metrics of the run
+        :param stats: result of Metrics.snapshot
+        """
+        print("\n========================================\n", file=stream)
+        print(f"Run statistics ({stats['elapsed_seconds']:.2f} s):\n", file=stream)
+        for phase, phase_stats in stats["phases"].items():
+            requests = ", ".join(
+                f"{count} x {status}"
+                for status, count in phase_stats["requests"].items()
+            )
+            latency = phase_stats["latency_seconds"]
+            print(
+                f"{phase}: {sum(phase_stats['requests'].values())} requests ({requests}), "
+                f"{phase_stats['bytes']} bytes, {phase_stats['retries']} retries",
+                file=stream,
+            )
+            if latency:
+                print(
+                    f"  latency p50 {latency['p50'] * 1000:.1f} ms, "
+                    f"p95 {latency['p95'] * 1000:.1f} ms, "
+                    f"p99 {latency['p99'] * 1000:.1f} ms, "
+                    f"max {latency['max'] * 1000:.1f} ms",
+                    file=stream,
+                )
+        print(
+            f"page cache: {stats['cache']['hits']} hits, {stats['cache']['misses']} misses",
+            file=stream,
+        )
+        print(
+            f"connections: {stats['connections']['opened']} opened, "
+            f"{stats['connections']['reused']} reused",
+            file=stream,
+        )
+
+    @staticmethod
+    def print_batch_page(
+        query_id: Any,
+        year: int,
+        page: int,
+        matches: dict[str, Any],
+        stream: TextIO = sys.stdout,
+    ):
+        """
+        Print the matches of one page for one query of a batch as a JSON line
+        :param matches: titles, or number of matches for a count only query, of every matching term
+        """
+        record = {"id": query_id, "year": year, "page": page, "matches": matches}
+        stream.write(json.dumps(record) + "\n")
+
+    @staticmethod
+    def print_batch_results(
+        query_ids: List[Any],
+        results: List[dict[str, dict[int, YearResult]]],
+        titles: bool = True,
+        stream: TextIO = sys.stdout,
+    ):
+        """
+        Print the results of every query of a batch as one JSON line per query
+        :param results: results of MovieFetcher.search_batch
+        :param titles: whether to print the titles or only the counts, once they were streamed
+        """
+        for query_id, query_results in zip(query_ids, results):
+            encoded = {
+                term: {
+                    year: result.to_dict(titles)
+                    for year, result in term_results.items()
+                }
+                for term, term_results in query_results.items()
+            }
+            stream.write(json.dumps({"id": query_id, "results": encoded}) + "\n")
+
+    @staticmethod
+    def sink(output: str, args: Arguments, stream: TextIO = sys.stdout) -> "ResultSink":
+        """
+        Create the incremental output sink for the given format
+        :param output: one of text, ndjson or csv
+        :param stream: stream to write to
+        """
+        if output == constant.OUTPUT_NDJSON:
+            return NdjsonSink(args, stream)
+        if output == constant.OUTPUT_CSV:
+            return CsvSink(args, stream)
+        return TextSink(args, stream)
+
+
+class ResultSink(ABC):
+    """
+    Writes the matches of each page as soon as the page completes,
+    and the per-year summary once the run is over
+    """
+
+    def __init__(self, args: Arguments, stream: TextIO = sys.stdout):
+        self.args = args
+        self.stream = stream
+
+    @abstractmethod
+    def write(self, year: int, page: int, titles: List[str]) -> None:
+        """
+        Write the matches of one page
+        """
+
+    @abstractmethod
+    def close(self, summary: dict[int, YearResult]) -> None:
+        """
+        Write the per-year summary
+        :param summary: YearResult of each year, without titles
+        """
+
+
+class TextSink(ResultSink):
+    """
+    Human readable output: one line per matching title, then the count of each year
+    """
+
+    def write(self, year: int, page: int, titles: List[str]) -> None:
+        if self.args.count_only:
+            return
+        for title in titles:
+            print(f"{year}: {title}", file=self.stream)
+        self.stream.flush()
+
+    def close(self, summary: dict[int, YearResult]) -> None:
+        if not summary:
+            print("No data to display.", file=self.stream)
+            return
+        print("\n========================================\n", file=self.stream)
+        print("Results for fetched movies:\n", file=self.stream)
+        for year, result in summary.items():
+            print(PrettyPrinter.year_line(year, result), file=self.stream)
+        self.stream.flush()
+
+
+class NdjsonSink(ResultSink):
+    """
+    Newline-delimited JSON: one object per page with matches, then one object per year
+    """
+
+    def write(self, year: int, page: int, titles: List[str]) -> None:
+        if self.args.count_only or not titles:
+            return
+        record = {"year": year, "page": page, "titles": titles}
+        self.stream.write(json.dumps(record) + "\n")
+        self.stream.flush()
+
+    def close(self, summary: dict[int, YearResult]) -> None:
+        for year, result in summary.items():
+            record: dict[str, Any] = {"year": year}
+            if result.failed:
+                record["error"] = result.error
+            else:
+                record["count"] = result.count
+                if result.partial:
+                    record["pages_failed"] = result.pages_failed
+            self.stream.write(json.dumps(record) + "\n")
+        self.stream.flush()
+
+
+class CsvSink(ResultSink):
+    """
+    CSV output: one year,page,title row per match, or one year,count row per year with count only
+    """
+
+    def __init__(self, args: Arguments, stream: TextIO = sys.stdout):
+        super().__init__(args, stream)
+        self.writer = csv.writer(stream)
+        if args.count_only:
+            self.writer.writerow(["year", "count"])
+        else:
+            self.writer.writerow(["year", "page", "title"])
+
+    def write(self, year: int, page: int, titles: List[str]) -> None:
+        if self.args.count_only:
+            return
+        self.writer.writerows([year, page, title] for title in titles)
+        self.stream.flush()
+
+    def close(self, summary: dict[int, YearResult]) -> None:
+        for year, result in summary.items():
+            if result.failed or result.partial:
+                print(PrettyPrinter.year_line(year, result), file=sys.stderr)
+            if not result.failed and self.args.count_only:
+                self.writer.writerow([year, result.count])
+        self.stream.flush()
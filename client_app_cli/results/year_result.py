@@ -0,0 +1,183 @@
+from array import array
+from collections.abc import Sequence
+from typing import Any, Iterable, Iterator, List, Tuple, overload
+
+
+class TitleList(Sequence):
+    """
+    Read-only list of titles packed into one string with the end offset of every title,
+    instead of one Python string object per title. Titles are appended page by page,
+    each page is joined into one chunk and the chunks are packed on the first read
+    """
+
+    __slots__ = ("_buffer", "_chunks", "_ends")
+
+    def __init__(self, titles: Iterable[str] = ()) -> None:
+        self._buffer = ""
+        self._chunks: List[str] = []
+        self._ends = array("L")
+        self.extend(titles)
+
+    def extend(self, titles: Iterable[str]) -> None:
+        """
+        Append the titles of one page
+        """
+        end = self._ends[-1] if self._ends else 0
+        chunk = []
+        for title in titles:
+            end += len(title)
+            self._ends.append(end)
+            chunk.append(title)
+        if chunk:
+            self._chunks.append("".join(chunk))
+
+    def __pack(self) -> str:
+        """
+        Join the pending chunks into the buffer
+        """
+        if self._chunks:
+            self._buffer = "".join([self._buffer, *self._chunks])
+            self._chunks = []
+        return self._buffer
+
+    def __len__(self) -> int:
+        return len(self._ends)
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[str]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("title index out of range")
+        buffer = self.__pack()
+        start = self._ends[index - 1] if index else 0
+        return buffer[start : self._ends[index]]
+
+    def __iter__(self) -> Iterator[str]:
+        buffer = self.__pack()
+        start = 0
+        for end in self._ends:
+            yield buffer[start:end]
+            start = end
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (TitleList, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class YearResult:
+    """
+    Result of a search for one year: the number of matching movies, their titles unless only
+    counted, how many of the year's pages were read and failed, why the year failed if it did,
+    and the confidence interval of the count when it was estimated from a sample of the pages
+    """
+
+    __slots__ = (
+        "count",
+        "titles",
+        "pages_fetched",
+        "pages_failed",
+        "error",
+        "interval",
+    )
+
+    def __init__(
+        self,
+        count: int = 0,
+        titles: TitleList | None = None,
+        pages_fetched: int = 0,
+        pages_failed: int = 0,
+        error: str | None = None,
+        interval: Tuple[int, int] | None = None,
+    ) -> None:
+        """
+        :param count: number of matching movies
+        :param titles: matching titles, None when only counted
+        :param pages_fetched: pages of the year read successfully
+        :param pages_failed: pages of the year given up, their movies are missing from the result
+        :param error: why the whole year failed, None if it did not
+        :param interval: bounds of the confidence interval of an estimated count, None if exact
+        """
+        self.count = count
+        self.titles = titles
+        self.pages_fetched = pages_fetched
+        self.pages_failed = pages_failed
+        self.error = error
+        self.interval = interval
+
+    @property
+    def failed(self) -> bool:
+        """
+        Whether the whole year failed
+        """
+        return self.error is not None
+
+    @property
+    def approximate(self) -> bool:
+        """
+        Whether the count is an estimate
+        """
+        return self.interval is not None
+
+    @property
+    def partial(self) -> bool:
+        """
+        Whether some pages of the year are missing from the result
+        """
+        return self.pages_failed > 0
+
+    def to_dict(self, titles: bool = True) -> dict[str, Any]:
+        """
+        Convert the result to a JSON serializable dictionary
+        :param titles: whether to keep the titles, or only the counts
+        """
+        result = {
+            "count": self.count,
+            "titles": (
+                list(self.titles) if titles and self.titles is not None else None
+            ),
+            "pages_fetched": self.pages_fetched,
+            "pages_failed": self.pages_failed,
+            "error": self.error,
+        }
+        if self.interval is not None:
+            result["interval"] = list(self.interval)
+        return result
+
+    @classmethod
+    def from_dict(cls, result: dict[str, Any]) -> "YearResult":
+        """
+        Build a result from the output of to_dict
+        """
+        titles = result.get("titles")
+        interval = result.get("interval")
+        return cls(
+            result.get("count", 0),
+            None if titles is None else TitleList(titles),
+            result.get("pages_fetched", 0),
+            result.get("pages_failed", 0),
+            result.get("error"),
+            None if interval is None else (interval[0], interval[1]),
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, YearResult):
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"YearResult({fields})"
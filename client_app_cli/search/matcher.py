@@ -0,0 +1,122 @@
+import re
+from typing import Dict, List
+
+
+class Matcher:
+    """
+    Matches movie titles against many search terms or regex patterns in a single pass.
+    Literal terms are compiled into one regex alternation that the regex engine scans
+    once per title, the title being lower-cased only once
+    """
+
+    def __init__(self, terms: List[str], regex: bool = False):
+        """
+        Compile the search terms
+        :param terms: search terms, or regex patterns when regex is True
+        :param regex: whether the terms are regex patterns (matched case-insensitively)
+        """
+        if not terms:
+            raise ValueError("at least one search term is required")
+        # duplicated terms share the same index
+        self.terms = list(dict.fromkeys(terms))
+        self.regex = regex
+
+        if regex:
+            self.__patterns = self.compile_patterns(self.terms)
+            self.__any = self.__compile_any_pattern()
+            return
+
+        self.__terms_lower = [term.lower() for term in self.terms]
+        # an empty term matches every title
+        self.__empty = [i for i, term in enumerate(self.__terms_lower) if not term]
+        literals = sorted(
+            {term for term in self.__terms_lower if term}, key=len, reverse=True
+        )
+        alternation = "|".join(re.escape(term) for term in literals)
+        self.__any = re.compile(alternation) if literals else None
+        # the lookahead reports the longest term starting at every position of the title
+        self.__all = re.compile(f"(?=({alternation}))") if literals else None
+        # terms found at a position are completed with the shorter terms they contain
+        self.__contained: Dict[str, List[int]] = {
+            longer: [
+                i
+                for i, term in enumerate(self.__terms_lower)
+                if term and term in longer
+            ]
+            for longer in literals
+        }
+
+    @staticmethod
+    def compile_patterns(patterns: List[str]) -> List[re.Pattern]:
+        """
+        Compile regex patterns case-insensitively, used to validate them before any request
+        :raises ValueError: if a pattern is not a valid regex
+        """
+        compiled = []
+        for pattern in patterns:
+            try:
+                compiled.append(re.compile(pattern, re.IGNORECASE))
+            except re.error as e:
+                raise ValueError(f"invalid regex pattern {pattern!r}: {e}") from e
+        return compiled
+
+    def __compile_any_pattern(self) -> re.Pattern | None:
+        """
+        Combine the regex patterns into one alternation used to skip titles matching none of them.
+        Patterns with groups are not combined as their back references would be renumbered
+        """
+        if any(pattern.groups for pattern in self.__patterns):
+            return None
+        return re.compile("|".join(f"(?:{term})" for term in self.terms), re.IGNORECASE)
+
+    def matches(self, title: str) -> List[int]:
+        """
+        Find the terms matching a title
+        :return: sorted indices of the matching terms in self.terms
+        """
+        if self.regex:
+            if self.__any is not None and self.__any.search(title) is None:
+                return []
+            return [i for i, p in enumerate(self.__patterns) if p.search(title)]
+
+        if len(self.terms) == 1:
+            return [0] if self.__terms_lower[0] in title.lower() else []
+
+        lowered = title.lower()
+        if self.__any is None or self.__all is None:
+            return list(self.__empty)
+        if self.__any.search(lowered) is None:
+            return list(self.__empty)
+        found = set(self.__empty)
+        for match in self.__all.finditer(lowered):
+            found.update(self.__contained[match.group(1)])
+        return sorted(found)
+
+    def filter(self, movies: List[str]) -> List[List[str]]:
+        """
+        Filter the movies of a page for every term
+        :return: list of matching movies for each term, in the order of self.terms
+        """
+        matched: List[List[str]] = [[] for _ in self.terms]
+        for movie in movies:
+            for i in self.matches(movie):
+                matched[i].append(movie)
+        return matched
+
+    def count(self, movies: List[str]) -> List[int]:
+        """
+        Count the movies of a page matching every term without keeping them
+        :return: number of matching movies for each term, in the order of self.terms
+        """
+        counts = [0] * len(self.terms)
+        for movie in movies:
+            for i in self.matches(movie):
+                counts[i] += 1
+        return counts
+
+    def filter_any(self, movies: List[str]) -> List[str]:
+        """
+        Filter the movies of a page matching at least one term
+        :return: list of matching movies in page order
+        """
+        return [movie for movie in movies if self.matches(movie)]
@@ -0,0 +1,305 @@
+import os
+import sqlite3
+import sys
+import time
+from array import array
+from functools import partial
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Set, Tuple
+
+from client_app_cli.arguments.arguments import Arguments
+from client_app_cli.constants import constant
+from client_app_cli.exceptions.exceptions import MovieFetcherException
+from client_app_cli.fetcher.page_scheduler import PageScheduler
+from client_app_cli.results.year_result import TitleList, YearResult
+from client_app_cli.search.matcher import Matcher
+
+if TYPE_CHECKING:
+    from client_app_cli.fetcher.movie_fetcher import MovieFetcher
+
+
+class SnapshotStore:
+    """
+    Local snapshot of the movie titles of chosen years with a trigram inverted index
+    over the lower-cased titles, so that search terms are answered without the network.
+    Candidates found through the index are verified against the stored titles
+    """
+
+    def __init__(
+        self, path: str = os.path.join(constant.CACHE_DIR, constant.SNAPSHOT_FILE)
+    ) -> None:
+        """
+        Open or create the snapshot database
+        :param path: path of the snapshot database file
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, timeout=30)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS years ("
+                "year INTEGER PRIMARY KEY, movie_count INTEGER NOT NULL, "
+                "taken_at REAL NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS titles ("
+                "id INTEGER PRIMARY KEY, year INTEGER NOT NULL, title TEXT NOT NULL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS titles_year ON titles (year)"
+            )
+            # posting lists of title ids stored as packed unsigned integers
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS ngrams (ngram TEXT PRIMARY KEY, ids BLOB NOT NULL)"
+            )
+
+    def close(self) -> None:
+        """
+        Close the snapshot database
+        """
+        self._connection.close()
+
+    @staticmethod
+    def ngrams(text: str) -> Set[str]:
+        """
+        Split a lower-cased text into its distinct n-grams
+        """
+        size = constant.NGRAM_SIZE
+        return {text[i : i + size] for i in range(len(text) - size + 1)}
+
+    def years(self) -> Dict[int, int]:
+        """
+        Get the years stored in the snapshot
+        :return: dictionary mapping each year to its number of movies
+        """
+        return dict(self._connection.execute("SELECT year, movie_count FROM years"))
+
+    def save_year(self, year: int, titles: List[str]) -> None:
+        """
+        Replace the titles of a year. The index is rebuilt by build_index
+        """
+        with self._connection:
+            self._connection.execute("DELETE FROM titles WHERE year = ?", (year,))
+            self._connection.executemany(
+                "INSERT INTO titles (year, title) VALUES (?, ?)",
+                ((year, title) for title in titles),
+            )
+            self._connection.execute(
+                "INSERT OR REPLACE INTO years (year, movie_count, taken_at) VALUES (?, ?, ?)",
+                (year, len(titles), time.time()),
+            )
+
+    def build_index(self) -> None:
+        """
+        Rebuild the n-gram inverted index over every stored title
+        """
+        postings: Dict[str, array] = {}
+        for title_id, title in self._connection.execute(
+            "SELECT id, title FROM titles ORDER BY id"
+        ):
+            for ngram in self.ngrams(title.lower()):
+                if ngram not in postings:
+                    postings[ngram] = array("I")
+                postings[ngram].append(title_id)
+        with self._connection:
+            self._connection.execute("DELETE FROM ngrams")
+            self._connection.executemany(
+                "INSERT INTO ngrams (ngram, ids) VALUES (?, ?)",
+                ((ngram, ids.tobytes()) for ngram, ids in postings.items()),
+            )
+
+    def snapshot(self, fetcher: "MovieFetcher", years: Iterable[int]) -> Dict[int, Any]:
+        """
+        Download every title of the given years and store them with a fresh index.
+        A year is stored only if all its pages were downloaded
+        :param fetcher: fetcher used to discover and download the pages
+        :return: dictionary mapping each year to its number of stored movies, or None if it failed
+        """
+        result: Dict[int, Any] = {}
+        pages_by_year: Dict[int, Dict[int, List[str]]] = {}
+        with PageScheduler(fetcher.max_workers) as scheduler:
+            page_counts: Dict[int, int] = {}
+            probed_pages: Dict[int, Dict[int, Any]] = {}
+            discoveries = scheduler.run(
+                (year, partial(fetcher.discover_pages, year))
+                for year in sorted(set(years))
+            )
+            for year, future in discoveries:
+                try:
+                    page, probed_pages[year] = future.result()
+                    page_counts[year] = page - 1
+                    pages_by_year[year] = {}
+                except Exception as e:
+                    print(f"{e} for year {year}", file=sys.stderr)
+                    result[year] = None
+
+            page_tasks = scheduler.run(
+                (
+                    (year, page),
+                    (
+                        partial(probed_pages[year].pop, page)
+                        if page in probed_pages[year]
+                        else partial(self.__fetch_page, fetcher, page, year)
+                    ),
+                )
+                for year, page in PageScheduler.longest_first(page_counts)
+            )
+            for (year, page), future in page_tasks:
+                try:
+                    pages_by_year[year][page] = future.result()
+                except Exception as e:
+                    print(f"Error occurred while fetching: {e}", file=sys.stderr)
+                    result[year] = None
+
+        for year, pages in pages_by_year.items():
+            if year in result:
+                continue
+            titles = [title for page in sorted(pages) for title in pages[page]]
+            self.save_year(year, titles)
+            result[year] = len(titles)
+        self.build_index()
+        return dict(sorted(result.items()))
+
+    @staticmethod
+    def __fetch_page(fetcher: "MovieFetcher", page: int, year: int) -> List[str]:
+        """
+        Fetch the titles of a page, failing on any error response
+        """
+        response = fetcher.fetch(page, year)
+        if response.status_code != 200:
+            raise MovieFetcherException(
+                f"page {page} of year {year} failed with status {response.status_code}"
+            )
+        return fetcher.decoder.decode(response.content)
+
+    def search(self, args: Arguments) -> Dict[str, Dict[int, YearResult]]:
+        """
+        Answer a search from the snapshot, in the same shape as MovieFetcher.search_movies.
+        Years missing from the snapshot are reported as failed
+        :return: A dictionary mapping each search term to the YearResult of each year
+        """
+        stored = self.years()
+        years = sorted(set(args.years))
+        for year in years:
+            if year not in stored:
+                print(f"Year {year} is not in the snapshot", file=sys.stderr)
+
+        missing = "not in the snapshot"
+        if not args.regex and args.search_terms == [""]:
+            return {
+                "": {
+                    y: (
+                        YearResult(stored[y])
+                        if y in stored
+                        else YearResult(error=missing)
+                    )
+                    for y in years
+                }
+            }
+
+        matcher = Matcher(args.search_terms, args.regex)
+        results: Dict[str, Dict[int, YearResult]] = {}
+        for term in matcher.terms:
+            matches = self.__matching_titles(term, args.regex, years, stored)
+            results[term] = {}
+            for year in years:
+                if year not in stored:
+                    results[term][year] = YearResult(error=missing)
+                    continue
+                titles = matches.get(year, [])
+                results[term][year] = YearResult(
+                    len(titles), None if args.count_only else TitleList(titles)
+                )
+        return results
+
+    def __matching_titles(
+        self, term: str, regex: bool, years: List[int], stored: Dict[int, int]
+    ) -> Dict[int, List[str]]:
+        """
+        Find the titles of the given years matching one term
+        :return: dictionary mapping each year to its matching titles in page order
+        """
+        wanted = [year for year in years if year in stored]
+        term_lower = term.lower()
+        if regex or len(term_lower) < constant.NGRAM_SIZE:
+            # the index cannot narrow regex patterns and very short terms down
+            matcher = Matcher([term], regex)
+            rows = self.__titles_of_years(wanted)
+            return self.__group(
+                (row for row in rows if matcher.matches(row[2])), wanted
+            )
+
+        candidates = self.__candidates(term_lower)
+        rows = self.__titles_by_ids(candidates)
+        return self.__group(
+            (row for row in rows if term_lower in row[2].lower()), wanted
+        )
+
+    def __candidates(self, term_lower: str) -> List[int]:
+        """
+        Intersect the posting lists of the n-grams of a term
+        :return: sorted ids of the titles containing every n-gram of the term
+        """
+        ngrams = sorted(self.ngrams(term_lower))
+        placeholders = ",".join("?" * len(ngrams))
+        postings = [
+            array("I", ids)
+            for _, ids in self._connection.execute(
+                f"SELECT ngram, ids FROM ngrams WHERE ngram IN ({placeholders})",
+                ngrams,
+            )
+        ]
+        if len(postings) < len(ngrams):
+            return []
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for ids in postings[1:]:
+            candidates.intersection_update(ids)
+            if not candidates:
+                break
+        return sorted(candidates)
+
+    def __titles_by_ids(self, ids: List[int]) -> List[Tuple[int, int, str]]:
+        """
+        Load titles by id, in batches that fit in an SQL statement
+        """
+        rows: List[Tuple[int, int, str]] = []
+        for start in range(0, len(ids), 500):
+            batch = ids[start : start + 500]
+            placeholders = ",".join("?" * len(batch))
+            rows.extend(
+                self._connection.execute(
+                    f"SELECT id, year, title FROM titles WHERE id IN ({placeholders})",
+                    batch,
+                )
+            )
+        rows.sort()
+        return rows
+
+    def __titles_of_years(self, years: List[int]) -> List[Tuple[int, int, str]]:
+        """
+        Load every title of the given years
+        """
+        if not years:
+            return []
+        placeholders = ",".join("?" * len(years))
+        return list(
+            self._connection.execute(
+                f"SELECT id, year, title FROM titles WHERE year IN ({placeholders}) ORDER BY id",
+                years,
+            )
+        )
+
+    @staticmethod
+    def __group(
+        rows: Iterable[Tuple[int, int, str]], years: List[int]
+    ) -> Dict[int, List[str]]:
+        """
+        Group matching rows by year, keeping the requested years only
+        """
+        grouped: Dict[int, List[str]] = {year: [] for year in years}
+        for _, year, title in rows:
+            if year in grouped:
+                grouped[year].append(title)
+        return grouped
@@ -0,0 +1,37 @@
+import cProfile
+import os
+import pstats
+
+
+class Profiler:
+    """
+    cProfile of a section of the run, written as a pstats file.
+    A single profile is used: since Python 3.12 cProfile is built on sys.monitoring, which
+    sees every thread, such as the scheduler workers, and allows one active profile only.
+    Before 3.12 it only sees the calling thread
+    """
+
+    def __init__(self) -> None:
+        self.profile = cProfile.Profile()
+
+    def __enter__(self) -> "Profiler":
+        self.profile.enable()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.profile.disable()
+
+    def stats(self) -> pstats.Stats:
+        """
+        :return: statistics of the profiled section
+        """
+        return pstats.Stats(self.profile)
+
+    def dump(self, path: str) -> None:
+        """
+        Write the statistics as a pstats file, read with python -m pstats
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.stats().dump_stats(path)
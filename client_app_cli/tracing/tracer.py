@@ -0,0 +1,231 @@
+import contextlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Tuple
+
+from client_app_cli.constants import constant
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+
+class Span:
+    """
+    One timed section of the run, on the thread that ran it
+    """
+
+    __slots__ = ("name", "category", "start", "end", "thread", "args")
+
+    def __init__(
+        self,
+        name: str,
+        category: str,
+        start: float,
+        end: float,
+        thread: int,
+        args: Dict[str, Any],
+    ) -> None:
+        self.name = name
+        self.category = category
+        self.start = start
+        self.end = end
+        self.thread = thread
+        self.args = args
+
+
+class Tracer:
+    """
+    Thread-safe timeline of the spans of a run: years, discovery, page requests, token
+    requests, decoding, scanning and printing. Spans of one thread nest, spans spanning
+    several threads (a year) are kept apart as async spans.
+    Written as Chrome trace events (chrome://tracing, Perfetto) or as a speedscope profile
+    """
+
+    def __init__(self) -> None:
+        self.spans: List[Span] = []
+        self.async_spans: List[Span] = []
+        self.thread_names: Dict[int, str] = {}
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def now(self) -> float:
+        """
+        :return: seconds since the tracer was created
+        """
+        return time.perf_counter() - self._origin
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str, **args: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Time the body of the with statement on the current thread
+        :param args: details shown with the span
+        :return: the args of the span, which the body may complete, e.g. with a status
+        """
+        start = self.now()
+        try:
+            yield args
+        finally:
+            self.add(name, category, start, self.now(), **args)
+
+    def add(
+        self, name: str, category: str, start: float, end: float, **args: Any
+    ) -> None:
+        """
+        Record a span of the current thread timed by the caller, in seconds from now()
+        """
+        thread = threading.current_thread()
+        span = Span(name, category, start, end, thread.ident or 0, args)
+        with self._lock:
+            self.spans.append(span)
+            self.thread_names.setdefault(span.thread, thread.name)
+
+    def add_async(
+        self, name: str, category: str, start: float, end: float, **args: Any
+    ) -> None:
+        """
+        Record a span whose work runs on several threads, in seconds from now()
+        """
+        with self._lock:
+            self.async_spans.append(Span(name, category, start, end, 0, args))
+
+    def dump(self, path: str, trace_format: str = constant.TRACE_CHROME) -> None:
+        """
+        Write the spans to a file
+        :param trace_format: chrome for Chrome trace events, speedscope for a speedscope profile
+        """
+        if trace_format not in constant.TRACE_FORMATS:
+            raise ValueError(f"unknown trace format {trace_format}")
+        trace = (
+            self.chrome_trace()
+            if trace_format == constant.TRACE_CHROME
+            else self.speedscope_profile()
+        )
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(trace, f)
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """
+        :return: the spans as Chrome trace events, complete events for the thread spans
+        and begin/end pairs for the async spans, in microseconds
+        """
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self.spans)
+            async_spans = list(self.async_spans)
+            thread_names = dict(self.thread_names)
+        events: List[Dict[str, Any]] = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": pid,
+                "tid": thread,
+                "args": {"name": name},
+            }
+            for thread, name in thread_names.items()
+        ]
+        for span in spans:
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": span.category,
+                    "ph": "X",
+                    "ts": span.start * 1e6,
+                    "dur": (span.end - span.start) * 1e6,
+                    "pid": pid,
+                    "tid": span.thread,
+                    "args": span.args,
+                }
+            )
+        for index, span in enumerate(async_spans):
+            for phase, ts in (("b", span.start), ("e", span.end)):
+                events.append(
+                    {
+                        "name": span.name,
+                        "cat": span.category,
+                        "ph": phase,
+                        "ts": ts * 1e6,
+                        "pid": pid,
+                        "tid": 0,
+                        "id": index,
+                        "args": span.args if phase == "b" else {},
+                    }
+                )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def speedscope_profile(self) -> Dict[str, Any]:
+        """
+        :return: the spans as a speedscope file, one evented profile per thread
+        and one per async span, in microseconds
+        """
+        with self._lock:
+            spans = list(self.spans)
+            async_spans = list(self.async_spans)
+            thread_names = dict(self.thread_names)
+        frames: Dict[str, int] = {}
+        by_thread: Dict[int, List[Span]] = {}
+        for span in spans:
+            by_thread.setdefault(span.thread, []).append(span)
+        profiles = [
+            self.__evented_profile(thread_names[thread], thread_spans, frames)
+            for thread, thread_spans in by_thread.items()
+        ]
+        profiles += [
+            self.__evented_profile(span.name, [span], frames) for span in async_spans
+        ]
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "shared": {"frames": [{"name": name} for name in frames]},
+            "profiles": profiles,
+            "name": "movie-client trace",
+            "exporter": "movie-client",
+        }
+
+    @staticmethod
+    def __evented_profile(
+        name: str, spans: List[Span], frames: Dict[str, int]
+    ) -> Dict[str, Any]:
+        """
+        Build the open/close events of nested spans, outer spans first when they start together
+        :param frames: index of every frame name, completed with the names of the spans
+        """
+        events: List[Dict[str, Any]] = []
+        # (frame, end) of the spans still open, innermost last
+        stack: List[Tuple[int, float]] = []
+        for span in sorted(spans, key=lambda span: (span.start, -span.end)):
+            while stack and stack[-1][1] <= span.start:
+                frame, end = stack.pop()
+                events.append({"type": "C", "frame": frame, "at": end * 1e6})
+            frame = frames.setdefault(span.name, len(frames))
+            # clock rounding must not let a span outlive the one it runs in
+            end = min(span.end, stack[-1][1]) if stack else span.end
+            events.append({"type": "O", "frame": frame, "at": span.start * 1e6})
+            stack.append((frame, end))
+        while stack:
+            frame, end = stack.pop()
+            events.append({"type": "C", "frame": frame, "at": end * 1e6})
+        start = min((span.start for span in spans), default=0.0)
+        end = max((span.end for span in spans), default=0.0)
+        return {
+            "type": "evented",
+            "name": name,
+            "unit": "microseconds",
+            "startValue": start * 1e6,
+            "endValue": end * 1e6,
+            "events": events,
+        }
+
+
+def traced(
+    tracer: Tracer | None, name: str, category: str, **args: Any
+) -> contextlib.AbstractContextManager[Dict[str, Any]]:
+    """
+    Span of the tracer if tracing, otherwise a no-op context
+    :return: context manager yielding the args of the span
+    """
+    if tracer is None:
+        return contextlib.nullcontext(args)
+    return tracer.span(name, category, **args)
@@ -0,0 +1,101 @@
+from typing import Any
+
+import requests
+from requests import Response
+from requests.adapters import HTTPAdapter
+
+from client_app_cli.constants import constant
+
+
+class TransportStats:
+    """
+    Snapshot of the connection counters of an HttpTransport
+    """
+
+    def __init__(self, requests_sent: int, connections_opened: int):
+        self.requests_sent = requests_sent
+        self.connections_opened = connections_opened
+        # every request that did not open a new connection went over a kept-alive one
+        self.connections_reused = max(requests_sent - connections_opened, 0)
+
+
+class HttpTransport:
+    """
+    HTTP transport shared by the Authenticator and the MovieFetcher.
+    Holds a single pooled keep-alive session so that requests reuse TCP connections
+    instead of opening a new one for every page
+    """
+
+    def __init__(
+        self,
+        pool_size: int = constant.MAX_WORKERS,
+        max_hosts: int = constant.MAX_HOSTS,
+        connect_timeout: float = constant.CONNECT_TIMEOUT,
+        read_timeout: float = constant.READ_TIMEOUT,
+    ) -> None:
+        """
+        Initialize the transport with a pooled session.
+        :param pool_size: maximum number of connections kept per host, should match the fetch concurrency
+        :param max_hosts: number of per-host connection pools kept alive
+        :param connect_timeout: seconds to wait for a connection to the server
+        :param read_timeout: seconds to wait for the server between two bytes of the answer
+        """
+        if pool_size < 1:
+            raise ValueError("pool_size must be a positive integer")
+        if max_hosts < 1:
+            raise ValueError("max_hosts must be a positive integer")
+        if connect_timeout <= 0 or read_timeout <= 0:
+            raise ValueError("timeouts must be positive")
+
+        self.pool_size = pool_size
+        self.max_hosts = max_hosts
+        # a stalled server fails the request instead of blocking a worker forever
+        self.timeout = (connect_timeout, read_timeout)
+        # pool_block caps the connections per host to pool_size instead of opening throwaway ones
+        self.adapter = HTTPAdapter(
+            pool_connections=max_hosts, pool_maxsize=pool_size, pool_block=True
+        )
+        self.session = requests.Session()
+        self.session.headers.update({"Connection": "keep-alive"})
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+
+    def get(self, url: str, **kwargs: Any) -> Response:
+        """
+        Send a GET request over the pooled session, with the transport timeouts unless given
+        :param url: URL to request
+        :return: Response object
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.get(url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> Response:
+        """
+        Send a POST request over the pooled session, with the transport timeouts unless given
+        :param url: URL to request
+        :return: Response object
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.post(url, **kwargs)
+
+    def stats(self) -> TransportStats:
+        """
+        Collect the request and connection counters of every per-host pool
+        :return: TransportStats with connections opened and reused
+        """
+        pools = self.adapter.poolmanager.pools
+        requests_sent = 0
+        connections_opened = 0
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            requests_sent += pool.num_requests
+            connections_opened += pool.num_connections
+        return TransportStats(requests_sent, connections_opened)
+
+    def close(self) -> None:
+        """
+        Close the session and every pooled connection
+        """
+        self.session.close()
@@ -1,32 +1,415 @@
+import argparse
+import contextlib
 import os
+import signal
+import sys
+from typing import TYPE_CHECKING, Callable, TypeVar
 
+# only the light modules are imported up front, the network stack (requests, aiohttp),
+# the caches and the printers are imported by the path that needs them to keep the
+# startup fast
 from client_app_cli.arguments.argument_parser import ArgumentParser
 from client_app_cli.arguments.arguments import Arguments
-from client_app_cli.auth.authenticator import Authenticator
 from client_app_cli.constants.constant import (
     DEFAULT_USERNAME,
     DEFAULT_PASSWORD,
-    BASE_URL,
+    COMMAND_BATCH,
+    COMMAND_FETCH,
+    COMMAND_QUERY,
+    COMMAND_SERVE,
+    COMMAND_SNAPSHOT,
+    CACHE_DIR,
+    CACHE_FILE,
+    DISCOVERY_KARY,
+    MAX_HOSTS,
+    MAX_WORKERS,
+    MEMORY_CACHE,
+    OUTPUT_TEXT,
 )
-from client_app_cli.fetcher.movie_fetcher import MovieFetcher
-from client_app_cli.pretty_print.pretty_print import PrettyPrinter
 
-if __name__ == "__main__":
-    print("Starting movie-client...")
+if TYPE_CHECKING:
+    from client_app_cli.fetcher.movie_fetcher import MovieFetcher
+    from client_app_cli.results.year_result import YearResult
+
+T = TypeVar("T")
+
 
-    argument_parser = ArgumentParser()
-    args = Arguments(
-        argument_parser.parse().years,
-        argument_parser.parse().search,
-        argument_parser.parse().count_only,
+def run_offline(options: argparse.Namespace, args: Arguments) -> None:
+    """
+    Answer the search from the local snapshot without any request to the server
+    """
+    from client_app_cli.snapshot.snapshot_store import SnapshotStore
+
+    store = (
+        SnapshotStore(options.snapshot_file)
+        if options.snapshot_file
+        else SnapshotStore()
     )
+    results = store.search(args)
+    store.close()
+    print_results(results, args)
+
+
+def run_query(options: argparse.Namespace, args: Arguments) -> None:
+    """
+    Ask a serving daemon for the movies, without loading the network stack
+    """
+    from client_app_cli.daemon.query_client import QueryClient
+    from client_app_cli.exceptions.exceptions import DaemonException
+
+    try:
+        results = QueryClient(options.socket).query(args)
+    except DaemonException as e:
+        print(f"Query failed: {e}", file=sys.stderr)
+        sys.exit(1)
+    print_results(results, args)
+
+
+def print_results(results: dict[str, dict[int, "YearResult"]], args: Arguments) -> None:
+    """
+    Print search results the same way whether they were fetched, read offline or queried
+    """
+    from client_app_cli.pretty_print.pretty_print import PrettyPrinter
+
+    if len(results) > 1:
+        PrettyPrinter.pretty_print_terms(results, args)
+    else:
+        PrettyPrinter.pretty_print(results[args.search_term], args)
+
+
+def run_online(options: argparse.Namespace, args: Arguments) -> None:
+    """
+    Fetch the movies from the server and print them
+    """
+    from client_app_cli.auth.authenticator import Authenticator
+    from client_app_cli.cache.page_cache import PageCache
+    from client_app_cli.cache.page_hints import PageHints
+    from client_app_cli.cache.token_cache import TokenCache
+    from client_app_cli.fetcher.concurrency import AdaptiveConcurrencyController
+    from client_app_cli.fetcher.hedging import HedgePolicy
+    from client_app_cli.fetcher.movie_fetcher import MovieFetcher
+    from client_app_cli.fetcher.page_decoder import PageDecoder
+    from client_app_cli.fetcher.replica_pool import ReplicaPool
+    from client_app_cli.fetcher.retry import RetryPolicy
+    from client_app_cli.metrics.metrics import Metrics
+    from client_app_cli.pretty_print.pretty_print import PrettyPrinter
+    from client_app_cli.tracing.profiler import Profiler
+    from client_app_cli.tracing.tracer import Tracer
+    from client_app_cli.transport.http_transport import HttpTransport
 
     username = os.environ.get("MOVIE_API_USERNAME", DEFAULT_USERNAME)
     password = os.environ.get("MOVIE_API_PASSWORD", DEFAULT_PASSWORD)
-    base_url = os.environ.get("MOVIE_API_BASE_URL", BASE_URL)
 
-    auth = Authenticator(username, password, base_url)
-    fetcher = MovieFetcher(auth)
+    # one pooled transport shared by authentication and page fetching
+    pool_size = options.max_concurrency
+    if options.discovery == DISCOVERY_KARY:
+        pool_size *= options.probes_per_round
+    if options.hedge:
+        # a duplicated request must not wait for a connection held by the slow one
+        pool_size *= 2
+    transport = HttpTransport(
+        pool_size=pool_size,
+        max_hosts=max(MAX_HOSTS, len(options.base_url)),
+        connect_timeout=options.connect_timeout,
+        read_timeout=options.read_timeout,
+    )
+    token_cache = open_store("Token cache", TokenCache) if options.token_cache else None
+    metrics = Metrics()
+    tracer = Tracer() if options.trace else None
+    # one authenticator per replica, a token is only valid on the replica that issued it
+    authenticators = [
+        Authenticator(
+            username, password, base_url, transport, token_cache, metrics, tracer
+        )
+        for base_url in options.base_url
+    ]
+    auth = authenticators[0]
+    # renew the tokens ahead of their expiry so that page requests never wait for them
+    for authenticator in authenticators:
+        authenticator.start_background_refresh()
+
+    page_cache = None
+    if options.clear_cache or not options.no_cache:
+        # the daemon keeps its pages in memory for as long as it runs
+        cache_path = (
+            MEMORY_CACHE
+            if options.command == COMMAND_SERVE
+            else os.path.join(CACHE_DIR, CACHE_FILE)
+        )
+        page_cache = open_store(
+            "Page cache",
+            lambda: PageCache(
+                cache_path, ttl=options.cache_ttl, max_bytes=options.cache_max_bytes
+            ),
+        )
+        if page_cache is not None and options.clear_cache:
+            page_cache.clear()
+        if page_cache is not None and options.no_cache:
+            page_cache.close()
+            page_cache = None
+
+    # the page counts of the previous runs, checked with two probes per year
+    page_hints = (
+        None
+        if options.no_hints or options.use_async
+        else open_store("Page hints", PageHints)
+    )
+
+    decoder = PageDecoder(options.json_parser)
+
+    profiler = Profiler() if options.profile else None
+    fetcher = None
+    if options.use_async:
+        from client_app_cli.fetcher.async_movie_fetcher import AsyncMovieFetcher
+
+        async_fetcher = AsyncMovieFetcher(auth, options.max_in_flight, decoder)
+        with profiler or contextlib.nullcontext():
+            response = async_fetcher.fetch_movies(args)
+        PrettyPrinter.pretty_print(response, args)
+    else:
+        fetcher = MovieFetcher(
+            auth,
+            transport,
+            options.max_concurrency,
+            options.discovery,
+            options.probes_per_round,
+            page_cache,
+            controller=AdaptiveConcurrencyController(
+                initial=min(MAX_WORKERS, options.max_concurrency),
+                max_limit=options.max_concurrency,
+            ),
+            retry_policy=RetryPolicy(options.retries),
+            metrics=metrics,
+            page_hints=page_hints,
+            decoder=decoder,
+            hedge_policy=(
+                HedgePolicy(options.hedge_percentile, options.hedge_max_ratio)
+                if options.hedge
+                else None
+            ),
+            replicas=ReplicaPool(authenticators, options.balance),
+            tracer=tracer,
+        )
+        with profiler or contextlib.nullcontext():
+            run_command(options, args, fetcher)
+
+    report_stream = (
+        sys.stdout
+        if options.output == OUTPUT_TEXT and options.command != COMMAND_BATCH
+        else sys.stderr
+    )
+    if fetcher is not None:
+        if fetcher.retry_stats.retries or fetcher.retry_stats.pages_given_up:
+            # a warning about the results, kept out of their stream
+            PrettyPrinter.print_retry_report(fetcher.retry_stats, sys.stderr)
+        if fetcher.hedge_policy is not None:
+            PrettyPrinter.print_hedge_report(fetcher.hedge_stats, report_stream)
+        if len(fetcher.replicas.replicas) > 1:
+            PrettyPrinter.print_replica_report(fetcher.replicas, report_stream)
+        fetcher.close()
+
+    for authenticator in authenticators:
+        authenticator.stop_background_refresh()
+    transport_stats = transport.stats()
+    metrics.record_connections(
+        transport_stats.connections_opened, transport_stats.connections_reused
+    )
+    if options.stats:
+        PrettyPrinter.print_stats(metrics.snapshot(), report_stream)
+    if options.metrics_file:
+        metrics.dump(options.metrics_file, options.metrics_format)
+    if tracer is not None:
+        tracer.dump(options.trace, options.trace_format)
+        print(f"Trace written to {options.trace}.", file=report_stream)
+    if profiler is not None:
+        profiler.dump(options.profile)
+        print(f"Profile written to {options.profile}.", file=report_stream)
+
+    transport.close()
+    if token_cache is not None:
+        token_cache.close()
+    if page_cache is not None:
+        page_cache.close()
+    if page_hints is not None:
+        page_hints.close()
+
+
+def open_store(name: str, factory: Callable[[], T]) -> T | None:
+    """
+    Open one of the optional on-disk stores, which only make the run faster.
+    A store that cannot be opened, such as an unwritable cache directory, is skipped
+    with a warning instead of failing the run
+    :param name: name of the store in the warning
+    :param factory: opens the store
+    :return: the store, or None if it cannot be opened
+    """
+    import sqlite3
+
+    try:
+        return factory()
+    except (OSError, sqlite3.Error) as e:
+        print(f"{name} disabled: {e}", file=sys.stderr)
+        return None
+
+
+def run_command(
+    options: argparse.Namespace, args: Arguments, fetcher: "MovieFetcher"
+) -> None:
+    """
+    Run the requested command with the thread pool fetcher and print its results
+    """
+    from client_app_cli.pretty_print.pretty_print import PrettyPrinter
+    from client_app_cli.tracing.tracer import traced
+
+    if options.command == COMMAND_SERVE:
+        from client_app_cli.daemon.query_server import QueryServer
+        from client_app_cli.exceptions.exceptions import DaemonException
+
+        try:
+            server = QueryServer(fetcher, options.socket)
+        except DaemonException as e:
+            print(f"Serve failed: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"Serving queries on {options.socket}, stop with Ctrl-C.")
+        # stop on SIGTERM like on Ctrl-C, so that the run ends cleanly
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.close()
+    elif options.command == COMMAND_BATCH:
+        # streamed matches are printed as the pages complete, the results hold the counts
+        on_page = (
+            (
+                lambda query, year, page, matches: PrettyPrinter.print_batch_page(
+                    options.query_ids[query], year, page, matches
+                )
+            )
+            if options.stream
+            else None
+        )
+        results = fetcher.search_batch(options.queries, on_page)
+        with traced(fetcher.tracer, "print", "print"):
+            PrettyPrinter.print_batch_results(
+                options.query_ids, results, titles=not options.stream
+            )
+    elif options.command == COMMAND_SNAPSHOT:
+        from client_app_cli.snapshot.snapshot_store import SnapshotStore
+
+        store = (
+            SnapshotStore(options.snapshot_file)
+            if options.snapshot_file
+            else SnapshotStore()
+        )
+        for year, count in store.snapshot(fetcher, args.years).items():
+            if count is None:
+                print(f"Failed to snapshot movies for year {year}.")
+            else:
+                print(f"Year {year}: {count} movies saved to {store.path}.")
+        store.close()
+    elif options.stream:
+        sink = PrettyPrinter.sink(options.output, args)
+        summary: dict[int, "YearResult"] = {}
+        for year, page, titles in fetcher.iter_matches(args, summary):
+            with traced(fetcher.tracer, "print", "print", page=page):
+                sink.write(year, page, titles)
+        with traced(fetcher.tracer, "print", "print"):
+            sink.close(summary)
+    else:
+        if options.approx:
+            from client_app_cli.fetcher.sampling import PageSampler
 
-    response = fetcher.fetch_movies(args)
-    PrettyPrinter.pretty_print(response, args)
+            sampler = PageSampler(
+                options.approx_error, options.approx_fraction, options.approx_confidence
+            )
+            term_results = fetcher.estimate_movies(args, sampler)
+        else:
+            term_results = search_with_checkpoint(options, args, fetcher)
+        with traced(fetcher.tracer, "print", "print"):
+            if len(set(args.search_terms)) > 1:
+                PrettyPrinter.pretty_print_terms(term_results, args)
+            else:
+                PrettyPrinter.pretty_print(term_results[args.search_term], args)
+
+
+def search_with_checkpoint(
+    options: argparse.Namespace, args: Arguments, fetcher: "MovieFetcher"
+) -> dict[str, dict[int, "YearResult"]]:
+    """
+    Search the movies, recording the completed years and pages in the checkpoint of the
+    search unless disabled, and resuming from it with --resume
+    """
+    checkpoint = None
+    if options.command == COMMAND_FETCH and not options.no_checkpoint:
+        from client_app_cli.checkpoint.checkpoint import Checkpoint
+        from client_app_cli.exceptions.exceptions import CheckpointException
+
+        key = Checkpoint.key_for(args, fetcher.replicas.base_url)
+        try:
+            checkpoint = Checkpoint(
+                options.checkpoint or Checkpoint.default_path(key),
+                key,
+                options.resume,
+            )
+        except (CheckpointException, OSError) as e:
+            if options.resume:
+                print(f"Cannot resume: {e}", file=sys.stderr)
+                sys.exit(1)
+            # such as a concurrent run of the same search, which keeps its checkpoint
+            print(f"Checkpoint disabled: {e}", file=sys.stderr)
+    try:
+        term_results = fetcher.search_movies(args, checkpoint)
+    except BaseException:
+        if checkpoint is not None:
+            checkpoint.close()
+        raise
+    if checkpoint is not None:
+        results = [result for rs in term_results.values() for result in rs.values()]
+        # failed pages are fetched again by a resumed run, failed discoveries only save
+        # work when other pages were completed, a year without movies always fails
+        if checkpoint.error is not None:
+            checkpoint.close()
+        elif not any(result.partial for result in results) and not (
+            checkpoint.pages and any(result.failed for result in results)
+        ):
+            # removed before the lock is released
+            checkpoint.remove()
+        else:
+            checkpoint.close()
+            print(
+                f"Progress saved to {checkpoint.path}, rerun with --resume "
+                "to fetch only the missing years and pages.",
+                file=sys.stderr,
+            )
+    return term_results
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Entry point of the CLI, the arguments are parsed once
+    :param argv: command line arguments, sys.argv[1:] if not given
+    """
+    options = ArgumentParser().parse(argv)
+    # keep stdout clean for the machine readable formats
+    print(
+        "Starting movie-client...",
+        file=(
+            sys.stdout
+            if options.output == OUTPUT_TEXT and options.command != COMMAND_BATCH
+            else sys.stderr
+        ),
+    )
+
+    args = Arguments(options.years, options.search, options.count_only, options.regex)
+    if options.command == COMMAND_QUERY:
+        run_query(options, args)
+    elif options.offline:
+        run_offline(options, args)
+    else:
+        run_online(options, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,23 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from unittest import mock
 
 import pytest
 
 from client_app_cli.auth.authenticator import Authenticator
+from client_app_cli.cache.token_cache import TokenCache
 from client_app_cli.constants.constant import (
     DEFAULT_USERNAME,
     DEFAULT_PASSWORD,
     BASE_URL,
 )
 from client_app_cli.exceptions.exceptions import AuthenticationException
-from tests.mocks import mocked_auth_success, mocked_auth_failure
+from tests.mocks import (
+    mocked_auth_success,
+    mocked_auth_failure,
+    mocked_auth_short_lived,
+)
 
 
 def test_validate_success():
@@ -49,7 +57,7 @@ def test_validate_invalid_url():
         Authenticator(DEFAULT_USERNAME, DEFAULT_PASSWORD, "#invalid-url")
 
 
-@mock.patch("requests.post", side_effect=mocked_auth_success)
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
 def test_authenticate_success(mock_post):
     """
     Test that successful authentication returns correct bearer token
@@ -63,7 +71,7 @@ def test_authenticate_success(mock_post):
     mock_post.assert_called_once()
 
 
-@mock.patch("requests.post", side_effect=mocked_auth_failure)
+@mock.patch("requests.Session.post", side_effect=mocked_auth_failure)
 def test_authenticate_failure(mock_post):
     """
     Test that unsuccessful authentication raises AuthenticationException
@@ -73,7 +81,7 @@ def test_authenticate_failure(mock_post):
         Authenticator(DEFAULT_USERNAME, DEFAULT_PASSWORD, BASE_URL).authenticate()
 
 
-@mock.patch("requests.post", side_effect=mocked_auth_success)
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
 def test_authenticate_returns_same_token_from_cache(mock_post):
     responses = []
     errors = []
@@ -91,3 +99,84 @@ def test_authenticate_returns_same_token_from_cache(mock_post):
         func_call_times += 1
     assert all(1234 == token for token in responses)
     mock_post.assert_called_once()
+
+
+def test_concurrent_callers_share_one_token_request():
+    """
+    Test that threads finding no valid token wait for a single token request
+    """
+    calls = []
+
+    def slow_auth(*args, **kwargs):
+        calls.append(1)
+        time.sleep(0.05)
+        return mocked_auth_success()
+
+    auth = Authenticator(DEFAULT_USERNAME, DEFAULT_PASSWORD, BASE_URL)
+    with mock.patch("requests.Session.post", side_effect=slow_auth):
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            tokens = list(executor.map(lambda _: auth.authenticate(), range(8)))
+    assert tokens == [1234] * 8
+    assert len(calls) == 1
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+def test_expired_token_is_renewed(mock_post):
+    """
+    Test that an expired token is requested again
+    """
+    auth = Authenticator(DEFAULT_USERNAME, DEFAULT_PASSWORD, BASE_URL)
+    auth.authenticate()
+    auth.token_expiry = datetime.min
+    assert auth.authenticate() == 1234
+    assert mock_post.call_count == 2
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_short_lived)
+def test_background_refresh_renews_token_before_expiry(mock_post):
+    """
+    Test that the background refresh obtains a token and renews it before it expires
+    """
+    auth = Authenticator(DEFAULT_USERNAME, DEFAULT_PASSWORD, BASE_URL)
+    auth.start_background_refresh()
+    try:
+        time.sleep(0.35)
+        assert mock_post.call_count >= 2
+        assert auth.has_valid_token()
+        assert auth.authenticate() == 1234
+        calls = mock_post.call_count
+    finally:
+        auth.stop_background_refresh()
+    time.sleep(0.2)
+    assert mock_post.call_count == calls
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+def test_token_cache_is_shared_across_instances(mock_post, tmp_path):
+    """
+    Test that a token obtained by one run is reused by the next one
+    """
+    token_cache = TokenCache(str(tmp_path / "tokens.sqlite3"))
+    Authenticator(
+        DEFAULT_USERNAME, DEFAULT_PASSWORD, BASE_URL, token_cache=token_cache
+    ).authenticate()
+    auth = Authenticator(
+        DEFAULT_USERNAME, DEFAULT_PASSWORD, BASE_URL, token_cache=token_cache
+    )
+    assert auth.authenticate() == 1234
+    mock_post.assert_called_once()
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+def test_invalidated_token_is_removed_from_cache(mock_post, tmp_path):
+    """
+    Test that a token rejected by the server is requested again and not reused
+    """
+    token_cache = TokenCache(str(tmp_path / "tokens.sqlite3"))
+    auth = Authenticator(
+        DEFAULT_USERNAME, DEFAULT_PASSWORD, BASE_URL, token_cache=token_cache
+    )
+    auth.invalidate(auth.authenticate())
+    assert token_cache.get(BASE_URL, DEFAULT_USERNAME) is None
+    assert auth.authenticate() == 1234
+    assert mock_post.call_count == 2
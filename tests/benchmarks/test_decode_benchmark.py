@@ -0,0 +1,11 @@
+from benchmarks.decode_benchmark import benchmark, make_pages
+
+
+def test_every_variant_finds_the_same_matches():
+    """
+    Test that the prefilter and every parser agree on the matches of the benchmark pages
+    """
+    results = benchmark(make_pages(50, 0.05), "star", repeat=1)
+    assert "json + prefilter" in results
+    assert len({result["matches"] for result in results.values()}) == 1
+    assert all(result["titles_per_second"] > 0 for result in results.values())
@@ -0,0 +1,81 @@
+import pytest
+import requests
+
+from benchmarks.run_benchmarks import Scenario, regressions, run_scenario
+from benchmarks.stand_in_server import StandInConfig, StandInServer, title
+
+
+@pytest.fixture(scope="module")
+def server():
+    """
+    returns a running stand-in server with 25 movies in 1940 and 503 answers on 30% of the requests
+    """
+    with StandInServer(StandInConfig({1940: 25}, error_rate=0.3)) as server:
+        yield server
+
+
+def get(server, path, token):
+    return requests.get(
+        server.base_url + path, headers={"Authorization": f"Bearer {token}"}
+    )
+
+
+def test_pages_and_authentication(server):
+    """
+    Test that the stand-in server pages the movies by 10 and requires a bearer token
+    """
+    token = requests.post(server.base_url + "api/auth", json={}).json()["bearer"]
+    assert get(server, "api/movies/1940/1", "invalid").status_code == 401
+
+    def movies(page):
+        # the injected errors are retried like the client does
+        for _ in range(20):
+            response = get(server, f"api/movies/1940/{page}", token)
+            if response.status_code != 503:
+                return response
+        raise AssertionError("too many injected errors")
+
+    assert len(movies(1).json()) == 10
+    assert len(movies(3).json()) == 5
+    assert movies(4).status_code == 404
+
+
+def test_titles_are_deterministic():
+    """
+    Test that the titles only depend on the seed, the year and the index
+    """
+    config = StandInConfig({1940: 10}, match_rate=1.0)
+    assert title(config, 1940, 3) == title(config, 1940, 3)
+    assert "Star" in title(config, 1940, 3).split()
+
+
+def test_run_scenario():
+    """
+    Test that a scenario run reports its requests and finds every year
+    """
+    scenario = Scenario("test", StandInConfig({1940: 120, 1950: 30}))
+    with StandInServer(scenario.config) as server:
+        result = run_scenario(scenario, server.base_url, True)
+    assert result["requests"] > result["probe_requests"] > 0
+    assert result["peak_memory"] > 0
+
+
+def test_regressions():
+    """
+    Test that slowdowns beyond the tolerance and any extra request are flagged
+    """
+    baseline = {
+        "wall_time": 1.0,
+        "peak_memory": 100,
+        "requests": 10,
+        "probe_requests": 5,
+    }
+    assert regressions(dict(baseline, wall_time=1.1), baseline, 0.2) == []
+    assert len(regressions(dict(baseline, wall_time=1.3), baseline, 0.2)) == 1
+    # below the noise floor
+    assert regressions(dict(baseline, peak_memory=200), baseline, 0.2) == []
+    assert len(regressions(dict(baseline, probe_requests=6), baseline, 0.2)) == 1
+    assert regressions(dict(baseline, requests=8), {}, 0.2) == []
+    # hedged scenarios send a timing-dependent number of duplicates
+    assert regressions(dict(baseline, requests=11), baseline, 0.2, False) == []
+    assert len(regressions(dict(baseline, requests=13), baseline, 0.2, False)) == 1
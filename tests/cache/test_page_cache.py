@@ -0,0 +1,99 @@
+import threading
+from unittest import mock
+
+import pytest
+
+from client_app_cli.cache.page_cache import PageCache
+
+URL = "http://localhost:8080/"
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    """
+    returns the path of a cache database in a temporary directory
+    """
+    return str(tmp_path / "cache" / "pages.sqlite3")
+
+
+def test_put_and_get(cache_path):
+    """
+    Test that a stored page is returned for the same key only
+    """
+    cache = PageCache(cache_path)
+    cache.put(URL, 1940, 1, b'["Star Dust"]')
+    assert cache.get(URL, 1940, 1) == b'["Star Dust"]'
+    assert cache.get(URL, 1940, 2) is None
+    assert cache.get("http://other:8080/", 1940, 1) is None
+    cache.close()
+
+
+def test_cache_persists_across_instances(cache_path):
+    """
+    Test that pages stored by one instance are read by a later one
+    """
+    cache = PageCache(cache_path)
+    cache.put(URL, 1940, 1, b"[]")
+    cache.close()
+    assert PageCache(cache_path).get(URL, 1940, 1) == b"[]"
+
+
+def test_expired_page_is_a_miss(cache_path):
+    """
+    Test that a page older than the TTL is not returned
+    """
+    cache = PageCache(cache_path, ttl=60)
+    with mock.patch("time.time", return_value=1000.0):
+        cache.put(URL, 1940, 1, b"[]")
+    with mock.patch("time.time", return_value=1030.0):
+        assert cache.get(URL, 1940, 1) == b"[]"
+    with mock.patch("time.time", return_value=1061.0):
+        assert cache.get(URL, 1940, 1) is None
+
+
+def test_least_recently_used_pages_are_evicted(cache_path):
+    """
+    Test that the least recently used pages are evicted when over the byte budget
+    """
+    cache = PageCache(cache_path, max_bytes=20)
+    with mock.patch("time.time", return_value=1.0):
+        cache.put(URL, 1940, 1, b"x" * 8)
+    with mock.patch("time.time", return_value=2.0):
+        cache.put(URL, 1940, 2, b"x" * 8)
+    with mock.patch("time.time", return_value=3.0):
+        cache.get(URL, 1940, 1)
+    with mock.patch("time.time", return_value=4.0):
+        cache.put(URL, 1940, 3, b"x" * 8)
+    with mock.patch("time.time", return_value=5.0):
+        assert cache.get(URL, 1940, 1) is not None
+        assert cache.get(URL, 1940, 2) is None
+        assert cache.get(URL, 1940, 3) is not None
+
+
+def test_clear(cache_path):
+    """
+    Test that clearing the cache removes every page
+    """
+    cache = PageCache(cache_path)
+    cache.put(URL, 1940, 1, b"[]")
+    cache.clear()
+    assert cache.get(URL, 1940, 1) is None
+
+
+def test_concurrent_access(cache_path):
+    """
+    Test that worker threads can store and read pages at the same time
+    """
+    cache = PageCache(cache_path)
+
+    def worker(year):
+        for page in range(1, 51):
+            cache.put(URL, year, page, str(page).encode())
+            assert cache.get(URL, year, page) == str(page).encode()
+
+    threads = [threading.Thread(target=worker, args=(y,)) for y in range(1940, 1945)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert cache.get(URL, 1944, 50) == b"50"
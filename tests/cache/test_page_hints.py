@@ -0,0 +1,33 @@
+from client_app_cli.cache.page_hints import PageHints
+
+URL = "http://localhost:8080/"
+
+
+def test_put_and_get(tmp_path):
+    """
+    Test that a recorded page is returned for the same base URL and year only
+    """
+    hints = PageHints(str(tmp_path / "cache" / "hints.sqlite3"))
+    hints.put(URL, 1940, 4)
+    assert hints.get(URL, 1940) == 4
+    assert hints.get(URL, 1950) is None
+    assert hints.get("http://other:8080/", 1940) is None
+    hints.put(URL, 1940, 5)
+    assert hints.get(URL, 1940) == 5
+    hints.close()
+
+
+def test_hints_persist_and_clear(tmp_path):
+    """
+    Test that hints survive reopening the database and are removed by clear
+    """
+    path = str(tmp_path / "hints.sqlite3")
+    hints = PageHints(path)
+    hints.put(URL, 1940, 4)
+    hints.close()
+
+    hints = PageHints(path)
+    assert hints.get(URL, 1940) == 4
+    hints.clear()
+    assert hints.get(URL, 1940) is None
+    hints.close()
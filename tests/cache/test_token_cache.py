@@ -0,0 +1,80 @@
+import os
+import stat
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from client_app_cli.cache.token_cache import TokenCache
+
+URL = "http://localhost:8080/"
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    """
+    returns the path of a token cache database in a temporary directory
+    """
+    return str(tmp_path / "cache" / "tokens.sqlite3")
+
+
+def test_put_and_get(cache_path):
+    """
+    Test that a stored token is returned for the same base URL and username only
+    """
+    cache = TokenCache(cache_path)
+    expires_at = time.time() + 60
+    cache.put(URL, "user", "abc", expires_at, expires_at - 10)
+    assert cache.get(URL, "user") == ("abc", expires_at, expires_at - 10)
+    assert cache.get(URL, "other") is None
+    assert cache.get("http://other:8080/", "user") is None
+    cache.close()
+
+
+def test_expired_token_is_not_returned(cache_path):
+    """
+    Test that an expired token is ignored
+    """
+    cache = TokenCache(cache_path)
+    cache.put(URL, "user", "abc", time.time() - 1, time.time() - 2)
+    assert cache.get(URL, "user") is None
+    cache.close()
+
+
+def test_file_is_owner_only(cache_path):
+    """
+    Test that the cache file can only be read and written by its owner
+    """
+    TokenCache(cache_path).close()
+    assert stat.S_IMODE(os.stat(cache_path).st_mode) == 0o600
+
+
+def test_delete_keeps_renewed_token(cache_path):
+    """
+    Test that deleting a rejected token keeps a token renewed meanwhile
+    """
+    cache = TokenCache(cache_path)
+    expires_at = time.time() + 60
+    cache.put(URL, "user", "new", expires_at, expires_at)
+    cache.delete(URL, "user", "old")
+    assert cache.get(URL, "user") is not None
+    cache.delete(URL, "user", "new")
+    assert cache.get(URL, "user") is None
+    cache.close()
+
+
+def test_concurrent_writers(cache_path):
+    """
+    Test that instances writing at the same time leave one complete entry
+    """
+    expires_at = time.time() + 60
+
+    def write(i):
+        cache = TokenCache(cache_path)
+        cache.put(URL, "user", f"token-{i}", expires_at, expires_at)
+        cache.close()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(write, range(16)))
+    token, _, _ = TokenCache(cache_path).get(URL, "user")
+    assert token.startswith("token-")
@@ -0,0 +1,129 @@
+import errno
+import os
+from unittest import mock
+
+import pytest
+
+from client_app_cli.arguments.arguments import Arguments
+from client_app_cli.checkpoint.checkpoint import Checkpoint
+from client_app_cli.exceptions.exceptions import CheckpointException
+
+
+def test_units_are_resumed(tmp_path):
+    """
+    Test that the recorded years and pages are read back by a resumed checkpoint
+    """
+    path = str(tmp_path / "run.jsonl")
+    checkpoint = Checkpoint(path, "key")
+    checkpoint.record_year(1940, 3)
+    checkpoint.record_page(1940, 1, [["Star Wars"]])
+    checkpoint.close()
+    resumed = Checkpoint(path, "key", resume=True)
+    assert resumed.years == {1940: 3}
+    assert resumed.pages == {(1940, 1): [["Star Wars"]]}
+    assert len(resumed) == 2
+    resumed.close()
+    assert Checkpoint(path, "key").pages == {}
+
+
+def test_units_are_appended_in_batches(tmp_path):
+    """
+    Test that units stay buffered until a batch is full
+    """
+    path = tmp_path / "run.jsonl"
+    checkpoint = Checkpoint(str(path), "key", batch_size=3, flush_seconds=60)
+    for page in (1, 2):
+        checkpoint.record_page(1940, page, [1])
+    assert len(path.read_text().splitlines()) == 1
+    checkpoint.record_page(1940, 3, [0])
+    assert len(path.read_text().splitlines()) == 2
+    checkpoint.close()
+
+
+def test_torn_batch_is_ignored(tmp_path):
+    """
+    Test that a last line torn by a crash is skipped and does not corrupt the next batch
+    """
+    path = tmp_path / "run.jsonl"
+    checkpoint = Checkpoint(str(path), "key")
+    checkpoint.record_page(1940, 1, [1])
+    checkpoint.close()
+    with open(path, "a") as f:
+        f.write('[{"year":1940,"page":2,"res')
+    resumed = Checkpoint(str(path), "key", resume=True)
+    assert list(resumed.pages) == [(1940, 1)]
+    resumed.record_page(1940, 2, [0])
+    resumed.close()
+    assert list(Checkpoint(str(path), "key", resume=True).pages) == [
+        (1940, 1),
+        (1940, 2),
+    ]
+
+
+def test_checkpoint_of_another_search_is_refused(tmp_path):
+    """
+    Test that resuming from a file written by another search raises CheckpointException
+    """
+    path = str(tmp_path / "run.jsonl")
+    Checkpoint(path, "key").close()
+    with pytest.raises(CheckpointException, match=r".*not written by this search.*"):
+        Checkpoint(path, "other", resume=True)
+
+
+def test_key_identifies_the_search():
+    """
+    Test that the key changes with the terms and options but not with the years order
+    """
+    key = Checkpoint.key_for(Arguments([1940, 1950], "star", False), "http://a/")
+    assert key == Checkpoint.key_for(
+        Arguments([1950, 1940], "star", False), "http://a/"
+    )
+    assert key != Checkpoint.key_for(Arguments([1940, 1950], "war", False), "http://a/")
+    assert key != Checkpoint.key_for(Arguments([1940, 1950], "star", True), "http://a/")
+    assert key != Checkpoint.key_for(
+        Arguments([1940, 1950], "star", False), "http://b/"
+    )
+
+
+def test_remove(tmp_path):
+    """
+    Test that a completed search deletes its checkpoint
+    """
+    path = tmp_path / "run.jsonl"
+    checkpoint = Checkpoint(str(path), "key")
+    checkpoint.remove()
+    assert not path.exists()
+
+
+def test_write_failure_disables_the_checkpoint(tmp_path, capsys):
+    """
+    Test that a checkpoint that cannot be written, such as on a full disk, stops recording
+    with a warning instead of failing the search
+    """
+    checkpoint = Checkpoint(str(tmp_path / "run.jsonl"), "key", batch_size=1)
+    with mock.patch(
+        "os.fsync", side_effect=OSError(errno.ENOSPC, os.strerror(errno.ENOSPC))
+    ):
+        checkpoint.record_year(1940, 4)
+        checkpoint.record_page(1940, 1, 3)
+    assert checkpoint.error is not None and checkpoint.error.errno == errno.ENOSPC
+    assert capsys.readouterr().err.count("disabled") == 1
+    checkpoint.close()
+
+
+def test_checkpoint_in_use_is_refused(tmp_path):
+    """
+    Test that a second run of the same search cannot open, and truncate, a checkpoint
+    that a running search is writing
+    """
+    path = tmp_path / "run.jsonl"
+    checkpoint = Checkpoint(str(path), "key")
+    checkpoint.record_page(1940, 1, [1])
+    checkpoint.flush()
+    content = path.read_text()
+    for resume in (False, True):
+        with pytest.raises(CheckpointException, match="in use"):
+            Checkpoint(str(path), "key", resume=resume)
+    assert path.read_text() == content
+    checkpoint.remove()
+    Checkpoint(str(path), "key").close()
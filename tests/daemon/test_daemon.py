@@ -0,0 +1,164 @@
+import os
+import socket
+import stat
+import threading
+from unittest import mock
+
+import pytest
+
+from client_app_cli.arguments.arguments import Arguments
+from client_app_cli.auth.authenticator import Authenticator
+from client_app_cli.cache.page_cache import PageCache
+from client_app_cli.constants.constant import (
+    BASE_URL,
+    DEFAULT_PASSWORD,
+    DEFAULT_USERNAME,
+    MEMORY_CACHE,
+)
+from client_app_cli.daemon import protocol
+from client_app_cli.daemon.query_client import QueryClient
+from client_app_cli.daemon.query_server import QueryServer
+from client_app_cli.exceptions.exceptions import DaemonException
+from client_app_cli.results.year_result import TitleList, YearResult
+from client_app_cli.fetcher.movie_fetcher import MovieFetcher
+from tests.mocks import mocked_auth_success, mocked_fetch_success_with_search_term
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    """
+    returns the path of the daemon socket in a temporary directory
+    """
+    return str(tmp_path / "daemon.sock")
+
+
+@pytest.fixture
+def server(socket_path):
+    """
+    returns a running daemon answering with a MovieFetcher on mocked requests
+    """
+    with mock.patch(
+        "requests.Session.post", side_effect=mocked_auth_success
+    ), mock.patch(
+        "requests.Session.get", side_effect=mocked_fetch_success_with_search_term
+    ) as mock_get:
+        fetcher = MovieFetcher(
+            Authenticator(DEFAULT_USERNAME, DEFAULT_PASSWORD, BASE_URL),
+            page_cache=PageCache(MEMORY_CACHE),
+        )
+        server = QueryServer(fetcher, socket_path)
+        server.mock_get = mock_get
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        yield server
+        server.shutdown()
+        thread.join()
+        server.close()
+
+
+def test_query(server, socket_path):
+    """
+    Test that the daemon answers in the shape of search_movies and reuses fetched pages
+    """
+    client = QueryClient(socket_path)
+    results = client.query(Arguments([1940, 1950], "star", False))
+    star = YearResult(3, TitleList(["star"] * 3), pages_fetched=3)
+    assert results == {"star": {1940: star, 1950: star}}
+    sent = server.mock_get.call_count
+
+    results = client.query(Arguments([1940], ["movie", "star"], True))
+    assert results == {
+        "movie": {1940: YearResult(14, pages_fetched=3)},
+        "star": {1940: YearResult(3, pages_fetched=3)},
+    }
+    # only the failing probes are sent again, the existing pages come from memory
+    resent = [call.args[0] for call in server.mock_get.call_args_list[sent:]]
+    assert not [url for url in resent if url.endswith(("/1", "/2", "/3"))]
+
+
+def test_invalid_query(server, socket_path):
+    """
+    Test that a malformed query is answered with an error
+    """
+    with pytest.raises(DaemonException, match="years"):
+        QueryClient(socket_path).query(Arguments([], "star", False))
+    with pytest.raises(DaemonException, match="invalid regex"):
+        QueryClient(socket_path).query(Arguments([1940], "(", False, regex=True))
+
+
+@pytest.mark.parametrize(
+    "query, message",
+    [
+        ({"years": 1940, "search": "star"}, "years"),
+        ({"years": [1940, True], "search": "star"}, "years"),
+        ({"years": [1940], "search": 7}, "search"),
+        ({"years": [1940], "search": "star", "count_only": "false"}, "count_only"),
+        ({"years": [1940], "search": "star", "regex": 1}, "regex"),
+        ({"years": [1940], "search": "[", "regex": True}, "invalid regex"),
+    ],
+)
+def test_malformed_query_is_rejected(query, message):
+    """
+    Test that fields of the wrong type are rejected with a ValueError naming the field
+    """
+    with pytest.raises(ValueError, match=message):
+        protocol.query_from_dict(query)
+
+
+def test_socket_is_owner_only(server, socket_path):
+    """
+    Test that only the owner of the daemon can connect to it
+    """
+    assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+
+
+def test_second_daemon_is_refused(server, socket_path):
+    """
+    Test that a daemon cannot take over the socket of a running one
+    """
+    with pytest.raises(DaemonException, match="already serving"):
+        QueryServer(server.fetcher, socket_path)
+
+
+def test_serve_on_a_busy_socket_exits_with_an_error(server, socket_path, capsys):
+    """
+    Test that the serve command reports a socket already in use without a traceback
+    """
+    import argparse
+
+    import main
+
+    options = argparse.Namespace(command="serve", socket=socket_path)
+    with pytest.raises(SystemExit) as exit_info:
+        main.run_command(options, Arguments([1940], "star", False), server.fetcher)
+    assert exit_info.value.code == 1
+    assert "Serve failed: a daemon is already serving" in capsys.readouterr().err
+
+
+def test_unbindable_socket_is_refused(tmp_path):
+    """
+    Test that a socket path that cannot be created raises DaemonException
+    """
+    not_a_directory = tmp_path / "file"
+    not_a_directory.write_text("")
+    with pytest.raises(DaemonException, match="cannot bind"):
+        QueryServer(mock.Mock(), str(not_a_directory / "daemon.sock"))
+
+
+def test_stale_socket_is_replaced(socket_path):
+    """
+    Test that the socket file of a daemon that did not exit cleanly is replaced
+    """
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(socket_path)
+    stale.close()
+    QueryServer(mock.Mock(), socket_path).close()
+    assert not os.path.exists(socket_path)
+
+
+def test_daemon_not_running(socket_path):
+    """
+    Test that querying without a daemon raises DaemonException
+    """
+    with pytest.raises(DaemonException, match="cannot reach the daemon"):
+        QueryClient(socket_path).query(Arguments([1940], "star", False))
@@ -0,0 +1,197 @@
+import pytest
+
+from client_app_cli.arguments.arguments import Arguments
+from client_app_cli.auth.authenticator import Authenticator
+from client_app_cli.constants.constant import (
+    DEFAULT_USERNAME,
+    DEFAULT_PASSWORD,
+)
+from client_app_cli.fetcher.async_movie_fetcher import AsyncMovieFetcher
+from client_app_cli.fetcher.movie_fetcher import MovieFetcher
+from client_app_cli.results.year_result import YearResult
+from tests.mocks import (
+    MockFailure,
+    MockRawFailure,
+    MockSuccess,
+    mock_movie_server,
+    mocked_auth_failure,
+    mocked_fetch_failure,
+    mocked_fetch_success,
+    mocked_fetch_success_for_pages_more_than_100,
+    mocked_fetch_success_with_search_term,
+)
+
+
+@pytest.fixture()
+def years():
+    """
+    returns a list of years
+    """
+    return [1940, 1950]
+
+
+def fetch(args, max_in_flight=10, **handlers):
+    """
+    Runs the async fetcher against a local mock movie server
+    """
+    with mock_movie_server(**handlers) as url:
+        auth = Authenticator(DEFAULT_USERNAME, DEFAULT_PASSWORD, url)
+        return AsyncMovieFetcher(auth, max_in_flight).fetch_movies(args)
+
+
+def test_invalid_max_in_flight():
+    """
+    Test that a non-positive in-flight limit raises ValueError
+    """
+    auth = Authenticator(DEFAULT_USERNAME, DEFAULT_PASSWORD, "http://localhost/")
+    with pytest.raises(ValueError, match=r".*max_in_flight.*"):
+        AsyncMovieFetcher(auth, 0)
+
+
+def test_fetch_success_without_search_term(years):
+    """
+    Test that the async fetcher returns the correct number of movies for every year
+    """
+    fetch_response = fetch(
+        Arguments(years, "", False), fetch_handler=mocked_fetch_success
+    )
+    assert fetch_response == {
+        1940: YearResult(22, pages_fetched=3),
+        1950: YearResult(22, pages_fetched=3),
+    }
+
+
+def test_fetch_success_for_pages_more_than_100(years):
+    """
+    Test that the async fetcher finds the failing page when there are more than 100 pages
+    """
+    fetch_response = fetch(
+        Arguments(years, "", False),
+        fetch_handler=mocked_fetch_success_for_pages_more_than_100,
+    )
+    assert fetch_response[1940].count == 1002
+
+
+def test_fetch_success_with_search_term(years):
+    """
+    Test that the async fetcher filters every page with a single in-flight request
+    """
+    fetch_response = fetch(
+        Arguments(years, "test", False),
+        max_in_flight=1,
+        fetch_handler=mocked_fetch_success_with_search_term,
+    )
+    assert fetch_response[1940].count == 6
+    assert fetch_response[1950].titles == ["testing", "test"] * 3
+
+
+def test_fetch_failure(years):
+    """
+    Test that a year without pages is reported as failed with its error
+    """
+    fetch_response = fetch(
+        Arguments(years, "", False), fetch_handler=mocked_fetch_failure
+    )
+    assert fetch_response == {
+        1940: YearResult(error="*.not found.*"),
+        1950: YearResult(error="*.not found.*"),
+    }
+
+
+def test_auth_failure(years):
+    """
+    Test that unsuccessful authentication fails the specified year
+    """
+    fetch_response = fetch(
+        Arguments(years, "", False), auth_handler=mocked_auth_failure
+    )
+    assert fetch_response[1940].failed
+
+
+def test_fetch_success_with_count_only(years):
+    """
+    Test that the async fetcher only counts the matches with count only
+    """
+    fetch_response = fetch(
+        Arguments(years, "test", True),
+        fetch_handler=mocked_fetch_success_with_search_term,
+    )
+    assert fetch_response == {
+        1940: YearResult(6, pages_fetched=3),
+        1950: YearResult(6, pages_fetched=3),
+    }
+
+
+def mocked_fetch_five_pages(url, **kwargs):
+    """
+    Mocked response of a year of 5 pages, the last one holding 3 movies
+    """
+    page = int(url.rstrip("/").split("/")[-1])
+    if page > 5:
+        return MockFailure({"error": r"*.not found.*"}, 404)
+    return MockSuccess([f"Star {page}"] + ["movie"] * (2 if page == 5 else 9), 200)
+
+
+@pytest.mark.parametrize(
+    "search_term, count_only", [("", False), ("star", False), ("star", True)]
+)
+def test_async_and_sync_engines_agree(search_term, count_only):
+    """
+    Test that both engines find the same pages and movies, whether the page search
+    ends on a failing or a successful probe
+    """
+    args = Arguments([1940], search_term, count_only)
+    with mock_movie_server(fetch_handler=mocked_fetch_five_pages) as url:
+        auth = Authenticator(DEFAULT_USERNAME, DEFAULT_PASSWORD, url)
+        fetcher = MovieFetcher(auth)
+        sync_results = fetcher.fetch_movies(args)
+        fetcher.close()
+        async_results = AsyncMovieFetcher(auth, 10).fetch_movies(args)
+    assert sync_results[1940].pages_fetched == 5
+    assert sync_results[1940].count == (43 if not search_term else 5)
+    sync_result, async_result = sync_results[1940], async_results[1940]
+    assert (async_result.count, async_result.pages_fetched) == (
+        sync_result.count,
+        sync_result.pages_fetched,
+    )
+    # the sync engine keeps the titles in the order the pages complete
+    assert sorted(async_result.titles or []) == sorted(sync_result.titles or [])
+
+
+def test_forbidden_page_is_not_scanned():
+    """
+    Test that the error body of a page answered with a non-retryable status is counted as
+    a failed page instead of being scanned as titles
+    """
+    result = fetch(
+        Arguments([1940], "e", False),
+        fetch_handler=lambda url: (
+            MockFailure({"error": "forbidden"}, 403)
+            if url.endswith("/2")
+            else mocked_fetch_success_with_search_term(url)
+        ),
+    )[1940]
+    assert result.partial and "error" not in (result.titles or [])
+    assert (result.pages_fetched, result.pages_failed) == (2, 1)
+
+
+def test_error_body_that_is_not_json_fails_the_page():
+    """
+    Test that a page answered with a non-JSON error body is counted as failed instead of
+    failing the decoding, and that a year without pages reports the status
+    """
+    result = fetch(
+        Arguments([1940], "e", False),
+        fetch_handler=lambda url: (
+            MockRawFailure(b"<html>Bad Gateway</html>", 502)
+            if url.endswith("/2")
+            else mocked_fetch_success_with_search_term(url)
+        ),
+    )[1940]
+    assert (result.pages_fetched, result.pages_failed) == (2, 1)
+
+    result = fetch(
+        Arguments([1940], "", False),
+        fetch_handler=lambda url: MockRawFailure(b"<html>Not Found</html>", 404),
+    )[1940]
+    assert result == YearResult(error="request failed with status 404")
@@ -0,0 +1,97 @@
+from unittest import mock
+
+import pytest
+
+from client_app_cli.fetcher.concurrency import AdaptiveConcurrencyController
+from client_app_cli.fetcher.retry import RetryPolicy, RetryStats
+
+
+def test_limit_grows_while_latency_is_stable():
+    """
+    Test that the limit grows additively with successful requests of stable latency
+    """
+    controller = AdaptiveConcurrencyController(initial=2, max_limit=4)
+    for _ in range(20):
+        controller.record(0.1, 200)
+    assert controller.limit == 4
+
+
+@pytest.mark.parametrize("status_code", [429, 503, None])
+def test_limit_halves_on_overload(status_code):
+    """
+    Test that 429/5xx answers and connection failures halve the limit
+    """
+    controller = AdaptiveConcurrencyController(initial=8)
+    controller.record(0.1, status_code)
+    assert controller.limit == 4
+
+
+def test_limit_halves_once_per_round_trip():
+    """
+    Test that a burst of failures within one round trip shrinks the limit only once
+    """
+    controller = AdaptiveConcurrencyController(initial=8)
+    controller.record(10.0, 200)
+    for _ in range(5):
+        controller.record(10.0, 503)
+    assert controller.limit == 4
+
+
+def test_limit_halves_on_rising_latency():
+    """
+    Test that the limit shrinks when latency rises well above the baseline
+    """
+    controller = AdaptiveConcurrencyController(initial=8, latency_tolerance=2.0)
+    controller.record(0.01, 200)
+    for _ in range(10):
+        controller.record(1.0, 200)
+    assert controller.limit < 8
+
+
+def test_limit_stays_within_bounds():
+    """
+    Test that the limit never drops below min_limit
+    """
+    controller = AdaptiveConcurrencyController(initial=2, min_limit=2)
+    with mock.patch("time.monotonic", side_effect=range(0, 100, 10)):
+        for _ in range(5):
+            controller.record(0.1, 503)
+    assert controller.limit == 2
+
+
+def test_invalid_limits():
+    """
+    Test that inconsistent limits are rejected
+    """
+    with pytest.raises(ValueError):
+        AdaptiveConcurrencyController(min_limit=4, max_limit=2)
+
+
+def test_retry_delay_is_bounded():
+    """
+    Test that the jittered backoff never exceeds the exponential ceiling
+    """
+    policy = RetryPolicy(max_retries=5, base_delay=1.0, max_delay=3.0)
+    assert all(0 <= policy.delay(1) <= 1.0 for _ in range(50))
+    assert all(0 <= policy.delay(5) <= 3.0 for _ in range(50))
+
+
+def test_retryable_statuses():
+    """
+    Test that only overload answers and connection failures are retried
+    """
+    assert RetryPolicy.is_retryable(503)
+    assert RetryPolicy.is_retryable(None)
+    assert not RetryPolicy.is_retryable(404)
+    assert not RetryPolicy.is_retryable(200)
+
+
+def test_retry_stats():
+    """
+    Test that the retry counters add up per page
+    """
+    stats = RetryStats()
+    stats.record(0, False)
+    stats.record(2, False)
+    stats.record(3, True)
+    assert (stats.pages_retried, stats.retries, stats.pages_given_up) == (2, 5, 1)
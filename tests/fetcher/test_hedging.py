@@ -0,0 +1,65 @@
+import pytest
+
+from client_app_cli.fetcher.hedging import HedgePolicy, HedgeStats
+
+
+def test_no_hedge_before_enough_latencies():
+    """
+    Test that requests are not duplicated until enough latencies are known
+    """
+    policy = HedgePolicy(min_samples=3)
+    policy.record(0.1)
+    policy.record(0.2)
+    assert policy.start() is None
+    policy.record(0.3)
+    assert policy.start() is not None
+
+
+def test_delay_follows_the_recent_latencies():
+    """
+    Test that the hedge delay is the percentile of the latencies of the window
+    """
+    policy = HedgePolicy(percentile=0.9, window=10, min_samples=1, min_delay=0)
+    for latency in range(1, 11):
+        policy.record(latency / 100)
+    assert policy.start() == pytest.approx(0.10)
+    for _ in range(10):
+        policy.record(0.01)
+    assert policy.start() == pytest.approx(0.01)
+    policy = HedgePolicy(min_samples=1, min_delay=0.05)
+    policy.record(0.001)
+    assert policy.start() == 0.05
+
+
+def test_duplicates_stay_within_the_budget():
+    """
+    Test that at most max_ratio duplicates are sent per request
+    """
+    policy = HedgePolicy(max_ratio=0.1)
+    for _ in range(9):
+        policy.start()
+    assert not policy.acquire()
+    policy.start()
+    assert policy.acquire()
+    assert not policy.acquire()
+
+
+def test_invalid_hedge_policy():
+    """
+    Test that a percentile outside (0, 1) or a negative budget raises ValueError
+    """
+    with pytest.raises(ValueError, match=r".*percentile.*"):
+        HedgePolicy(percentile=1)
+    with pytest.raises(ValueError, match=r".*max_ratio.*"):
+        HedgePolicy(max_ratio=-1)
+
+
+def test_hedge_stats():
+    """
+    Test that duplicates, their wins and the refused ones are counted
+    """
+    stats = HedgeStats()
+    stats.record(hedged=True, won=True)
+    stats.record(hedged=True, delayed=True)
+    stats.record(hedged=False)
+    assert (stats.hedges, stats.wins, stats.delayed, stats.denied) == (2, 1, 1, 1)
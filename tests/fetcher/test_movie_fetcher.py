@@ -1,16 +1,33 @@
+import concurrent.futures
+import json
+import sqlite3
+import threading
+import time
 from unittest import mock
 
 import pytest
 
 from client_app_cli.arguments.arguments import Arguments
 from client_app_cli.auth.authenticator import Authenticator
+from client_app_cli.cache.page_cache import PageCache
+from client_app_cli.cache.page_hints import PageHints
+from client_app_cli.checkpoint.checkpoint import Checkpoint
 from client_app_cli.constants.constant import (
     DEFAULT_USERNAME,
     DEFAULT_PASSWORD,
     BASE_URL,
 )
+from client_app_cli.exceptions.exceptions import MovieFetcherException
+from client_app_cli.fetcher.hedging import HedgePolicy
 from client_app_cli.fetcher.movie_fetcher import MovieFetcher
+from client_app_cli.fetcher.page_decoder import PageDecoder
+from client_app_cli.fetcher.retry import RetryPolicy
+from client_app_cli.fetcher.sampling import PageSampler
+from client_app_cli.results.year_result import YearResult
+from client_app_cli.tracing.tracer import Tracer
 from tests.mocks import (
+    MockFailure,
+    MockSuccess,
     mocked_auth_failure,
     mocked_fetch_success,
     mocked_auth_success,
@@ -19,6 +36,7 @@ from tests.mocks import (
     mocked_fetch_exception_failure,
     mocked_fetch_success_with_search_term,
     mocked_fetch_success_for_pages_more_than_100,
+    mocked_fetch_flaky,
 )
 
 
@@ -46,17 +64,17 @@ def fetcher(authenticator):
     return MovieFetcher(authenticator)
 
 
-@mock.patch("requests.post", side_effect=mocked_auth_failure)
+@mock.patch("requests.Session.post", side_effect=mocked_auth_failure)
 def test_auth_failure(mock_post, fetcher, years):
     """
-    Test that unsuccessful authentication returns None for the specified year
+    Test that unsuccessful authentication fails the specified year
     """
     args = Arguments(years, "", False)
-    assert fetcher.fetch_movies(args)[1940] is None
+    assert fetcher.fetch_movies(args)[1940].failed
 
 
-@mock.patch("requests.post", side_effect=mocked_auth_success)
-@mock.patch("requests.get", side_effect=mocked_fetch_success)
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+@mock.patch("requests.Session.get", side_effect=mocked_fetch_success)
 def test_fetch_success_without_search_term(mock_post, mock_get, fetcher, years):
     """
     Test that successful fetching returns a dictionary and the correct number of movies for a given year
@@ -68,11 +86,13 @@ def test_fetch_success_without_search_term(mock_post, mock_get, fetcher, years):
     args = Arguments(years, "", False)
     fetch_response = fetcher.fetch_movies(args)
     assert isinstance(fetch_response, dict)
-    assert fetch_response[1940][0] == 22
+    assert fetch_response[1940].count == 22
 
 
-@mock.patch("requests.post", side_effect=mocked_auth_success)
-@mock.patch("requests.get", side_effect=mocked_fetch_success_for_pages_more_than_100)
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+@mock.patch(
+    "requests.Session.get", side_effect=mocked_fetch_success_for_pages_more_than_100
+)
 def test_fetch_success_for_pages_more_than_100(mock_post, mock_get, fetcher, years):
     """
     Test that successful fetching returns a dictionary and the correct number of movies for a given year
@@ -82,11 +102,11 @@ def test_fetch_success_for_pages_more_than_100(mock_post, mock_get, fetcher, yea
     args = Arguments(years, "", False)
     fetch_response = fetcher.fetch_movies(args)
     assert isinstance(fetch_response, dict)
-    assert fetch_response[1940][0] == 1002
+    assert fetch_response[1940].count == 1002
 
 
-@mock.patch("requests.post", side_effect=mocked_auth_success)
-@mock.patch("requests.get", side_effect=mocked_fetch_success_with_search_term)
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+@mock.patch("requests.Session.get", side_effect=mocked_fetch_success_with_search_term)
 def test_fetch_success_with_search_term(mock_post, mock_get, fetcher, years):
     """
     Test that successful fetching returns a dictionary and the correct number of movies for a given year with search term
@@ -98,11 +118,11 @@ def test_fetch_success_with_search_term(mock_post, mock_get, fetcher, years):
     args = Arguments(years, "test", False)
     fetch_response = fetcher.fetch_movies(args)
     assert isinstance(fetch_response, dict)
-    assert fetch_response[1940][0] == 6
+    assert fetch_response[1940].count == 6
 
 
-@mock.patch("requests.post", side_effect=mocked_auth_success)
-@mock.patch("requests.get", side_effect=mocked_fetch_success_with_search_term)
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+@mock.patch("requests.Session.get", side_effect=mocked_fetch_success_with_search_term)
 def test_fetch_success_with_count_only(mock_post, mock_get, fetcher, years):
     """
     Test that successful fetching returns a dictionary and the correct number of movies for a given year with count only
@@ -114,11 +134,11 @@ def test_fetch_success_with_count_only(mock_post, mock_get, fetcher, years):
     args = Arguments(years, "test", True)
     fetch_response = fetcher.fetch_movies(args)
     assert isinstance(fetch_response, dict)
-    assert fetch_response[1940][0] == 6
+    assert fetch_response[1940].count == 6
 
 
-@mock.patch("requests.post", side_effect=mocked_auth_success)
-@mock.patch("requests.get", side_effect=mocked_fetch_success)
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+@mock.patch("requests.Session.get", side_effect=mocked_fetch_success)
 def test_process_years(mock_post, mock_get, fetcher):
     """
     Test that given same year multiple times as years argument returns a dictionary with the correct number of movies
@@ -133,35 +153,584 @@ def test_process_years(mock_post, mock_get, fetcher):
     assert len(fetch_response) == 1
 
 
-@mock.patch("requests.post", side_effect=mocked_auth_success)
-@mock.patch("requests.get", side_effect=mocked_fetch_failure)
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+@mock.patch("requests.Session.get", side_effect=mocked_fetch_failure)
 def test_fetch_failure(mock_post, mock_get, fetcher, years):
     """
-    Test that unsuccessful fetching returns a dictionary with None for the specified year when year not found
+    Test that unsuccessful fetching returns a dictionary with a failed result for the specified year when year not found
     """
     args = Arguments(years, "", False)
     fetch_response = fetcher.fetch_movies(args)
-    assert fetch_response[1940] is None
-    assert fetch_response[1950] is None
+    assert fetch_response[1940].failed
+    assert fetch_response[1950].failed
 
 
-@mock.patch("requests.post", side_effect=mocked_auth_success)
-@mock.patch("requests.get", side_effect=mocked_fetch_auth_failure)
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+@mock.patch("requests.Session.get", side_effect=mocked_fetch_auth_failure)
 def test_fetch_auth_failure(mock_post, mock_get, fetcher, years):
     """
-    Test that unsuccessful fetching returns a dictionary with None for the specified year when authentication fails
+    Test that unsuccessful fetching returns a dictionary with a failed result for the specified year when authentication fails
     """
     args = Arguments(years, "", False)
     fetch_response = fetcher.fetch_movies(args)
-    assert fetch_response[1940] is None
+    assert fetch_response[1940].failed
 
 
-@mock.patch("requests.post", side_effect=mocked_auth_success)
-@mock.patch("requests.get", side_effect=mocked_fetch_exception_failure)
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+@mock.patch("requests.Session.get", side_effect=mocked_fetch_exception_failure)
 def test_fetch_exception_failure(mock_post, mock_get, fetcher, years):
     """
-    Test that unsuccessful fetching returns a dictionary with None for the specified year when unexpected error occurs
+    Test that unsuccessful fetching returns a dictionary with a failed result for the specified year when unexpected error occurs
     """
     args = Arguments(years, "", False)
     fetch_response = fetcher.fetch_movies(args)
-    assert fetch_response[1940] is None
+    assert fetch_response[1940].failed
+
+
+@pytest.fixture()
+def kary_fetcher(authenticator):
+    """
+    returns a MovieFetcher instance using the k-ary page discovery
+    """
+    return MovieFetcher(authenticator, discovery="kary", probes_per_round=4)
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+@mock.patch(
+    "requests.Session.get", side_effect=mocked_fetch_success_for_pages_more_than_100
+)
+def test_kary_fetch_success_for_pages_more_than_100(
+    mock_get, mock_post, kary_fetcher, years
+):
+    """
+    Test that the k-ary discovery returns the correct number of movies when the number of pages
+    is more than 100
+    """
+    args = Arguments(years, "", False)
+    fetch_response = kary_fetcher.fetch_movies(args)
+    assert fetch_response[1940].count == 1002
+    assert fetch_response[1950].count == 1002
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+@mock.patch("requests.Session.get", side_effect=mocked_fetch_success_with_search_term)
+def test_kary_fetch_reuses_probed_pages(mock_get, mock_post, kary_fetcher):
+    """
+    Test that the filter phase consumes the pages kept from the k-ary discovery
+    instead of fetching them again
+    """
+    args = Arguments([1940], "test", False)
+    fetch_response = kary_fetcher.fetch_movies(args)
+    assert fetch_response[1940].count == 6
+    fetched_pages = [call.args[0] for call in mock_get.call_args_list]
+    assert len(fetched_pages) == len(set(fetched_pages))
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+@mock.patch("requests.Session.get", side_effect=mocked_fetch_failure)
+def test_kary_fetch_failure(mock_get, mock_post, kary_fetcher, years):
+    """
+    Test that the k-ary discovery fails a year without pages
+    """
+    args = Arguments(years, "", False)
+    fetch_response = kary_fetcher.fetch_movies(args)
+    assert fetch_response[1940].failed
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+@mock.patch("requests.Session.get", side_effect=mocked_fetch_success)
+def test_find_lowest_failing_page_for_year(mock_get, mock_post, fetcher):
+    """
+    Test that both discovery modes return the lowest failing page and keep the probed pages
+    """
+    probed = {}
+    assert fetcher.find_lowest_failing_page_for_year(1940, probed) == 4
+    assert set(probed) == {3}
+    probed = {}
+    assert fetcher.find_lowest_failing_page_kary(1940, probed) == 4
+    assert set(probed) == {1, 2, 3}
+
+
+def test_invalid_discovery_mode(authenticator):
+    """
+    Test that an unknown discovery mode raises MovieFetcherException
+    """
+    with pytest.raises(MovieFetcherException, match=r".*unknown discovery mode.*"):
+        MovieFetcher(authenticator, discovery="ternary")
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+@mock.patch("requests.Session.get", side_effect=mocked_fetch_success_with_search_term)
+def test_fetch_uses_page_cache(mock_get, mock_post, authenticator, tmp_path):
+    """
+    Test that a repeated query reads the existing pages from the page cache
+    """
+    page_cache = PageCache(str(tmp_path / "pages.sqlite3"))
+    fetcher = MovieFetcher(authenticator, page_cache=page_cache)
+    first = fetcher.fetch_movies(Arguments([1940], "test", False))
+    requests_sent = mock_get.call_count
+
+    second = fetcher.fetch_movies(Arguments([1940], "star", False))
+    assert first[1940].count == 6
+    assert second[1940].count == 3
+    # only the failing probes of the discovery go to the server again
+    fetched_pages = [call.args[0] for call in mock_get.call_args_list[requests_sent:]]
+    assert all(not url.endswith(("/1", "/2", "/3")) for url in fetched_pages)
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+@mock.patch("requests.Session.get", side_effect=mocked_fetch_success_with_search_term)
+def test_failing_stores_are_disabled(mock_get, mock_post, authenticator, tmp_path):
+    """
+    Test that a page cache and page hints that cannot be written, such as on a full disk,
+    are dropped with a warning and the search goes on without them
+    """
+    page_cache = PageCache(str(tmp_path / "pages.sqlite3"))
+    page_hints = PageHints(str(tmp_path / "hints.sqlite3"))
+    fetcher = MovieFetcher(authenticator, page_cache=page_cache, page_hints=page_hints)
+    full = sqlite3.OperationalError("database or disk is full")
+    with mock.patch.object(PageCache, "put", side_effect=full), mock.patch.object(
+        PageHints, "put", side_effect=full
+    ):
+        assert fetcher.fetch_movies(Arguments([1940], "star", False))[1940].count == 3
+    assert fetcher.page_cache is None and fetcher.page_hints is None
+    page_cache.close()
+    page_hints.close()
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+@mock.patch("requests.Session.get", side_effect=mocked_fetch_success_with_search_term)
+def test_iter_matches(mock_get, mock_post, fetcher, years):
+    """
+    Test that the matches are streamed page by page and summarized per year
+    """
+    summary = {}
+    pages = list(fetcher.iter_matches(Arguments(years, "star", False), summary))
+    assert sorted((year, page) for year, page, _ in pages) == [
+        (1940, 1),
+        (1940, 2),
+        (1940, 3),
+        (1950, 1),
+        (1950, 2),
+        (1950, 3),
+    ]
+    assert all(titles == ["star"] for _, _, titles in pages)
+    assert summary == {
+        1940: YearResult(3, pages_fetched=3),
+        1950: YearResult(3, pages_fetched=3),
+    }
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+@mock.patch("requests.Session.get", side_effect=mocked_fetch_success_with_search_term)
+def test_count_only_keeps_no_titles(mock_get, mock_post, fetcher, years):
+    """
+    Test that count only with a search term counts the matches without keeping the titles
+    """
+    fetch_response = fetcher.fetch_movies(Arguments(years, "test", True))
+    assert fetch_response == {
+        1940: YearResult(6, pages_fetched=3),
+        1950: YearResult(6, pages_fetched=3),
+    }
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+@mock.patch("requests.Session.get", side_effect=mocked_fetch_success_with_search_term)
+def test_search_movies_with_many_terms(mock_get, mock_post, fetcher):
+    """
+    Test that every page is fetched once and reported for every search term
+    """
+    args = Arguments([1940], ["test", "star", "movie1"], False)
+    fetch_response = fetcher.search_movies(args)
+    assert fetch_response["test"][1940].count == 6
+    assert fetch_response["star"][1940].titles == ["star"] * 3
+    assert fetch_response["movie1"][1940].count == 2
+    fetched_pages = [call.args[0] for call in mock_get.call_args_list]
+    assert len(fetched_pages) == len(set(fetched_pages))
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+@mock.patch("requests.Session.get", side_effect=mocked_fetch_success_with_search_term)
+def test_search_movies_with_regex_count_only(mock_get, mock_post, fetcher):
+    """
+    Test that regex patterns are counted per pattern with count only
+    """
+    args = Arguments([1940], [r"^test$", r"movie[12]"], True, regex=True)
+    fetch_response = fetcher.search_movies(args)
+    assert fetch_response == {
+        r"^test$": {1940: YearResult(3, pages_fetched=3)},
+        r"movie[12]": {1940: YearResult(4, pages_fetched=3)},
+    }
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+@mock.patch("requests.Session.get", side_effect=mocked_fetch_flaky(2))
+def test_transient_failures_are_retried(mock_get, mock_post, authenticator):
+    """
+    Test that 503 answers are retried until the page succeeds
+    """
+    fetcher = MovieFetcher(
+        authenticator, retry_policy=RetryPolicy(max_retries=2, base_delay=0)
+    )
+    args = Arguments([1940], "", False)
+    assert fetcher.fetch_movies(args)[1940] == YearResult(22, pages_fetched=3)
+    assert fetcher.retry_stats.pages_given_up == 0
+    assert fetcher.retry_stats.pages_retried > 0
+    assert fetcher.retry_stats.retries == 2 * fetcher.retry_stats.pages_retried
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+@mock.patch("requests.Session.get", side_effect=mocked_fetch_flaky(3))
+def test_persistent_failures_are_given_up(mock_get, mock_post, authenticator):
+    """
+    Test that a page still failing after the last retry fails its year
+    """
+    fetcher = MovieFetcher(
+        authenticator, retry_policy=RetryPolicy(max_retries=2, base_delay=0)
+    )
+    args = Arguments([1940], "", False)
+    assert fetcher.fetch_movies(args)[1940].failed
+    assert fetcher.retry_stats.pages_given_up > 0
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+def test_failed_page_is_reported_in_the_year_result(mock_post, authenticator):
+    """
+    Test that a page given up after discovery leaves a partial result instead of a failed year
+    """
+    fetcher = MovieFetcher(
+        authenticator, retry_policy=RetryPolicy(max_retries=1, base_delay=0)
+    )
+    with mock.patch(
+        "requests.Session.get",
+        side_effect=lambda url, **kwargs: (
+            MockFailure({"error": "unavailable"}, 503)
+            if url.endswith("/2")
+            else mocked_fetch_success_with_search_term(url, **kwargs)
+        ),
+    ):
+        result = fetcher.fetch_movies(Arguments([1940], "star", False))[1940]
+    assert not result.failed
+    assert result.partial
+    assert (result.count, result.pages_fetched, result.pages_failed) == (2, 2, 1)
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+def test_forbidden_page_is_not_scanned(mock_post, fetcher):
+    """
+    Test that the error body of a page answered with a non-retryable status is counted as
+    a failed page instead of being scanned as titles
+    """
+    with mock.patch(
+        "requests.Session.get",
+        side_effect=lambda url, **kwargs: (
+            MockFailure({"error": "forbidden"}, 403)
+            if url.endswith("/2")
+            else mocked_fetch_success_with_search_term(url, **kwargs)
+        ),
+    ):
+        result = fetcher.fetch_movies(Arguments([1940], "", False))[1940]
+        titles = fetcher.fetch_movies(Arguments([1940], "e", False))[1940]
+    # the count of a search without term does not read page 2
+    assert result.count == 23
+    assert titles.partial and "error" not in titles.titles
+    assert (titles.pages_fetched, titles.pages_failed) == (2, 1)
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+def test_rejected_token_is_renewed_once(mock_post, fetcher):
+    """
+    Test that a page answered with 401 is requested again with a new token
+    """
+    answers = iter([mocked_fetch_auth_failure()])
+    with mock.patch(
+        "requests.Session.get",
+        side_effect=lambda url, **kwargs: next(
+            answers, mocked_fetch_success(url, **kwargs)
+        ),
+    ):
+        assert fetcher.fetch(1, 1940).status_code == 200
+    assert mock_post.call_count == 2
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+@mock.patch(
+    "requests.Session.get",
+    side_effect=mocked_fetch_flaky(1, mocked_fetch_success_with_search_term),
+)
+def test_metrics_by_phase(mock_get, mock_post, authenticator):
+    """
+    Test that auth, probe and fetch requests and retries are recorded separately
+    """
+    fetcher = MovieFetcher(authenticator, retry_policy=RetryPolicy(base_delay=0))
+    assert fetcher.fetch_movies(Arguments([1940], "movie", False))[1940] is not None
+    phases = fetcher.metrics.snapshot()["phases"]
+    assert phases["auth"]["requests"] == {"200": 1}
+    assert phases["probe"]["requests"]["404"] > 0
+    # page 3 is kept from the probes, pages 1 and 2 are fetched
+    assert phases["fetch"]["requests"] == {"200": 2, "503": 2}
+    assert phases["fetch"]["retries"] == 2
+    assert phases["fetch"]["bytes"] > 0
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+@mock.patch("requests.Session.get", side_effect=mocked_fetch_success_with_search_term)
+def test_search_batch_fetches_each_page_once(mock_get, mock_post, fetcher):
+    """
+    Test that overlapping queries share their page fetches and get the results of
+    separate searches
+    """
+    queries = [
+        Arguments([1940, 1950], "star", False),
+        Arguments([1940], ["movie1", "star"], True),
+        Arguments([1950], [r"^test$"], False, regex=True),
+    ]
+    pages = []
+    results = fetcher.search_batch(
+        queries, lambda query, year, page, matches: pages.append((query, year, page))
+    )
+    fetched_pages = [call.args[0] for call in mock_get.call_args_list]
+    assert len(fetched_pages) == len(set(fetched_pages))
+
+    for query, result in zip(queries, results):
+        assert result == fetcher.search_movies(query)
+    assert (1, 1940, 1) in pages
+    assert not [page for page in pages if page[0] == 1 and page[1] == 1950]
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+@mock.patch("requests.Session.get", side_effect=mocked_fetch_success)
+def test_page_hint_skips_discovery(mock_get, mock_post, authenticator, tmp_path):
+    """
+    Test that the page count found by a run is checked with two probes by the next one
+    """
+    page_hints = PageHints(str(tmp_path / "hints.sqlite3"))
+    fetcher = MovieFetcher(authenticator, page_hints=page_hints)
+    args = Arguments([1940], "", True)
+    assert fetcher.fetch_movies(args) == {1940: YearResult(22, pages_fetched=3)}
+    assert page_hints.get(BASE_URL, 1940) == 4
+
+    mock_get.reset_mock()
+    assert fetcher.fetch_movies(args) == {1940: YearResult(22, pages_fetched=3)}
+    fetched_pages = sorted(call.args[0] for call in mock_get.call_args_list)
+    assert [url.rsplit("/", 1)[-1] for url in fetched_pages] == ["3", "4"]
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+@mock.patch("requests.Session.get", side_effect=mocked_fetch_success)
+def test_page_hint_checks_share_the_probe_threads(
+    mock_get, mock_post, authenticator, tmp_path
+):
+    """
+    Test that the hint checks of every year and run reuse one pool of probe threads,
+    stopped when the fetcher is closed
+    """
+    page_hints = PageHints(str(tmp_path / "hints.sqlite3"))
+    for year in (1940, 1950, 1960):
+        page_hints.put(BASE_URL, year, 4)
+    fetcher = MovieFetcher(authenticator, page_hints=page_hints)
+    args = Arguments([1940, 1950, 1960], "", True)
+    with mock.patch(
+        "concurrent.futures.ThreadPoolExecutor",
+        wraps=concurrent.futures.ThreadPoolExecutor,
+    ) as executor:
+        fetcher.fetch_movies(args)
+        fetcher.fetch_movies(args)
+    probe_pools = [
+        call
+        for call in executor.call_args_list
+        if call.kwargs.get("thread_name_prefix") == "probe"
+    ]
+    assert len(probe_pools) == 1
+    fetcher.close()
+    assert fetcher._probe_executor is None
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+@mock.patch(
+    "requests.Session.get", side_effect=mocked_fetch_success_for_pages_more_than_100
+)
+def test_stale_page_hint_falls_back_to_discovery(
+    mock_get, mock_post, authenticator, tmp_path
+):
+    """
+    Test that a page count that no longer holds is searched again and replaced
+    """
+    page_hints = PageHints(str(tmp_path / "hints.sqlite3"))
+    page_hints.put(BASE_URL, 1940, 4)
+    fetcher = MovieFetcher(authenticator, page_hints=page_hints)
+    assert fetcher.find_lowest_failing_page_for_year(1940) == 102
+    assert fetcher.discover_pages(1940)[0] == 102
+    assert page_hints.get(BASE_URL, 1940) == 102
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+@mock.patch("requests.Session.get", side_effect=mocked_fetch_success_with_search_term)
+def test_pages_without_match_are_not_decoded(mock_get, mock_post, authenticator):
+    """
+    Test that the fetched pages whose raw body holds no search term are never decoded
+    """
+    decoder = PageDecoder()
+    decoder.decode = mock.Mock(wraps=decoder.decode)
+    fetcher = MovieFetcher(authenticator, decoder=decoder)
+
+    assert fetcher.fetch_movies(Arguments([1940], "zzz", False))[1940].count == 0
+    skipped = decoder.decode.call_count
+    decoder.decode.reset_mock()
+    assert fetcher.fetch_movies(Arguments([1940], "star", False))[1940].count == 3
+    # pages 1 and 2 are fetched after the discovery, page 3 is decoded by the probe
+    assert decoder.decode.call_count == skipped + 2
+
+
+def stalled_first_request(stall):
+    """
+    Returns a fetch mock stalling the first request of every page, the next ones answer at once
+    """
+    seen = set()
+    lock = threading.Lock()
+
+    def fetch(url, **kwargs):
+        with lock:
+            first = url not in seen
+            seen.add(url)
+        if first:
+            time.sleep(stall)
+        return mocked_fetch_success(url, **kwargs)
+
+    return fetch
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+@mock.patch("requests.Session.get", side_effect=stalled_first_request(0.5))
+def test_slow_request_is_hedged(mock_get, mock_post, authenticator):
+    """
+    Test that a request slower than the hedge delay is duplicated and the duplicate wins
+    """
+    policy = HedgePolicy(max_ratio=1, min_samples=1)
+    policy.record(0.001)
+    fetcher = MovieFetcher(authenticator, hedge_policy=policy)
+    start = time.monotonic()
+    assert fetcher.fetch(1, 1940).status_code == 200
+    assert time.monotonic() - start < 0.4
+    assert mock_get.call_count == 2
+    assert (fetcher.hedge_stats.hedges, fetcher.hedge_stats.wins) == (1, 1)
+    fetcher.close()
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+@mock.patch("requests.Session.get", side_effect=stalled_first_request(0.1))
+def test_hedges_are_capped_by_the_budget(mock_get, mock_post, authenticator):
+    """
+    Test that a slow request waits for its own answer once the hedge budget is spent
+    """
+    policy = HedgePolicy(max_ratio=0, min_samples=1)
+    policy.record(0.001)
+    fetcher = MovieFetcher(authenticator, hedge_policy=policy)
+    assert fetcher.fetch(1, 1940).status_code == 200
+    assert mock_get.call_count == 1
+    assert (fetcher.hedge_stats.hedges, fetcher.hedge_stats.denied) == (0, 1)
+    fetcher.close()
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+@mock.patch("requests.Session.get", side_effect=stalled_first_request(0.5))
+def test_stalled_request_waits_for_the_budget(mock_get, mock_post, authenticator):
+    """
+    Test that a stalled request refused by the budget is hedged once the budget grows,
+    and is counted once, as a delayed hedge
+    """
+    policy = HedgePolicy(max_ratio=0.5, min_samples=1)
+    policy.record(0.001)
+    fetcher = MovieFetcher(authenticator, hedge_policy=policy)
+    timer = threading.Timer(0.1, policy.start)
+    timer.start()
+    assert fetcher.fetch(1, 1940).status_code == 200
+    timer.join()
+    assert mock_get.call_count == 2
+    stats = fetcher.hedge_stats
+    assert (stats.hedges, stats.delayed, stats.wins, stats.denied) == (1, 1, 1, 0)
+    fetcher.close()
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+@mock.patch("requests.Session.get", side_effect=mocked_fetch_success_with_search_term)
+def test_run_is_traced(mock_get, mock_post):
+    """
+    Test that the discovery, requests, decoding, scanning and years of a run are traced
+    """
+    tracer = Tracer()
+    auth = Authenticator(DEFAULT_USERNAME, DEFAULT_PASSWORD, BASE_URL, tracer=tracer)
+    fetcher = MovieFetcher(auth, tracer=tracer)
+    assert fetcher.fetch_movies(Arguments([1940], "star", False))[1940].count == 3
+    categories = {span.category for span in tracer.spans}
+    assert categories == {"discovery", "request", "decode", "scan"}
+    requests = [span for span in tracer.spans if span.category == "request"]
+    assert {span.name for span in requests} == {"auth", "probe", "fetch"}
+    assert all("status" in span.args for span in requests)
+    assert [span.name for span in tracer.async_spans] == ["year 1940"]
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+@mock.patch("requests.Session.get", side_effect=mocked_fetch_success_with_search_term)
+def test_search_resumes_from_checkpoint(mock_get, mock_post, fetcher, tmp_path):
+    """
+    Test that a resumed search fetches only the pages missing from the checkpoint
+    """
+    args = Arguments([1940], "star", False)
+    path = str(tmp_path / "run.jsonl")
+    checkpoint = Checkpoint(path, "key")
+    first = fetcher.fetch_movies(args, checkpoint)
+    checkpoint.close()
+    requests_sent = mock_get.call_count
+
+    # drop the last page of the run, as if it crashed before recording it
+    lines = open(path).read().splitlines()
+    units = json.loads(lines[-1])
+    with open(path, "w") as f:
+        f.write("\n".join(lines[:-1] + [json.dumps(units[:-1])]) + "\n")
+
+    mock_get.reset_mock()
+    resumed = Checkpoint(path, "key", resume=True)
+    assert fetcher.fetch_movies(args, resumed) == first
+    assert mock_get.call_count == 1 < requests_sent
+    resumed.close()
+
+
+def mocked_fetch_300_pages(url, **kwargs):
+    """
+    Mocked response of a year of 300 pages, page p has p % 3 "star" titles
+    """
+    page = int(url.rstrip("/").split("/")[-1])
+    if page > 300:
+        return MockFailure({"error": r"*.not found.*"}, 404)
+    return MockSuccess(
+        [f"star {i}" for i in range(page % 3)] + ["movie"] * (10 - page % 3), 200
+    )
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+@mock.patch("requests.Session.get", side_effect=mocked_fetch_300_pages)
+def test_estimate_movies_from_a_sample(mock_get, mock_post, fetcher):
+    """
+    Test that an estimate reads a sample of the pages and its interval covers the count
+    """
+    args = Arguments([1940], "star", True)
+    result = fetcher.estimate_movies(args, PageSampler(fraction=0.2, seed=0))["star"][
+        1940
+    ]
+    assert result.approximate and not result.failed
+    low, high = result.interval
+    assert low <= 300 <= high
+    assert result.pages_fetched < 100
+    assert mock_get.call_count < 120
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+@mock.patch("requests.Session.get", side_effect=mocked_fetch_success_with_search_term)
+def test_estimate_of_a_small_year_is_exact(mock_get, mock_post, fetcher):
+    """
+    Test that a year with fewer pages than the minimum sample is counted exactly
+    """
+    args = Arguments([1940], "star", True)
+    result = fetcher.estimate_movies(args, PageSampler())["star"][1940]
+    assert result.count == 3 and not result.approximate
@@ -0,0 +1,79 @@
+import json
+import random
+
+import pytest
+
+from client_app_cli.fetcher.page_decoder import PARSERS, BytePrefilter, PageDecoder
+
+TITLES = ["Star Dust", "Lone Star Raiders", "The Thin Man", "Ça Ira", "İstanbul"]
+
+
+def body(titles, ensure_ascii=False):
+    """
+    returns the raw body of a page holding the given titles
+    """
+    return json.dumps(titles, ensure_ascii=ensure_ascii).encode()
+
+
+@pytest.mark.parametrize("parser", sorted(PARSERS))
+def test_decoders_agree(parser):
+    """
+    Test that every installed parser decodes pages like the standard library
+    """
+    decoder = PageDecoder(parser)
+    assert decoder.parser == parser
+    assert decoder.decode(body(TITLES)) == TITLES
+    assert decoder.decode(body(TITLES, ensure_ascii=True)) == TITLES
+
+
+def test_auto_decoder_prefers_orjson():
+    """
+    Test that auto picks orjson when it is installed and rejects unknown parsers
+    """
+    expected = "orjson" if "orjson" in PARSERS else "json"
+    assert PageDecoder().parser == expected
+    with pytest.raises(ValueError, match=r".*not installed.*"):
+        PageDecoder("simdjson")
+
+
+def test_prefilter_skips_pages_without_match():
+    """
+    Test that a page is only skipped when none of its titles holds a term
+    """
+    prefilter = BytePrefilter(["star", "MAN"])
+    assert prefilter.may_match(body(["Lone STAR Raiders"]))
+    assert prefilter.may_match(body(["The Thin Man"]))
+    assert not prefilter.may_match(body(["Ça Ira", "Moonstruck"]))
+
+
+def test_prefilter_never_skips_when_unsure():
+    """
+    Test that escaped bodies, characters lowering to ASCII, regex and empty or
+    escapable terms are never skipped
+    """
+    assert BytePrefilter(["ist"]).may_match(body(["İstanbul"]))
+    assert BytePrefilter(["kelvin"]).may_match(body(["Kelvin"]))
+    assert BytePrefilter(["ist"]).may_match(body(["İstanbul"], ensure_ascii=True))
+    assert BytePrefilter(["zzz"]).may_match(body(["Ça Ira"], ensure_ascii=True))
+    assert BytePrefilter(["ac/dc"]).may_match(body(["Moonstruck"]))
+    assert BytePrefilter(["", "zzz"]).may_match(body(["Moonstruck"]))
+    assert BytePrefilter(["zzz"], regex=True).may_match(body(["Moonstruck"]))
+    assert not BytePrefilter(["ist"]).may_match(body(["Ça Ira"]))
+
+
+def test_prefilter_has_no_false_negative():
+    """
+    Test on random titles that a skipped page never holds a match
+    """
+    rng = random.Random(0)
+    alphabet = 'abkiKI İKİé"\\/\t'
+    for _ in range(2000):
+        titles = [
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 6)))
+            for _ in range(rng.randint(0, 3))
+        ]
+        term = "".join(rng.choice("abki K/") for _ in range(rng.randint(1, 2)))
+        matches = any(term.lower() in title.lower() for title in titles)
+        for ensure_ascii in (False, True):
+            page = body(titles, ensure_ascii)
+            assert BytePrefilter([term]).may_match(page) or not matches
@@ -0,0 +1,74 @@
+import threading
+import time
+
+import pytest
+
+from client_app_cli.fetcher.page_scheduler import PageScheduler
+
+
+def test_invalid_max_workers():
+    """
+    Test that a non-positive number of workers raises ValueError
+    """
+    with pytest.raises(ValueError, match=r".*max_workers must be a positive integer.*"):
+        PageScheduler(0)
+
+
+def test_longest_first_orders_years_by_page_count():
+    """
+    Test that the pages of the year with the most pages are scheduled first
+    """
+    order = list(PageScheduler.longest_first({1940: 1, 1950: 3, 1960: 2}))
+    assert order == [
+        (1950, 1),
+        (1950, 2),
+        (1950, 3),
+        (1960, 1),
+        (1960, 2),
+        (1940, 1),
+    ]
+
+
+def test_run_keeps_in_flight_window_bounded():
+    """
+    Test that no more than `window` tasks are pulled from the task iterable before completing
+    """
+    lock = threading.Lock()
+    pending = 0
+    max_pending = 0
+
+    def task():
+        nonlocal pending
+        time.sleep(0.001)
+        with lock:
+            pending -= 1
+
+    def tasks():
+        nonlocal pending, max_pending
+        for i in range(50):
+            with lock:
+                pending += 1
+                max_pending = max(max_pending, pending)
+            yield i, task
+
+    with PageScheduler(max_workers=2, window=3) as scheduler:
+        keys = [key for key, _ in scheduler.run(tasks())]
+
+    assert sorted(keys) == list(range(50))
+    assert max_pending <= 3
+
+
+def test_run_reports_task_exceptions_on_future():
+    """
+    Test that a failing task does not stop the other tasks
+    """
+
+    def fail():
+        raise RuntimeError("boom")
+
+    with PageScheduler(max_workers=2) as scheduler:
+        results = dict(scheduler.run([("ok", lambda: 1), ("fail", fail)]))
+
+    assert results["ok"].result() == 1
+    with pytest.raises(RuntimeError, match="boom"):
+        results["fail"].result()
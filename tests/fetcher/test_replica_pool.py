@@ -0,0 +1,149 @@
+from unittest import mock
+
+import pytest
+
+from client_app_cli.arguments.arguments import Arguments
+from client_app_cli.auth.authenticator import Authenticator
+from client_app_cli.constants.constant import (
+    BALANCE_LEAST,
+    DEFAULT_USERNAME,
+    DEFAULT_PASSWORD,
+)
+from client_app_cli.exceptions.exceptions import MovieFetcherException
+from client_app_cli.fetcher.movie_fetcher import MovieFetcher
+from client_app_cli.fetcher.replica_pool import ReplicaPool
+from client_app_cli.fetcher.retry import RetryPolicy
+from tests.mocks import (
+    MockFailure,
+    MockSuccess,
+    mocked_fetch_success_with_search_term,
+)
+
+REPLICA_URLS = ["http://replica-a:8080/", "http://replica-b:8080/"]
+
+
+def authenticators(urls=REPLICA_URLS):
+    """
+    returns one Authenticator per replica URL
+    """
+    return [Authenticator(DEFAULT_USERNAME, DEFAULT_PASSWORD, url) for url in urls]
+
+
+def mocked_auth_per_replica(url, **kwargs):
+    """
+    Mocked authentication issuing a token naming the replica
+    """
+    return MockSuccess({"bearer": url.split("/")[2], "timeout": 60}, 200)
+
+
+def test_least_outstanding_replica_is_chosen():
+    """
+    Test that the replica with the fewest requests in flight is chosen, idle ones taking turns
+    """
+    pool = ReplicaPool(authenticators(REPLICA_URLS + ["http://c/"]), BALANCE_LEAST)
+    first, second, third = pool.acquire(), pool.acquire(), pool.acquire()
+    assert len({first.base_url, second.base_url, third.base_url}) == 3
+    pool.release(second, failed=False)
+    assert pool.acquire() is second
+
+
+def test_two_choices_avoid_the_busy_replica():
+    """
+    Test that with two replicas the power of two choices picks the idle one
+    """
+    pool = ReplicaPool(authenticators())
+    busy = pool.acquire()
+    for _ in range(5):
+        idle = pool.acquire()
+        assert idle is not busy
+        pool.release(idle, failed=False)
+
+
+def test_failing_replica_is_ejected_for_a_while():
+    """
+    Test that consecutive failures eject a replica, which comes back after eject_seconds
+    """
+    pool = ReplicaPool(authenticators(), BALANCE_LEAST, eject_after=2)
+    failing, healthy = pool.replicas
+    with mock.patch("time.monotonic", return_value=100.0):
+        for _ in range(2):
+            failing.outstanding += 1
+            pool.release(failing, failed=True)
+        assert failing.ejections == 1
+        assert all(pool.acquire() is healthy for _ in range(3))
+    with mock.patch("time.monotonic", return_value=111.0):
+        assert pool.acquire() is failing
+
+
+def test_success_resets_the_failures():
+    """
+    Test that only consecutive failures eject a replica, and never the last one
+    """
+    pool = ReplicaPool(authenticators(), eject_after=2)
+    replica = pool.replicas[0]
+    for failed in (True, False, True):
+        replica.outstanding += 1
+        pool.release(replica, failed)
+    assert replica.ejections == 0
+    single = ReplicaPool(authenticators(REPLICA_URLS[:1]), eject_after=1)
+    for _ in range(3):
+        single.release(single.acquire(), failed=True)
+    assert single.replicas[0].ejections == 0
+
+
+def test_invalid_replica_pool():
+    """
+    Test that an empty pool or an unknown policy raises MovieFetcherException
+    """
+    with pytest.raises(MovieFetcherException):
+        ReplicaPool([])
+    with pytest.raises(MovieFetcherException, match=r".*unknown balance policy.*"):
+        ReplicaPool(authenticators(), "random")
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_per_replica)
+@mock.patch("requests.Session.get", side_effect=mocked_fetch_success_with_search_term)
+def test_pages_are_spread_with_one_token_per_replica(mock_get, mock_post):
+    """
+    Test that page requests go to every replica, each with the token it issued
+    """
+    auths = authenticators()
+    fetcher = MovieFetcher(auths[0], replicas=ReplicaPool(auths))
+    result = fetcher.fetch_movies(Arguments([1940], "star", False))[1940]
+    assert result.count == 3
+    assert sorted(call.args[0] for call in mock_post.call_args_list) == [
+        url + "api/auth" for url in REPLICA_URLS
+    ]
+    hosts = set()
+    for call in mock_get.call_args_list:
+        host = call.args[0].split("/")[2]
+        assert call.kwargs["headers"]["Authorization"] == f"Bearer {host}"
+        hosts.add(host)
+    assert hosts == {"replica-a:8080", "replica-b:8080"}
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_per_replica)
+def test_failing_replica_is_avoided(mock_post):
+    """
+    Test that pages are still fetched while one replica answers every request with 503
+    """
+    auths = authenticators()
+    fetcher = MovieFetcher(
+        auths[0],
+        retry_policy=RetryPolicy(base_delay=0),
+        replicas=ReplicaPool(auths, BALANCE_LEAST, eject_after=1),
+    )
+    with mock.patch(
+        "requests.Session.get",
+        side_effect=lambda url, **kwargs: (
+            MockFailure({"error": "unavailable"}, 503)
+            if "replica-a" in url
+            else mocked_fetch_success_with_search_term(url, **kwargs)
+        ),
+    ):
+        result = fetcher.fetch_movies(Arguments([1940], "star", False))[1940]
+    assert not result.failed and not result.partial
+    assert result.count == 3
+    failing, healthy = fetcher.replicas.replicas
+    assert failing.ejections == 1
+    assert failing.requests == 1
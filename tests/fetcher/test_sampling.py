@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+from client_app_cli.fetcher.sampling import PageSampler
+
+
+def sample(sampler, truth, probed=None):
+    """
+    Run the sampler over years whose pages match truth[year][page - 1] movies
+    :return: pages read per year
+    """
+    probed = probed or {}
+    reads = {year: 0 for year in truth}
+    for year, page in sampler.order(
+        {year: len(pages) for year, pages in truth.items()}, probed
+    ):
+        reads[year] += 1
+        sampler.add(year, page, [truth[year][page - 1]])
+    return reads
+
+
+@pytest.fixture()
+def truth():
+    """
+    returns the matches of every page of two years, one of them much smaller
+    """
+    rng = random.Random(1)
+    return {
+        1940: [rng.choice([0, 0, 1, 2, 5]) for _ in range(2000)],
+        1950: [rng.choice([0, 1]) for _ in range(20)],
+    }
+
+
+def test_sample_of_every_page_is_exact(truth):
+    """
+    Test that a year read in full is counted exactly, with an empty interval
+    """
+    sampler = PageSampler(fraction=1, seed=0)
+    reads = sample(sampler, truth)
+    assert reads == {1940: 2000, 1950: 20}
+    for year, pages in truth.items():
+        assert sampler.estimate(year, 0) == (sum(pages),) * 3
+
+
+def test_early_stop_reads_fewer_pages(truth):
+    """
+    Test that a year stops at the target error, with an interval covering the truth
+    """
+    sampler = PageSampler(max_error=0.1, seed=0)
+    reads = sample(sampler, truth)
+    assert reads[1940] < 1000
+    # a year smaller than the minimum sample is read in full
+    assert reads[1950] == 20
+    estimate, low, high = sampler.estimate(1940, 0)
+    assert low <= sum(truth[1940]) <= high
+    assert high - low <= 0.2 * estimate
+
+
+def test_fraction_reads_a_fixed_share_of_the_pages(truth):
+    """
+    Test that a fixed fraction reads that share of the unprobed pages of every year
+    """
+    sampler = PageSampler(fraction=0.1, seed=0)
+    reads = sample(sampler, truth, probed={1940: {1: [], 2000: []}})
+    # the 2 probed pages and 10% of the 1998 others
+    assert reads == {1940: 2 + 200, 1950: 2}
+
+
+def test_probed_pages_are_counted_exactly():
+    """
+    Test that pages read by the discovery are not part of the sampled population
+    """
+    sampler = PageSampler(fraction=0.5, seed=0)
+    truth = {1940: [10, 0, 0, 3]}
+    sample(sampler, truth, probed={1940: {1: [], 4: []}})
+    # both unprobed pages are empty, whichever one is sampled
+    estimate, low, high = sampler.estimate(1940, 0)
+    assert estimate == 13 and low == 13
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"max_error": 0}, {"fraction": 0}, {"fraction": 1.5}, {"confidence": 1}],
+)
+def test_invalid_parameters(kwargs):
+    """
+    Test that out of range parameters are rejected
+    """
+    with pytest.raises(ValueError):
+        PageSampler(**kwargs)
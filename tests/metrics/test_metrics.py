@@ -0,0 +1,102 @@
+import json
+
+import pytest
+
+from client_app_cli.metrics.metrics import LatencyHistogram, Metrics
+
+
+def test_histogram_percentiles():
+    """
+    Test that percentiles are estimated within one bucket of the true value
+    """
+    histogram = LatencyHistogram()
+    for i in range(1, 101):
+        histogram.observe(i / 1000)
+    assert histogram.count == 100
+    assert histogram.percentile(0.50) == pytest.approx(0.050, rel=0.25)
+    assert histogram.percentile(0.95) == pytest.approx(0.095, rel=0.25)
+    assert histogram.percentile(0.99) <= histogram.max == 0.1
+
+
+def test_histogram_without_observations():
+    """
+    Test that an empty histogram reports zero latencies
+    """
+    assert LatencyHistogram().percentile(0.99) == 0.0
+
+
+def test_histogram_above_highest_bound():
+    """
+    Test that latencies above the highest bucket are capped at the observed maximum
+    """
+    histogram = LatencyHistogram()
+    histogram.observe(500.0)
+    assert histogram.percentile(0.5) <= 500.0
+
+
+def test_snapshot():
+    """
+    Test that requests are summarized by phase and status
+    """
+    metrics = Metrics()
+    metrics.record_request("auth", 200, 0.01, 31)
+    metrics.record_request("probe", 200, 0.02, 100)
+    metrics.record_request("probe", 404, 0.02, 20)
+    metrics.record_request("fetch", None, 1.0)
+    metrics.record_retry("fetch")
+    metrics.record_cache(True)
+    metrics.record_cache(False)
+    metrics.record_connections(2, 5)
+
+    snapshot = metrics.snapshot()
+    assert snapshot["auth_calls"] == 1
+    assert snapshot["cache"] == {"hits": 1, "misses": 1}
+    assert snapshot["connections"] == {"opened": 2, "reused": 5}
+    assert snapshot["phases"]["probe"]["requests"] == {"200": 1, "404": 1}
+    assert snapshot["phases"]["probe"]["bytes"] == 120
+    assert snapshot["phases"]["fetch"]["requests"] == {"error": 1}
+    assert snapshot["phases"]["fetch"]["retries"] == 1
+    assert snapshot["phases"]["probe"]["latency_seconds"]["count"] == 2
+
+
+def test_prometheus_format():
+    """
+    Test that the Prometheus dump holds counters and a cumulative histogram
+    """
+    metrics = Metrics()
+    metrics.record_request("fetch", 200, 0.01, 10)
+    metrics.record_request("fetch", 200, 0.5, 10)
+    metrics.record_connections(1, 1)
+    text = metrics.to_prometheus()
+    assert 'movie_client_requests_total{phase="fetch",status="200"} 2' in text
+    assert 'movie_client_response_bytes_total{phase="fetch"} 20' in text
+    assert 'movie_client_connections_total{state="reused"} 1' in text
+    assert (
+        'movie_client_request_duration_seconds_bucket{phase="fetch",le="+Inf"} 2'
+        in text
+    )
+    assert 'movie_client_request_duration_seconds_count{phase="fetch"} 2' in text
+    bucket_counts = [
+        int(line.rsplit(" ", 1)[1])
+        for line in text.splitlines()
+        if line.startswith("movie_client_request_duration_seconds_bucket")
+    ]
+    assert bucket_counts == sorted(bucket_counts)
+
+
+@pytest.mark.parametrize("fmt", ["json", "prometheus"])
+def test_dump(fmt, tmp_path):
+    """
+    Test that the dump replaces the file and leaves no temporary file behind
+    """
+    path = tmp_path / f"metrics.{fmt}"
+    path.write_text("old")
+    metrics = Metrics()
+    metrics.record_request("auth", 200, 0.01)
+    metrics.dump(str(path), fmt)
+    content = path.read_text()
+    if fmt == "json":
+        assert json.loads(content)["auth_calls"] == 1
+    else:
+        assert content.startswith("# HELP")
+    assert [p.name for p in tmp_path.iterdir()] == [path.name]
@@ -1,3 +1,9 @@
+import json
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
 class MockSuccess:
     """
     Mocked response for successful operations
@@ -10,6 +16,10 @@ class MockSuccess:
     def json(self):
         return self.json_data
 
+    @property
+    def content(self):
+        return json.dumps(self.json_data).encode()
+
 
 class MockFailure(MockSuccess):
     """
@@ -19,6 +29,19 @@ class MockFailure(MockSuccess):
     pass
 
 
+class MockRawFailure(MockFailure):
+    """
+    Mocked failure whose body is not JSON, such as the error page of a proxy
+    """
+
+    def json(self):
+        raise ValueError("not a JSON body")
+
+    @property
+    def content(self):
+        return self.json_data
+
+
 def mocked_auth_success(*args, **kwargs):
     """
     Mocked response for successful authentication
@@ -27,6 +50,14 @@ def mocked_auth_success(*args, **kwargs):
     return MockSuccess({"bearer": 1234, "timeout": 10}, 200)
 
 
+def mocked_auth_short_lived(*args, **kwargs):
+    """
+    Mocked response for successful authentication with a token valid for 0.1 seconds
+    """
+
+    return MockSuccess({"bearer": 1234, "timeout": 0.1}, 200)
+
+
 def mocked_auth_failure(*args, **kwargs):
     """
     Mocked response for failed authentication
@@ -128,3 +159,61 @@ def mocked_fetch_exception_failure(*args, **kwargs):
     """
 
     return MockFailure(None, 401)
+
+
+@contextmanager
+def mock_movie_server(auth_handler=mocked_auth_success, fetch_handler=None):
+    """
+    Runs a local keep-alive HTTP server that answers auth POSTs and movie GETs with the given
+    mocked responses and yields its base URL
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def _respond(self, handler):
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            mocked = handler(self.path)
+            body = mocked.content
+            self.send_response(mocked.status_code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            self._respond(auth_handler)
+
+        def do_GET(self):
+            self._respond(fetch_handler or mocked_fetch_success)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def mocked_fetch_flaky(fail_times, handler=mocked_fetch_success):
+    """
+    Returns a fetch mock answering 503 for the first fail_times requests of every page,
+    then behaving like the given handler
+    """
+    attempts: dict[str, int] = {}
+    lock = threading.Lock()
+
+    def fetch(url, **kwargs):
+        with lock:
+            attempts[url] = attempts.get(url, 0) + 1
+            if attempts[url] <= fail_times:
+                return MockFailure({"error": "unavailable"}, 503)
+        return handler(url, **kwargs)
+
+    return fetch
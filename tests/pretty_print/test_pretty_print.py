@@ -0,0 +1,108 @@
+import io
+import json
+
+import pytest
+
+from client_app_cli.arguments.arguments import Arguments
+from client_app_cli.pretty_print.pretty_print import (
+    CsvSink,
+    NdjsonSink,
+    PrettyPrinter,
+    ResultSink,
+    TextSink,
+)
+from client_app_cli.results.year_result import YearResult
+
+SUMMARY = {1940: YearResult(2, pages_fetched=1), 1950: YearResult(error="not found")}
+
+
+def test_sink_factory():
+    """
+    Test that the sink matching the output format is created
+    """
+    args = Arguments([1940], "star", False)
+    assert isinstance(PrettyPrinter.sink("text", args), TextSink)
+    assert isinstance(PrettyPrinter.sink("ndjson", args), NdjsonSink)
+    assert isinstance(PrettyPrinter.sink("csv", args, io.StringIO()), CsvSink)
+
+
+def test_text_sink():
+    """
+    Test that the text sink writes every match and then the count of each year
+    """
+    stream = io.StringIO()
+    sink = TextSink(Arguments([1940, 1950], "star", False), stream)
+    sink.write(1940, 1, ["Star Dust", "Lone Star Raiders"])
+    assert stream.getvalue() == "1940: Star Dust\n1940: Lone Star Raiders\n"
+    sink.close(SUMMARY)
+    assert "Year 1940 has 2 movies." in stream.getvalue()
+    assert "Failed to fetch movies for year 1950." in stream.getvalue()
+
+
+def test_ndjson_sink():
+    """
+    Test that the NDJSON sink writes one object per page and one per year
+    """
+    stream = io.StringIO()
+    sink = NdjsonSink(Arguments([1940, 1950], "star", False), stream)
+    sink.write(1940, 1, ["Star Dust", "Lone Star Raiders"])
+    sink.write(1940, 2, [])
+    sink.close(SUMMARY)
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert records == [
+        {"year": 1940, "page": 1, "titles": ["Star Dust", "Lone Star Raiders"]},
+        {"year": 1940, "count": 2},
+        {"year": 1950, "error": "not found"},
+    ]
+
+
+def test_csv_sink():
+    """
+    Test that the CSV sink writes one row per match
+    """
+    stream = io.StringIO()
+    sink = CsvSink(Arguments([1940], "star", False), stream)
+    sink.write(1940, 1, ["Star Dust", "Stars, Stripes"])
+    sink.close(SUMMARY)
+    assert stream.getvalue().splitlines() == [
+        "year,page,title",
+        "1940,1,Star Dust",
+        '1940,1,"Stars, Stripes"',
+    ]
+
+
+def test_csv_sink_count_only():
+    """
+    Test that the CSV sink writes one count row per year with count only
+    """
+    stream = io.StringIO()
+    sink = CsvSink(Arguments([1940], "star", True), stream)
+    sink.write(1940, 1, ["Star Dust"])
+    sink.close(SUMMARY)
+    assert stream.getvalue().splitlines() == ["year,count", "1940,2"]
+
+
+def test_estimated_year_line():
+    """
+    Test that an estimated count is printed with its confidence interval
+    """
+    line = PrettyPrinter.year_line(
+        1940, YearResult(120, pages_fetched=40, interval=(100, 140))
+    )
+    assert line == (
+        "Year 1940 has about 120 movies "
+        "(between 100 and 140, estimated from 40 pages)."
+    )
+
+
+def test_incomplete_sink_cannot_be_created():
+    """
+    Test that a sink missing one of the methods fails when created, not while streaming
+    """
+
+    class PagesOnlySink(ResultSink):
+        def write(self, year, page, titles):
+            pass
+
+    with pytest.raises(TypeError, match="close"):
+        PagesOnlySink(Arguments([1940], "star", False))
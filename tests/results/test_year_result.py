@@ -0,0 +1,78 @@
+import tracemalloc
+
+import pytest
+
+from client_app_cli.results.year_result import TitleList, YearResult
+
+
+def test_title_list_behaves_like_a_list():
+    """
+    Test that titles appended page by page read back like a list of strings
+    """
+    titles = TitleList(["Star Dust", ""])
+    titles.extend(["Lone Star Raiders", "Étoile"])
+    titles.extend([])
+    assert len(titles) == 4
+    assert titles[0] == "Star Dust"
+    assert titles[1] == ""
+    assert titles[-1] == "Étoile"
+    assert titles[1:3] == ["", "Lone Star Raiders"]
+    assert list(titles) == ["Star Dust", "", "Lone Star Raiders", "Étoile"]
+    assert titles == ["Star Dust", "", "Lone Star Raiders", "Étoile"]
+    assert repr(titles) == repr(list(titles))
+    with pytest.raises(IndexError):
+        titles[4]
+
+
+def test_title_list_uses_less_memory_than_a_list():
+    """
+    Test that packed titles take a fraction of the memory of one string per title
+    """
+
+    def pages():
+        # fresh strings for every page, like the ones decoded from the responses
+        for page in range(1000):
+            yield [f"Movie {page}-{i}" for i in range(10)]
+
+    tracemalloc.start()
+    plain: list[str] = []
+    for page in pages():
+        plain.extend(page)
+    plain_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    packed = TitleList()
+    for page in pages():
+        packed.extend(page)
+    packed[0]
+    packed_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    assert packed == plain
+    assert packed_bytes * 2 < plain_bytes
+
+
+def test_year_result_round_trip():
+    """
+    Test that a result converted to a dictionary and back is unchanged
+    """
+    result = YearResult(2, TitleList(["a", "b"]), pages_fetched=3, pages_failed=1)
+    assert not hasattr(result, "__dict__")
+    assert result.partial and not result.failed
+    assert YearResult.from_dict(result.to_dict()) == result
+    assert result.to_dict(titles=False)["titles"] is None
+
+    failed = YearResult(error="not found")
+    assert failed.failed
+    assert YearResult.from_dict(failed.to_dict()) == failed
+
+
+def test_estimated_result_round_trip():
+    """
+    Test that the confidence interval of an estimated count survives the round trip
+    """
+    result = YearResult(120, pages_fetched=40, interval=(100, 140))
+    assert result.approximate
+    assert "interval" not in YearResult(120).to_dict()
+    assert YearResult.from_dict(result.to_dict()) == result
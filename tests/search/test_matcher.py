@@ -0,0 +1,64 @@
+import pytest
+
+from client_app_cli.search.matcher import Matcher
+
+MOVIES = ["Star Wars", "The Stars Look Down", "Moonstruck", "Starman", "Up"]
+
+
+def test_single_term():
+    """
+    Test that a single term is matched case-insensitively
+    """
+    assert Matcher(["STAR"]).filter(MOVIES) == [
+        ["Star Wars", "The Stars Look Down", "Starman"]
+    ]
+
+
+def test_many_terms_in_one_pass():
+    """
+    Test that every term is reported, including terms contained in other terms
+    found at the same position
+    """
+    matcher = Matcher(["star", "star wars", "moon", "ars", "nothing"])
+    assert matcher.matches("Star Wars") == [0, 1, 3]
+    assert matcher.filter(MOVIES) == [
+        ["Star Wars", "The Stars Look Down", "Starman"],
+        ["Star Wars"],
+        ["Moonstruck"],
+        ["Star Wars", "The Stars Look Down"],
+        [],
+    ]
+    assert matcher.count(MOVIES) == [3, 1, 1, 2, 0]
+    assert matcher.filter_any(MOVIES) == MOVIES[:4]
+
+
+def test_duplicated_terms_are_matched_once():
+    """
+    Test that a duplicated term is reported once
+    """
+    assert Matcher(["up", "Up", "up"]).terms == ["up", "Up"]
+    assert Matcher(["up", "Up", "up"]).count(MOVIES) == [1, 1]
+
+
+def test_empty_term_matches_everything():
+    """
+    Test that an empty term matches every movie
+    """
+    assert Matcher(["", "moon"]).count(MOVIES) == [5, 1]
+
+
+def test_regex_patterns():
+    """
+    Test that regex patterns are matched case-insensitively, with and without groups
+    """
+    matcher = Matcher([r"^star\w*$", r"(o)\1n", "UP"], regex=True)
+    assert matcher.filter(MOVIES) == [["Starman"], ["Moonstruck"], ["Up"]]
+    assert Matcher([r"^the", r"down$"], regex=True).count(MOVIES) == [1, 1]
+
+
+def test_invalid_regex():
+    """
+    Test that an invalid pattern raises ValueError
+    """
+    with pytest.raises(ValueError, match=r".*invalid regex pattern.*"):
+        Matcher(["(star"], regex=True)
@@ -0,0 +1,96 @@
+from unittest import mock
+
+import pytest
+
+from client_app_cli.arguments.arguments import Arguments
+from client_app_cli.auth.authenticator import Authenticator
+from client_app_cli.constants.constant import (
+    DEFAULT_USERNAME,
+    DEFAULT_PASSWORD,
+    BASE_URL,
+)
+from client_app_cli.fetcher.movie_fetcher import MovieFetcher
+from client_app_cli.results.year_result import TitleList, YearResult
+from client_app_cli.snapshot.snapshot_store import SnapshotStore
+from tests.mocks import (
+    mocked_auth_success,
+    mocked_fetch_success_with_search_term,
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    """
+    returns a SnapshotStore with two years of titles
+    """
+    store = SnapshotStore(str(tmp_path / "snapshot.sqlite3"))
+    store.save_year(1940, ["The Stars Look Down", "Star Dust", "Up"])
+    store.save_year(1950, ["The Falling Star", "Stars in My Crown"])
+    store.build_index()
+    yield store
+    store.close()
+
+
+def test_search_with_index(store):
+    """
+    Test that terms are answered from the index and verified against the titles
+    """
+    results = store.search(Arguments([1940, 1950], ["stars", "fall"], False))
+    assert results == {
+        "stars": {
+            1940: YearResult(1, TitleList(["The Stars Look Down"])),
+            1950: YearResult(1, TitleList(["Stars in My Crown"])),
+        },
+        "fall": {
+            1940: YearResult(0, TitleList([])),
+            1950: YearResult(1, TitleList(["The Falling Star"])),
+        },
+    }
+
+
+def test_search_short_term_and_regex(store):
+    """
+    Test that terms shorter than a trigram and regex patterns scan the titles of the years
+    """
+    assert store.search(Arguments([1940], "up", True)) == {"up": {1940: YearResult(1)}}
+    results = store.search(Arguments([1940], r"^star\b", False, regex=True))
+    assert results == {r"^star\b": {1940: YearResult(1, TitleList(["Star Dust"]))}}
+
+
+def test_search_without_term_and_missing_year(store):
+    """
+    Test that an empty term returns the movie counts and a missing year is reported as failed
+    """
+    results = store.search(Arguments([1940, 1960], "", False))
+    assert results == {
+        "": {1940: YearResult(3), 1960: YearResult(error="not in the snapshot")}
+    }
+
+
+def test_save_year_replaces_titles(store):
+    """
+    Test that saving a year again replaces its titles in the index
+    """
+    store.save_year(1940, ["Moonstruck"])
+    store.build_index()
+    assert store.years() == {1940: 1, 1950: 2}
+    assert store.search(Arguments([1940], "star", False))["star"][1940] == YearResult(
+        0, TitleList([])
+    )
+
+
+@mock.patch("requests.Session.post", side_effect=mocked_auth_success)
+@mock.patch("requests.Session.get", side_effect=mocked_fetch_success_with_search_term)
+def test_snapshot(mock_get, mock_post, tmp_path):
+    """
+    Test that a snapshot downloads every page of the years in page order
+    """
+    fetcher = MovieFetcher(Authenticator(DEFAULT_USERNAME, DEFAULT_PASSWORD, BASE_URL))
+    store = SnapshotStore(str(tmp_path / "snapshot.sqlite3"))
+    assert store.snapshot(fetcher, [1950, 1940]) == {1940: 23, 1950: 23}
+    requests_sent = mock_get.call_count
+
+    results = store.search(Arguments([1940], "testing", False))
+    assert results == {"testing": {1940: YearResult(3, TitleList(["testing"] * 3))}}
+    assert mock_get.call_count == requests_sent
+    store.close()
@@ -0,0 +1,214 @@
+import os
+import subprocess
+import sys
+
+from unittest import mock
+
+import pytest
+
+from client_app_cli.arguments.arguments import Arguments
+from client_app_cli.results.year_result import YearResult
+from tests.mocks import (
+    mock_movie_server,
+    mocked_fetch_flaky,
+    mocked_fetch_success_with_search_term,
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# import time the CLI may add to the bare interpreter startup before any request is sent
+IMPORT_BUDGET_US = 50_000
+NETWORK_MODULES = {"requests", "urllib3", "aiohttp", "asyncio"}
+
+
+def imported_modules(*args) -> dict[str, int]:
+    """
+    Run the interpreter with -X importtime
+    :return: self import time in microseconds of every imported module
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line.removeprefix("import time:").split("|")
+        modules[name.strip()] = int(self_us)
+    return modules
+
+
+def cli_imports(*args) -> dict[str, int]:
+    """
+    Modules imported by main.py on top of the bare interpreter startup, best of three runs
+    """
+    startup = imported_modules("-c", "pass")
+    runs = [
+        {
+            name: self_us
+            for name, self_us in imported_modules("main.py", *args).items()
+            if name not in startup
+        }
+        for _ in range(3)
+    ]
+    return min(runs, key=lambda modules: sum(modules.values()))
+
+
+def test_help_stays_within_import_budget():
+    """
+    Test that the CLI starts without the network stack and within the import time budget
+    """
+    modules = cli_imports("--help")
+    assert "client_app_cli.arguments.argument_parser" in modules
+    assert not NETWORK_MODULES & modules.keys()
+    assert sum(modules.values()) < IMPORT_BUDGET_US
+
+
+def test_offline_search_does_not_import_network_stack(tmp_path):
+    """
+    Test that a search answered from the snapshot never imports the HTTP clients
+    """
+    snapshot_file = str(tmp_path / "snapshot.sqlite3")
+    modules = cli_imports(
+        "-y", "1940", "-s", "star", "--offline", "--snapshot-file", snapshot_file
+    )
+    assert "client_app_cli.snapshot.snapshot_store" in modules
+    assert not NETWORK_MODULES & modules.keys()
+
+
+def test_query_does_not_import_network_stack(tmp_path):
+    """
+    Test that the thin query client never imports the HTTP clients
+    """
+    socket_path = str(tmp_path / "daemon.sock")
+    modules = cli_imports("query", "-y", "1940", "-s", "star", "--socket", socket_path)
+    assert "client_app_cli.daemon.query_client" in modules
+    assert not NETWORK_MODULES & modules.keys()
+
+
+def test_arguments_are_parsed_once():
+    """
+    Test that main parses the command line a single time
+    """
+    import main
+    from client_app_cli.arguments.argument_parser import ArgumentParser
+
+    argv = ["-y", "1940", "-s", "star"]
+    with mock.patch.object(
+        ArgumentParser, "parse", autospec=True, side_effect=ArgumentParser.parse
+    ) as mock_parse, mock.patch.object(main, "run_online") as mock_run_online:
+        main.main(argv)
+    mock_parse.assert_called_once_with(mock.ANY, argv)
+    mock_run_online.assert_called_once()
+
+
+@pytest.mark.parametrize("fail_times, reported", [(0, False), (1, True)])
+def test_retry_summary_is_printed_only_after_retries(fail_times, reported, capsys):
+    """
+    Test that the retry summary stays out of a clean run and goes to stderr otherwise
+    """
+    import main
+
+    handler = mocked_fetch_flaky(fail_times, mocked_fetch_success_with_search_term)
+    with mock_movie_server(fetch_handler=handler) as url:
+        main.main(
+            ["-y", "1940", "-s", "star", "--base-url", url]
+            + ["--no-cache", "--no-hints", "--no-checkpoint"]
+        )
+    out, err = capsys.readouterr()
+    assert "Year 1940 has 3 movies" in out and "Retried" not in out
+    assert ("gave up on 0 pages." in err) == reported
+
+
+def test_malformed_batch_query_is_a_usage_error(tmp_path, capsys):
+    """
+    Test that a batch query with fields of the wrong type is reported with its line number
+    """
+    from client_app_cli.arguments.argument_parser import ArgumentParser
+
+    batch_file = tmp_path / "queries.jsonl"
+    batch_file.write_text(
+        '{"years": [1940], "search": "star"}\n{"years": 1940, "search": "star"}\n'
+    )
+    with pytest.raises(SystemExit) as exit_info:
+        ArgumentParser().parse(["batch", "--batch-file", str(batch_file)])
+    assert exit_info.value.code == 2
+    assert "invalid query on line 2: years must be" in capsys.readouterr().err
+
+
+def test_store_that_cannot_be_opened_is_skipped(tmp_path, capsys):
+    """
+    Test that an optional store under an unwritable cache directory is skipped with a warning
+    """
+    import main
+    from client_app_cli.cache.page_cache import PageCache
+
+    not_a_directory = tmp_path / "file"
+    not_a_directory.write_text("")
+    path = str(not_a_directory / "pages.sqlite3")
+    assert main.open_store("Page cache", lambda: PageCache(path)) is None
+    assert "Page cache disabled" in capsys.readouterr().err
+
+
+def test_invalid_regex_is_a_usage_error(tmp_path, capsys):
+    """
+    Test that an invalid pattern is rejected while parsing, before any request, and that a
+    batch query with one is reported with its line number
+    """
+    from client_app_cli.arguments.argument_parser import ArgumentParser
+
+    with pytest.raises(SystemExit) as exit_info:
+        ArgumentParser().parse(["-y", "1950", "-s", "[", "--regex"])
+    assert exit_info.value.code == 2
+    assert "invalid regex pattern '['" in capsys.readouterr().err
+
+    batch_file = tmp_path / "queries.jsonl"
+    batch_file.write_text('{"years": [1940], "search": "[", "regex": true}\n')
+    with pytest.raises(SystemExit):
+        ArgumentParser().parse(["batch", "--batch-file", str(batch_file)])
+    assert "invalid query on line 1: invalid regex" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize(
+    "option", [["--retries", "5"], ["--connect-timeout", "1"], ["--read-timeout", "1"]]
+)
+def test_async_rejects_the_options_it_ignores(option, capsys):
+    """
+    Test that the retry and timeout options are refused with --async, which does not use them
+    """
+    from client_app_cli.arguments.argument_parser import ArgumentParser
+
+    with pytest.raises(SystemExit) as exit_info:
+        ArgumentParser().parse(["-y", "1950", "-s", "star", "--async", *option])
+    assert exit_info.value.code == 2
+    assert "--async does not support --retries" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize(
+    "result, kept",
+    [
+        (YearResult(error="page 1 not found"), False),
+        (YearResult(1, pages_failed=1), True),
+    ],
+)
+def test_checkpoint_is_kept_only_when_it_can_be_resumed(result, kept, tmp_path, capsys):
+    """
+    Test that a search whose only failure is a failed discovery, with no completed page
+    to resume, does not keep nor advertise its checkpoint
+    """
+    import argparse
+
+    import main
+
+    path = tmp_path / "run.jsonl"
+    options = argparse.Namespace(
+        command="fetch", no_checkpoint=False, checkpoint=str(path), resume=False
+    )
+    fetcher = mock.Mock()
+    fetcher.replicas.base_url = "http://localhost/"
+    fetcher.search_movies.return_value = {"star": {1940: result}}
+    main.search_with_checkpoint(options, Arguments([1940], "star", False), fetcher)
+    assert path.exists() == kept
+    assert ("Progress saved" in capsys.readouterr().err) == kept
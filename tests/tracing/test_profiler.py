@@ -0,0 +1,26 @@
+import concurrent.futures
+import pstats
+import sys
+
+from client_app_cli.tracing.profiler import Profiler
+
+
+def busy_worker(n: int) -> int:
+    return sum(range(n))
+
+
+def test_profile_is_written(tmp_path):
+    """
+    Test that the functions run in the profiled section are in the pstats file, those of
+    the worker threads too on Python 3.12 or later
+    """
+    with Profiler() as profiler:
+        assert busy_worker(10) == 45
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            assert list(executor.map(busy_worker, [10, 20])) == [45, 190]
+    path = tmp_path / "run.pstats"
+    profiler.dump(str(path))
+    calls = {
+        name: stat[1] for (_, _, name), stat in pstats.Stats(str(path)).stats.items()
+    }
+    assert calls["busy_worker"] == (3 if sys.version_info >= (3, 12) else 1)
@@ -0,0 +1,86 @@
+import json
+import threading
+
+import pytest
+
+from client_app_cli.tracing.tracer import Tracer, traced
+
+
+def test_spans_are_recorded_per_thread():
+    """
+    Test that spans keep their name, category, args and thread
+    """
+    tracer = Tracer()
+    with tracer.span("outer", "run") as args:
+        args["status"] = 200
+        worker = threading.Thread(
+            target=lambda: tracer.span("inner", "request").__enter__(), name="worker"
+        )
+        worker.start()
+        worker.join()
+    names = {span.name: span for span in tracer.spans}
+    assert names["outer"].args == {"status": 200}
+    assert names["outer"].end >= names["outer"].start
+    assert tracer.thread_names[names["outer"].thread] == "MainThread"
+    assert names["inner"].thread != names["outer"].thread
+
+
+def test_traced_without_tracer_is_a_no_op():
+    """
+    Test that traced yields the args without recording anything when not tracing
+    """
+    with traced(None, "span", "run", page=1) as args:
+        args["status"] = 200
+    assert args == {"page": 1, "status": 200}
+
+
+def test_chrome_trace(tmp_path):
+    """
+    Test that thread spans are complete events and async spans begin/end pairs in microseconds
+    """
+    tracer = Tracer()
+    tracer.add("fetch", "request", 0.001, 0.003, status=200)
+    tracer.add_async("year 1940", "year", 0.0, 0.5, year=1940)
+    path = tmp_path / "trace.json"
+    tracer.dump(str(path))
+    events = json.loads(path.read_text())["traceEvents"]
+    complete = [event for event in events if event["ph"] == "X"]
+    assert complete[0]["ts"] == pytest.approx(1000)
+    assert complete[0]["dur"] == pytest.approx(2000)
+    assert complete[0]["args"] == {"status": 200}
+    assert [event["ph"] for event in events if event.get("cat") == "year"] == ["b", "e"]
+    assert any(event["ph"] == "M" for event in events)
+
+
+def test_speedscope_profile_nests_spans(tmp_path):
+    """
+    Test that spans of a thread become balanced open/close events, outer spans first
+    """
+    tracer = Tracer()
+    tracer.add("scan", "scan", 0.2, 0.3)
+    tracer.add("fetch", "request", 0.1, 0.2)
+    tracer.add("discover", "discovery", 0.1, 0.25)
+    path = tmp_path / "trace.json"
+    tracer.dump(str(path), "speedscope")
+    profile = json.loads(path.read_text())
+    frames = [frame["name"] for frame in profile["shared"]["frames"]]
+    events = [
+        (event["type"], frames[event["frame"]])
+        for event in profile["profiles"][0]["events"]
+    ]
+    assert events == [
+        ("O", "discover"),
+        ("O", "fetch"),
+        ("C", "fetch"),
+        ("O", "scan"),
+        ("C", "scan"),
+        ("C", "discover"),
+    ]
+
+
+def test_unknown_trace_format(tmp_path):
+    """
+    Test that an unknown format raises ValueError
+    """
+    with pytest.raises(ValueError, match=r".*unknown trace format.*"):
+        Tracer().dump(str(tmp_path / "trace"), "perf")
@@ -0,0 +1,69 @@
+from unittest import mock
+
+import pytest
+
+from client_app_cli.auth.authenticator import Authenticator
+from client_app_cli.constants.constant import (
+    DEFAULT_USERNAME,
+    DEFAULT_PASSWORD,
+    BASE_URL,
+)
+from client_app_cli.fetcher.movie_fetcher import MovieFetcher
+from client_app_cli.transport.http_transport import HttpTransport
+from tests.mocks import mock_movie_server
+
+
+@pytest.fixture
+def server_url():
+    """
+    returns the URL of a local keep-alive HTTP server
+    """
+    with mock_movie_server() as url:
+        yield url
+
+
+def test_invalid_pool_size():
+    """
+    Test that a non-positive pool size raises ValueError
+    """
+    with pytest.raises(ValueError, match=r".*pool_size must be a positive integer.*"):
+        HttpTransport(pool_size=0)
+
+
+def test_transport_shared_between_authenticator_and_fetcher():
+    """
+    Test that the fetcher reuses the authenticator's transport by default
+    """
+    transport = HttpTransport(pool_size=3)
+    auth = Authenticator(DEFAULT_USERNAME, DEFAULT_PASSWORD, BASE_URL, transport)
+    fetcher = MovieFetcher(auth)
+    assert fetcher.transport is transport
+    assert transport.adapter._pool_maxsize == 3
+
+
+def test_stats_counts_reused_connections(server_url):
+    """
+    Test that sequential requests to the same host open one connection and reuse it
+    """
+    transport = HttpTransport(pool_size=2)
+    for _ in range(5):
+        assert transport.get(server_url + "api/movies/1940/1").status_code == 200
+    stats = transport.stats()
+    transport.close()
+    assert stats.requests_sent == 5
+    assert stats.connections_opened == 1
+    assert stats.connections_reused == 4
+
+
+def test_requests_are_sent_with_timeouts():
+    """
+    Test that every request gets the transport's connect and read timeouts unless given
+    """
+    transport = HttpTransport(connect_timeout=2.0, read_timeout=7.0)
+    with mock.patch("requests.Session.get") as get:
+        transport.get("http://localhost/")
+        transport.get("http://localhost/", timeout=1.0)
+    assert get.call_args_list[0].kwargs["timeout"] == (2.0, 7.0)
+    assert get.call_args_list[1].kwargs["timeout"] == 1.0
+    with pytest.raises(ValueError, match=r".*timeouts must be positive.*"):
+        HttpTransport(read_timeout=0)